@@ -226,11 +226,7 @@ GITHUB_REPO = 'https://github.com/Roben29/phishing-url-detector-2025'
 def get_optimal_threads():
     """Get optimal number of threads based on CPU cores"""
     if N_JOBS == -1:
-        try:
-            cpu_count = os.cpu_count() or 2
-            return max(1, min(cpu_count // 2, 4))
-        except:
-            return 2
+        return max(1, os.cpu_count() or 2)
     return N_JOBS
 
 def get_model_path(model_type):
@@ -1,33 +1,46 @@
 import pandas as pd
 import os
 
+# Optional: pyarrow's multithreaded CSV parser for the large source files
+try:
+    import pyarrow
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+def _print_dataset_summary(df):
+    """Print the URL and per-label counts, tallied in one pass over the label column"""
+    counts = df['label'].value_counts()
+    print(f"Dataset loaded: {len(df)} URLs, {counts.get(0, 0)} legitimate, {counts.get(1, 0)} phishing")
+
 def load_dataset():
     # Load balanced 10k+10k dataset
     if os.path.exists('data/legimate.csv') and os.path.exists('data/malicious.csv'):
         print("Loading balanced 10k+10k dataset...")
         
         # Load legitimate URLs
-        legitimate_df = pd.read_csv('data/legimate.csv', header=None, names=['id', 'url'])
+        # Only the URL column is parsed; the id column is skipped
+        legitimate_df = pd.read_csv('data/legimate.csv', header=None, names=['id', 'url'],
+                                    usecols=['url'], engine=CSV_ENGINE)
         legitimate_df['label'] = 0
-        legitimate_df = legitimate_df[['url', 'label']]
         
         # Load malicious URLs
-        malicious_df = pd.read_csv('data/malicious.csv')
-        # Extract URL column (different format)
-        if 'url' in malicious_df.columns:
-            malicious_df = malicious_df[['url']]
+        # Extract URL column (different format) - read just the header to see if it's there
+        malicious_columns = pd.read_csv('data/malicious.csv', nrows=0).columns
+        malicious_df = pd.read_csv('data/malicious.csv', engine=CSV_ENGINE,
+                                   usecols=['url'] if 'url' in malicious_columns else None)
         malicious_df['label'] = 1
         
         # Combine datasets
         df = pd.concat([legitimate_df, malicious_df], ignore_index=True)
-        print(f"Dataset loaded: {len(df)} URLs, {(df['label']==0).sum()} legitimate, {(df['label']==1).sum()} phishing")
+        _print_dataset_summary(df)
         return df
     
     # Try to load sampled dataset first (for production training with real security checks)
     if os.path.exists('data/urls_sampled.csv'):
         print("Loading sampled dataset for production training...")
         df = pd.read_csv('data/urls_sampled.csv')
-        print(f"Dataset loaded: {len(df)} URLs, {(df['label']==0).sum()} legitimate, {(df['label']==1).sum()} phishing")
+        _print_dataset_summary(df)
         return df
     
     # Fall back to full dataset
@@ -129,5 +142,5 @@ def load_dataset():
         df['label'] = df['label'].astype(int)
         print("✅ Label conversion completed!")
     
-    print(f"Dataset loaded: {len(df)} URLs, {(df['label']==0).sum()} legitimate, {(df['label']==1).sum()} phishing")
+    _print_dataset_summary(df)
     return df
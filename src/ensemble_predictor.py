@@ -5,6 +5,7 @@ Uses majority voting from Decision Tree, XGBoost, and Security Scanner
 
 import joblib
 import os
+import threading
 import pandas as pd
 from typing import Dict, Tuple
 from src.feature_extraction import extract_features
@@ -13,6 +14,10 @@ from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Shared predictor so models are loaded from disk once per process
+_predictor = None
+_predictor_lock = threading.Lock()
+
 
 class EnsemblePredictor:
     """Ensemble predictor combining multiple detection methods"""
@@ -27,6 +32,7 @@ class EnsemblePredictor:
     def load_models(self):
         """Load trained ML models"""
         try:
+            # Plain loads: mmap_mode='r' was measured and saves nothing here (see url_checker.load_models)
             if os.path.exists('models/dt_model.pkl'):
                 self.dt_model = joblib.load('models/dt_model.pkl')
                 logger.info("Decision Tree model loaded")
@@ -77,7 +83,7 @@ class EnsemblePredictor:
                 df_features = df_features[self.feature_names]
         
         except Exception as e:
-            logger.error(f"Feature extraction failed: {e}")
+            logger.error("Feature extraction failed: %s", e)
             result['details']['error'] = str(e)
             return result
         
@@ -100,7 +106,7 @@ class EnsemblePredictor:
                 predictions.append(('Decision Tree', dt_pred, max(dt_proba)))
                 
             except Exception as e:
-                logger.error(f"Decision Tree prediction failed: {e}")
+                logger.error("Decision Tree prediction failed: %s", e)
                 result['decision_tree'] = {'error': str(e)}
         
         # 2. XGBoost Prediction
@@ -119,7 +125,7 @@ class EnsemblePredictor:
                 predictions.append(('XGBoost', xgb_pred, max(xgb_proba)))
                 
             except Exception as e:
-                logger.error(f"XGBoost prediction failed: {e}")
+                logger.error("XGBoost prediction failed: %s", e)
                 result['xgboost'] = {'error': str(e)}
         
         # 3. Security Scanner Check
@@ -148,7 +154,7 @@ class EnsemblePredictor:
                     }
             
             except Exception as e:
-                logger.error(f"Security Scanner check failed: {e}")
+                logger.error("Security Scanner check failed: %s", e)
                 result['security_scan'] = {'error': str(e)}
         
         # 4. Ensemble Decision (Majority Voting)
@@ -171,14 +177,23 @@ class EnsemblePredictor:
                 'methods_used': [name for name, _, _ in predictions]
             }
             
-            logger.info(f"Ensemble prediction for {url}: {result['ensemble_prediction']} "
-                       f"({ensemble_confidence:.1f}% confidence, {len(votes)} methods)")
+            logger.info("Ensemble prediction for %s: %s (%.1f%% confidence, %d methods)",
+                       url, result['ensemble_prediction'], ensemble_confidence, len(votes))
         else:
             result['details']['error'] = 'Insufficient predictions for ensemble'
         
         return result
 
 
+def get_predictor() -> EnsemblePredictor:
+    """Get the shared ensemble predictor, loading the models on first use"""
+    global _predictor
+    with _predictor_lock:
+        if _predictor is None:
+            _predictor = EnsemblePredictor()
+    return _predictor
+
+
 def get_ensemble_prediction(url: str, use_security_scan: bool = True) -> Dict:
     """
     Convenience function to get ensemble prediction
@@ -190,5 +205,4 @@ def get_ensemble_prediction(url: str, use_security_scan: bool = True) -> Dict:
     Returns:
         Dict with ensemble prediction results
     """
-    predictor = EnsemblePredictor()
-    return predictor.predict_single_url(url, use_security_scan)
+    return get_predictor().predict_single_url(url, use_security_scan)
@@ -10,11 +10,26 @@ import hashlib
 import json
 import time
 import os
-from datetime import datetime, timedelta
+import threading
 
 # Cache database path
 CACHE_DB = 'data/feature_cache.db'
 
+# How often the global cache runs PRAGMA optimize (seconds)
+OPTIMIZE_INTERVAL = 15 * 60
+
+# Max bound parameters per batched query (SQLite default limit is 999)
+BATCH_SIZE = 900
+
+# Check types that stay valid longer than the cache-wide TTL (hours)
+CHECK_TTL_HOURS = {
+    'whois': 7 * 24,
+    'whois_domain': 7 * 24,
+    'whois_creation': 7 * 24,
+    'security_scan': 7 * 24,
+    'security_scan_not_found': 0.25,
+}
+
 class FeatureCache:
     """
     Persistent cache for feature extraction results
@@ -30,6 +45,7 @@ class FeatureCache:
         """
         self.db_path = db_path
         self.ttl_hours = ttl_hours
+        self.ttl_seconds = int(ttl_hours * 3600)
         self._ensure_database()
     
     def _ensure_database(self):
@@ -39,36 +55,81 @@ class FeatureCache:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        # Create cache table
+        # Older databases used TEXT hashes/timestamps - set them aside for migration
+        has_legacy = self._detach_legacy_table(cursor)
+        
+        # Create cache table (timestamps are UNIX epoch seconds)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS feature_cache (
-                url_hash TEXT PRIMARY KEY,
+                url_hash INTEGER NOT NULL,
                 url TEXT NOT NULL,
                 check_type TEXT NOT NULL,
                 result TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                access_count INTEGER DEFAULT 1
+                created_at INTEGER NOT NULL,
+                accessed_at INTEGER NOT NULL,
+                access_count INTEGER DEFAULT 1,
+                PRIMARY KEY (url_hash, check_type)
             )
         ''')
         
-        # Create index for faster lookups
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_url_hash_type 
-            ON feature_cache(url_hash, check_type)
-        ''')
-        
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_created_at 
             ON feature_cache(created_at)
         ''')
         
+        if has_legacy:
+            self._migrate_legacy_rows(cursor)
+        
         conn.commit()
         conn.close()
     
+    def _detach_legacy_table(self, cursor):
+        """
+        Rename a cache table that still stores TEXT hashes or timestamps
+        
+        Returns:
+            True if a legacy table was set aside for migration
+        """
+        cursor.execute('PRAGMA table_info(feature_cache)')
+        column_types = {row[1]: row[2].upper() for row in cursor.fetchall()}
+        if (column_types.get('url_hash', 'INTEGER') == 'INTEGER'
+                and column_types.get('created_at', 'INTEGER') == 'INTEGER'):
+            return False
+        
+        cursor.execute('ALTER TABLE feature_cache RENAME TO feature_cache_legacy')
+        cursor.execute('DROP INDEX IF EXISTS idx_url_hash_type')
+        cursor.execute('DROP INDEX IF EXISTS idx_created_at')
+        return True
+    
+    def _migrate_legacy_rows(self, cursor):
+        """Copy legacy rows into the new table, rehashing URLs and converting timestamps"""
+        cursor.connection.create_function('url_hash', 1, self._get_url_hash, deterministic=True)
+        cursor.execute('''
+            INSERT OR REPLACE INTO feature_cache 
+            (url_hash, url, check_type, result, created_at, accessed_at, access_count)
+            SELECT url_hash(url), url, check_type, result,
+                   CASE WHEN typeof(created_at) = 'text'
+                        THEN CAST(strftime('%s', created_at) AS INTEGER)
+                        ELSE created_at END,
+                   CASE WHEN typeof(accessed_at) = 'text'
+                        THEN CAST(strftime('%s', accessed_at) AS INTEGER)
+                        ELSE accessed_at END,
+                   access_count
+            FROM feature_cache_legacy
+        ''')
+        cursor.execute('DROP TABLE feature_cache_legacy')
+    
     def _get_url_hash(self, url):
-        """Generate hash for URL"""
-        return hashlib.md5(url.encode('utf-8')).hexdigest()
+        """Generate a signed 64-bit hash for URL (fits SQLite INTEGER)"""
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big', signed=True)
+    
+    def _cutoff(self, check_type, now):
+        """Oldest created_at that is still valid for check_type"""
+        ttl_hours = CHECK_TTL_HOURS.get(check_type)
+        if ttl_hours is None:
+            return now - self.ttl_seconds
+        return now - int(ttl_hours * 3600)
     
     def get(self, url, check_type):
         """
@@ -82,49 +143,83 @@ class FeatureCache:
             Cached result dict or None if not found/expired
         """
         url_hash = self._get_url_hash(url)
+        now = int(time.time())
         
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        # Get cached result
+        # Get cached result (expired rows are filtered out by SQLite)
         cursor.execute('''
-            SELECT result, created_at FROM feature_cache 
-            WHERE url_hash = ? AND check_type = ?
-        ''', (url_hash, check_type))
+            SELECT result FROM feature_cache 
+            WHERE url_hash = ? AND check_type = ? AND created_at > ?
+        ''', (url_hash, check_type, self._cutoff(check_type, now)))
         
         row = cursor.fetchone()
         
         if row:
-            result_json, created_at = row
-            
-            # Check if expired
-            created_time = datetime.strptime(created_at, '%Y-%m-%d %H:%M:%S')
-            age_hours = (datetime.now() - created_time).total_seconds() / 3600
+            # Update access statistics
+            cursor.execute('''
+                UPDATE feature_cache 
+                SET accessed_at = ?,
+                    access_count = access_count + 1
+                WHERE url_hash = ? AND check_type = ?
+            ''', (now, url_hash, check_type))
+            conn.commit()
+            conn.close()
             
-            if age_hours < self.ttl_hours:
-                # Update access statistics
-                cursor.execute('''
-                    UPDATE feature_cache 
-                    SET accessed_at = CURRENT_TIMESTAMP,
-                        access_count = access_count + 1
-                    WHERE url_hash = ? AND check_type = ?
-                ''', (url_hash, check_type))
-                conn.commit()
-                conn.close()
-                
-                # Return cached result
-                return json.loads(result_json)
-            else:
-                # Expired - delete old entry
-                cursor.execute('''
-                    DELETE FROM feature_cache 
-                    WHERE url_hash = ? AND check_type = ?
-                ''', (url_hash, check_type))
-                conn.commit()
+            # Return cached result
+            return json.loads(row[0])
         
         conn.close()
         return None
     
+    def get_many(self, urls, check_type):
+        """
+        Get cached results for many URLs with one query per batch
+        
+        Args:
+            urls: URLs to look up
+            check_type: Type of check (dns, ssl, whois, content)
+            
+        Returns:
+            Dict mapping URL to cached result dict (misses/expired are omitted)
+        """
+        hash_to_url = {self._get_url_hash(url): url for url in urls}
+        hashes = list(hash_to_url)
+        now = int(time.time())
+        results = {}
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        for start in range(0, len(hashes), BATCH_SIZE):
+            batch = hashes[start:start + BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            
+            cursor.execute(f'''
+                SELECT url_hash, result FROM feature_cache 
+                WHERE check_type = ? AND created_at > ? AND url_hash IN ({placeholders})
+            ''', (check_type, self._cutoff(check_type, now), *batch))
+            rows = cursor.fetchall()
+            if not rows:
+                continue
+            
+            hit_hashes = [url_hash for url_hash, _ in rows]
+            for url_hash, result_json in rows:
+                results[hash_to_url[url_hash]] = json.loads(result_json)
+            
+            # Update access statistics
+            cursor.execute(f'''
+                UPDATE feature_cache 
+                SET accessed_at = ?,
+                    access_count = access_count + 1
+                WHERE check_type = ? AND url_hash IN ({','.join('?' * len(hit_hashes))})
+            ''', (now, check_type, *hit_hashes))
+        
+        conn.commit()
+        conn.close()
+        return results
+    
     def set(self, url, check_type, result):
         """
         Save result to cache
@@ -136,6 +231,7 @@ class FeatureCache:
         """
         url_hash = self._get_url_hash(url)
         result_json = json.dumps(result)
+        now = int(time.time())
         
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
@@ -144,8 +240,8 @@ class FeatureCache:
         cursor.execute('''
             INSERT OR REPLACE INTO feature_cache 
             (url_hash, url, check_type, result, created_at, accessed_at, access_count)
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 1)
-        ''', (url_hash, url, check_type, result_json))
+            VALUES (?, ?, ?, ?, ?, ?, 1)
+        ''', (url_hash, url, check_type, result_json, now, now))
         
         conn.commit()
         conn.close()
@@ -155,20 +251,38 @@ class FeatureCache:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        cutoff_time = datetime.now() - timedelta(hours=self.ttl_hours)
-        cutoff_str = cutoff_time.strftime('%Y-%m-%d %H:%M:%S')
+        now = int(time.time())
         
-        cursor.execute('''
+        placeholders = ','.join('?' * len(CHECK_TTL_HOURS))
+        cursor.execute(f'''
             DELETE FROM feature_cache 
-            WHERE created_at < ?
-        ''', (cutoff_str,))
-        
+            WHERE created_at <= ? AND check_type NOT IN ({placeholders})
+        ''', (now - self.ttl_seconds, *CHECK_TTL_HOURS))
         deleted = cursor.rowcount
+        
+        # Check types with their own TTL
+        for check_type in CHECK_TTL_HOURS:
+            cursor.execute('''
+                DELETE FROM feature_cache 
+                WHERE check_type = ? AND created_at <= ?
+            ''', (check_type, self._cutoff(check_type, now)))
+            deleted += cursor.rowcount
         conn.commit()
         conn.close()
         
+        self.optimize()
+        
         return deleted
     
+    def optimize(self):
+        """Refresh query planner statistics and truncate the WAL file"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('PRAGMA optimize')
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        finally:
+            conn.close()
+    
     def get_stats(self):
         """Get cache statistics"""
         conn = sqlite3.connect(self.db_path)
@@ -224,20 +338,36 @@ class FeatureCache:
 # Global cache instance
 _cache = None
 
+def _schedule_optimize():
+    """Run optimize() on the global cache every OPTIMIZE_INTERVAL seconds"""
+    def _run():
+        try:
+            _cache.optimize()
+        except sqlite3.Error:
+            pass
+        _schedule_optimize()
+    
+    timer = threading.Timer(OPTIMIZE_INTERVAL, _run)
+    timer.daemon = True
+    timer.start()
+
 def get_cache():
     """Get global cache instance"""
     global _cache
     if _cache is None:
         _cache = FeatureCache()
+        _schedule_optimize()
     return _cache
 
-def cached_dns_check(url, check_function):
+def cached_dns_check(url, check_function, prefetched=None):
     """
     Cached DNS check wrapper
     
     Args:
         url: URL to check
         check_function: Function that performs the actual DNS check
+        prefetched: Optional dict from FeatureCache.get_many; when given,
+                    it replaces the per-URL cache lookup
         
     Returns:
         Result from check_function (cached or fresh)
@@ -245,7 +375,10 @@ def cached_dns_check(url, check_function):
     cache = get_cache()
     
     # Try to get from cache
-    cached_result = cache.get(url, 'dns')
+    if prefetched is not None:
+        cached_result = prefetched.get(url)
+    else:
+        cached_result = cache.get(url, 'dns')
     if cached_result is not None:
         return cached_result['has_dns'], cached_result['ip_count']
     
@@ -260,13 +393,15 @@ def cached_dns_check(url, check_function):
     
     return has_dns, ip_count
 
-def cached_ssl_check(url, check_function):
+def cached_ssl_check(url, check_function, prefetched=None):
     """
     Cached SSL check wrapper
     
     Args:
         url: URL to check
         check_function: Function that performs the actual SSL check
+        prefetched: Optional dict from FeatureCache.get_many; when given,
+                    it replaces the per-URL cache lookup
         
     Returns:
         Result from check_function (cached or fresh)
@@ -274,7 +409,10 @@ def cached_ssl_check(url, check_function):
     cache = get_cache()
     
     # Try to get from cache
-    cached_result = cache.get(url, 'ssl')
+    if prefetched is not None:
+        cached_result = prefetched.get(url)
+    else:
+        cached_result = cache.get(url, 'ssl')
     if cached_result is not None:
         return (cached_result['has_ssl'], 
                 cached_result['days_valid'], 
@@ -305,10 +443,9 @@ def cached_whois_check(url, check_function):
     """
     cache = get_cache()
     
-    # Try to get from cache (longer TTL for WHOIS - 7 days)
+    # Try to get from cache (longer TTL for WHOIS - see CHECK_TTL_HOURS)
     cached_result = cache.get(url, 'whois')
     if cached_result is not None:
-        # Check if less than 7 days old
         return cached_result['domain_age_days']
     
     # Perform actual check
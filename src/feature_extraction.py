@@ -1,20 +1,118 @@
 import re
+import numpy as np
 import pandas as pd
 import math
 import socket
 import ssl as ssl_module
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 import warnings
 import time
+import sys
 warnings.filterwarnings('ignore')
 
+try:
+    from .feature_cache import get_cache, cached_dns_check, cached_ssl_check
+    FEATURE_CACHE_AVAILABLE = True
+except ImportError:
+    FEATURE_CACHE_AVAILABLE = False
+
+try:
+    from .ttl_cache import TTLCache
+except ImportError:
+    from ttl_cache import TTLCache
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional: resolve a batch's domains concurrently on one event loop
+try:
+    import asyncio
+    import aiodns
+    # c-ares results that mean the name has no IPv4 address; anything else
+    # (timeouts, server failures) is retried with the blocking resolver
+    _DNS_NO_ADDRESS = {aiodns.error.ARES_ENOTFOUND, aiodns.error.ARES_ENODATA}
+    AIODNS_AVAILABLE = True
+except ImportError:
+    AIODNS_AVAILABLE = False
+
 # Set reasonable timeouts for network operations
 TIMEOUT = 3  # Reduced from 5 to 3 seconds for faster processing
 MAX_RETRIES = 1
 
+# Only the start of a page is read for content features
+MAX_CONTENT_BYTES = 256 * 1024
+
+# The same URL is parsed by several stages of a check (domain, TLD, online check)
+PARSE_CACHE_SIZE = 1024
+
+# DNS and SSL results are cached per domain, so URLs sharing a host are only checked
+# once (failures for less time)
+DOMAIN_CACHE_SIZE = 8192
+DOMAIN_CACHE_TTL = 3600
+DOMAIN_NEGATIVE_CACHE_TTL = 60
+
+# Batched DNS lookups are issued DNS_BATCH_SIZE domains at a time, with at most
+# DNS_MAX_IN_FLIGHT queries outstanding, so the resolver isn't flooded
+DNS_BATCH_SIZE = 500
+DNS_MAX_IN_FLIGHT = 100
+
+# The per-URL network checks (DNS, SSL, page content) are I/O-bound, so they
+# run concurrently, submitted NETWORK_CHUNK_SIZE URLs at a time
+NETWORK_WORKERS = 32
+NETWORK_CHUNK_SIZE = 1000
+
+# Minimum seconds between in-place progress updates
+PROGRESS_INTERVAL = 0.5
+
+# Features that are 0/1 flags (stored as int8) or fractional (stored as float32);
+# everything else is a small count stored as int32
+BINARY_FEATURE_PREFIXES = ('has_', 'is_')
+BINARY_FEATURES = {'excessive_subdomains', 'brand_in_subdomain'}
+FLOAT_FEATURE_SUFFIXES = ('_ratio', '_entropy')
+
+# Patterns compiled once and shared by every row
+_IP_RE = re.compile(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b')
+_PORT_RE = re.compile(r':\d{2,5}')
+# Host as extract_domain sees it: after an http(s):// prefix, up to the path, query, fragment or port
+_HOST_RE = re.compile(r'^(?:https?://)?([^/?#:]*)')
+# Characters urlparse treats specially (whitespace, params, IPv6, non-ASCII)
+_URLPARSE_ONLY_RE = re.compile(r'[^\x21-\x7e]|[;\[\]]')
+
+# One verifying TLS context for every SSL check, so the CA bundle is loaded once
+_SSL_CONTEXT = ssl_module.create_default_context()
+
+# Keep-alive session for page fetches, so pages on the same host reuse the connection
+_PAGE_SESSION = requests.Session()
+_PAGE_SESSION.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+for _prefix in ('http://', 'https://'):
+    _PAGE_SESSION.mount(_prefix, HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0))
+
+# Term lists shared by the batch and single-URL extractors
+SUSPICIOUS_TLDS = ['tk', 'ml', 'ga', 'cf', 'gq', 'xyz', 'top', 'work', 'click', 'link']
+TRUSTED_TLDS = ['com', 'org', 'net', 'edu', 'gov', 'mil']
+URL_SHORTENERS = ['bit.ly', 'goo.gl', 'tinyurl', 't.co', 'ow.ly']
+REDIRECT_MARKERS = ['redirect', 'url=', 'redir']
+
+# Suspicious keywords that appear in phishing URLs
+SUSPICIOUS_KEYWORDS = [
+    'secure', 'account', 'update', 'login', 'verify', 'confirm', 'banking',
+    'signin', 'webscr', 'password', 'suspend', 'restricted', 'alert',
+    'credential', 'authenticate', 'validation'
+]
+
+# Brand names often impersonated
+BRANDS = ['paypal', 'microsoft', 'apple', 'google', 'amazon', 'facebook', 
+          'netflix', 'bank', 'chase', 'wellsfargo', 'dhl', 'fedex']
+
 def calculate_entropy(text):
     """Calculate Shannon entropy of a string (measure of randomness)"""
     if not text:
@@ -24,10 +122,15 @@ def calculate_entropy(text):
     entropy = -sum((count/length) * math.log2(count/length) for count in counter.values())
     return entropy
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_url(url):
+    """urlparse(url), cached; the result is an immutable tuple so it can be shared"""
+    return urlparse(url)
+
 def get_tld(url):
     """Extract top-level domain from URL"""
     try:
-        parsed = urlparse(url)
+        parsed = parse_url(url)
         domain = parsed.netloc or parsed.path
         parts = domain.split('.')
         if len(parts) >= 2:
@@ -41,6 +144,35 @@ def count_special_chars(text):
     special = set('!@#$%^&*()_+={}[]|\\:;"\'<>,.?/~`')
     return sum(1 for char in text if char in special)
 
+def scan_terms(urls, terms):
+    """
+    Flag which terms occur in each URL (case-insensitive), scanning each URL once
+    
+    Args:
+        urls: Iterable of URL strings
+        terms: List of unique lowercase terms
+    
+    Returns:
+        numpy int8 array of shape (len(urls), len(terms))
+    """
+    urls = list(urls)
+    hits = np.zeros((len(urls), len(terms)), dtype=np.int8)
+    
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for j, term in enumerate(terms):
+            automaton.add_word(term, j)
+        automaton.make_automaton()
+        for i, url in enumerate(urls):
+            for _, j in automaton.iter(url.lower()):
+                hits[i, j] = 1
+    else:
+        for i, url in enumerate(urls):
+            url = url.lower()
+            hits[i] = [term in url for term in terms]
+    
+    return hits
+
 def extract_domain(url):
     """Extract clean domain from URL"""
     try:
@@ -48,7 +180,7 @@ def extract_domain(url):
         if not url.startswith(('http://', 'https://')):
             url = 'http://' + url
         
-        parsed = urlparse(url)
+        parsed = parse_url(url)
         domain = parsed.netloc or parsed.path.split('/')[0]
         # Remove port if present
         domain = domain.split(':')[0]
@@ -56,15 +188,30 @@ def extract_domain(url):
     except:
         return ""
 
-def check_dns_record(url):
-    """Check if domain has valid DNS record"""
+def extract_domains(urls):
+    """
+    extract_domain for a whole column, as one vectorized regex pass
+    
+    Args:
+        urls: pandas Series of URL strings
+    
+    Returns:
+        pandas Series of lowercase domains
+    """
+    domains = urls.str.extract(_HOST_RE, expand=False).str.lower()
+    # Leave the URLs urlparse would treat differently to extract_domain itself
+    unusual = urls.str.contains(_URLPARSE_ONLY_RE)
+    if unusual.any():
+        domains[unusual] = urls[unusual].apply(extract_domain)
+    return domains
+
+_dns_cache = TTLCache(DOMAIN_CACHE_SIZE, DOMAIN_CACHE_TTL, DOMAIN_NEGATIVE_CACHE_TTL)  # domain -> (has_dns, ip_count)
+_ssl_cache = TTLCache(DOMAIN_CACHE_SIZE, DOMAIN_CACHE_TTL, DOMAIN_NEGATIVE_CACHE_TTL)  # domain -> (has_ssl, days_valid, is_trusted)
+
+def _dns_for_domain(domain):
+    """DNS lookup for a bare domain: (has_dns, ip_count)"""
     try:
-        domain = extract_domain(url)
-        if not domain:
-            return 0, 0
-        
         # Try to resolve domain
-        socket.setdefaulttimeout(TIMEOUT)
         ips = socket.getaddrinfo(domain, None, family=socket.AF_INET)
         ip_addresses = list(set([ip[4][0] for ip in ips]))
         
@@ -72,18 +219,70 @@ def check_dns_record(url):
     except:
         return 0, 0
 
+def check_dns_record(url):
+    """Check if domain has valid DNS record"""
+    domain = extract_domain(url)
+    if not domain:
+        return 0, 0
+    return _dns_cache.get_or_compute(domain, _dns_for_domain, ok=lambda result: result[0])
+
+async def _resolve_all(domains):
+    """
+    Resolve domains concurrently with aiodns: {domain: (has_dns, ip_count)}
+    Domains whose lookup failed without a definite answer are left out
+    """
+    resolver = aiodns.DNSResolver(timeout=TIMEOUT)
+    in_flight = asyncio.Semaphore(DNS_MAX_IN_FLIGHT)
+    
+    async def _one(domain):
+        async with in_flight:
+            try:
+                result = await resolver.getaddrinfo(domain, family=socket.AF_INET)
+                return 1, len(set(node.addr[0] for node in result.nodes))
+            except aiodns.error.DNSError as e:
+                if e.args and e.args[0] in _DNS_NO_ADDRESS:
+                    return 0, 0
+                return None
+            except Exception:
+                return None
+    
+    resolved = {}
+    try:
+        for start in range(0, len(domains), DNS_BATCH_SIZE):
+            batch = domains[start:start + DNS_BATCH_SIZE]
+            results = await asyncio.gather(*[_one(domain) for domain in batch])
+            resolved.update((domain, result) for domain, result in zip(batch, results)
+                            if result is not None)
+    finally:
+        await resolver.close()
+    return resolved
+
+def resolve_domains(domains):
+    """
+    DNS lookup for many bare domains in aiodns batches
+    Returns: {domain: (has_dns, ip_count)}, empty if aiodns isn't installed;
+    domains that timed out or failed are missing, for a per-URL retry
+    """
+    domains = list(dict.fromkeys(d for d in domains if d))
+    if not domains or not AIODNS_AVAILABLE:
+        return {}
+    try:
+        return asyncio.run(_resolve_all(domains))
+    except RuntimeError:
+        return {}  # Called from inside a running event loop
+
 def check_ssl_certificate(url):
     """Check SSL certificate validity"""
+    domain = extract_domain(url)
+    if not domain or not url.startswith('https'):
+        return 0, 0, 0
+    return _ssl_cache.get_or_compute(domain, _ssl_for_domain, ok=lambda result: result[0])
+
+def _ssl_for_domain(domain):
+    """SSL certificate check for a bare domain: (has_ssl, days_valid, is_trusted)"""
     try:
-        domain = extract_domain(url)
-        if not domain or not url.startswith('https'):
-            return 0, 0, 0
-        
-        context = ssl_module.create_default_context()
-        socket.setdefaulttimeout(TIMEOUT)
-        
         with socket.create_connection((domain, 443), timeout=TIMEOUT) as sock:
-            with context.wrap_socket(sock, server_hostname=domain) as ssock:
+            with _SSL_CONTEXT.wrap_socket(sock, server_hostname=domain) as ssock:
                 cert = ssock.getpeercert()
                 
                 # Check expiry
@@ -131,32 +330,144 @@ def check_page_content(url):
         if not url.startswith(('http://', 'https://')):
             url = 'http://' + url
         
-        response = requests.get(
+        # Stream the body and stop after MAX_CONTENT_BYTES; counts work on raw bytes
+        with _PAGE_SESSION.get(
             url,
             timeout=TIMEOUT,
             allow_redirects=True,
             verify=False,
-            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        )
-        
-        status = response.status_code
-        content = response.text.lower() if response.status_code == 200 else ""
+            stream=True
+        ) as response:
+            status = response.status_code
+            content = response.raw.read(MAX_CONTENT_BYTES, decode_content=True).lower() if status == 200 else b""
         
         # Analyze content
-        num_forms = content.count('<form')
-        num_inputs = content.count('<input')
-        has_password = int('password' in content or 'passwd' in content)
-        num_links = content.count('<a ')
-        num_scripts = content.count('<script')
+        num_forms = content.count(b'<form')
+        num_inputs = content.count(b'<input')
+        has_password = int(b'password' in content or b'passwd' in content)
+        num_links = content.count(b'<a ')
+        num_scripts = content.count(b'<script')
         
         # Check for suspicious patterns
-        has_iframe = int('<iframe' in content)
-        has_redirect = int('window.location' in content or 'document.location' in content)
+        has_iframe = int(b'<iframe' in content)
+        has_redirect = int(b'window.location' in content or b'document.location' in content)
         
         return status, num_forms, num_inputs, has_password, num_links, num_scripts, has_iframe, has_redirect
     except:
         return 0, 0, 0, 0, 0, 0, 0, 0
 
+def extract_features_one(url):
+    """
+    Extract the features for a single URL without building a DataFrame
+    
+    Produces the same feature names, in the same order, as extract_features
+    (minus 'url' and 'label'); used for interactive one-off checks.
+    
+    Args:
+        url: URL string
+    
+    Returns:
+        dict mapping feature name to value
+    """
+    url_length = len(url)
+    lower = url.lower()
+    features = {
+        'url_length': url_length,
+        'num_dots': url.count('.'),
+        'num_hyphens': url.count('-'),
+        'num_underscores': url.count('_'),
+        'num_slashes': url.count('/'),
+        'num_question': url.count('?'),
+        'num_equal': url.count('='),
+        'num_at': url.count('@'),
+        'num_ampersand': url.count('&'),
+        'num_percent': url.count('%'),
+    }
+    
+    # String analysis
+    special_char_count = count_special_chars(url)
+    digit_count = sum(c.isdigit() for c in url)
+    letter_count = sum(c.isalpha() for c in url)
+    features['url_entropy'] = calculate_entropy(url)
+    features['special_char_count'] = special_char_count
+    features['special_char_ratio'] = special_char_count / url_length if url_length else 0
+    features['digit_count'] = digit_count
+    features['digit_ratio'] = digit_count / url_length if url_length else 0
+    features['letter_count'] = letter_count
+    features['letter_ratio'] = letter_count / url_length if url_length else 0
+    
+    features['has_ip'] = int(bool(_IP_RE.search(url)))
+    features['has_port'] = int(bool(_PORT_RE.search(url)))
+    
+    # Domain analysis
+    domain = extract_domain(url)
+    tld = get_tld(url)
+    features['domain_length'] = len(domain)
+    features['subdomain_count'] = domain.count('.')
+    features['has_suspicious_tld'] = int(tld in SUSPICIOUS_TLDS)
+    features['has_trusted_tld'] = int(tld in TRUSTED_TLDS)
+    
+    features['is_https'] = int(url.startswith('https://'))
+    features['is_http'] = int(url.startswith('http://'))
+    
+    # Path and structure
+    features['url_depth'] = len([p for p in url.split('/') if p and '://' not in p])
+    features['has_query_string'] = int('?' in url)
+    features['query_length'] = len(url.split('?')[1]) if '?' in url else 0
+    
+    # Suspicious patterns
+    features['excessive_subdomains'] = int(features['subdomain_count'] > 3)
+    features['has_double_slash'] = int('//' in url.split('://')[1] if '://' in url else False)
+    features['has_url_shortener'] = int(any(term in lower for term in URL_SHORTENERS))
+    for kw in SUSPICIOUS_KEYWORDS:
+        features[f'has_{kw}'] = int(kw in lower)
+    for brand in BRANDS:
+        features[f'has_brand_{brand}'] = int(brand in lower)
+    first_label = domain.split('.', 1)[0]
+    features['brand_in_subdomain'] = int(any(brand in first_label for brand in BRANDS))
+    features['has_redirect'] = int(any(term in lower for term in REDIRECT_MARKERS))
+    
+    # Network checks (cached where available)
+    if FEATURE_CACHE_AVAILABLE:
+        has_dns, ip_count = cached_dns_check(url, check_dns_record)
+    else:
+        has_dns, ip_count = check_dns_record(url)
+    ssl_values = (0, 0, 0)
+    content_values = (0, 0, 0, 0, 0, 0, 0, 0)
+    if has_dns:
+        if url.startswith('https'):
+            if FEATURE_CACHE_AVAILABLE:
+                ssl_values = cached_ssl_check(url, check_ssl_certificate)
+            else:
+                ssl_values = check_ssl_certificate(url)
+        content_values = check_page_content(url)
+    
+    features['has_dns'] = has_dns
+    features['dns_ip_count'] = ip_count
+    features.update(zip(['has_ssl', 'ssl_days_valid', 'ssl_trusted'], ssl_values))
+    features.update(zip(['http_status', 'num_forms', 'num_inputs', 'has_password_field',
+                         'num_page_links', 'num_scripts', 'has_iframe', 'has_js_redirect'],
+                        content_values))
+    features['domain_age_days'] = -1
+    
+    return features
+
+def _network_checks(url, dns_check, ssl_check):
+    """DNS, SSL and page-content results for one URL (SSL/content are None when skipped)"""
+    has_dns, ip_count = dns_check(url)
+    ssl_result = content_result = None
+    
+    # Only do further checks if DNS exists
+    if has_dns:
+        # SSL Check (for HTTPS URLs)
+        if url.startswith('https'):
+            ssl_result = ssl_check(url)
+        
+        # Page Content Check (slower)
+        content_result = check_page_content(url)
+    
+    return (has_dns, ip_count), ssl_result, content_result
+
 def extract_features(df):
     print(f"\n{'='*70}")
     print(f"  COMPREHENSIVE FEATURE EXTRACTION WITH REAL SECURITY CHECKS")
@@ -193,135 +504,138 @@ def extract_features(df):
         
         # ========== IP ADDRESS DETECTION ==========
         print("Detecting IP addresses and hexadecimal patterns...")
-        df['has_ip'] = df['url'].apply(lambda x: int(bool(re.search(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b', x))))
-        df['has_port'] = df['url'].apply(lambda x: int(bool(re.search(r':\d{2,5}', x))))
+        df['has_ip'] = df['url'].str.contains(_IP_RE).astype(int)
+        df['has_port'] = df['url'].str.contains(_PORT_RE).astype(int)
         
         # ========== DOMAIN ANALYSIS ==========
         print("Analyzing domain characteristics...")
-        df['domain'] = df['url'].apply(extract_domain)
-        df['domain_length'] = df['domain'].apply(len)
-        df['subdomain_count'] = df['domain'].apply(lambda x: x.count('.'))
+        df['domain'] = extract_domains(df['url'])
+        df['domain_length'] = df['domain'].str.len()
+        df['subdomain_count'] = df['domain'].str.count(r'\.')
         df['tld'] = df['url'].apply(get_tld)
         
         # Check for suspicious TLDs
-        suspicious_tlds = ['tk', 'ml', 'ga', 'cf', 'gq', 'xyz', 'top', 'work', 'click', 'link']
-        df['has_suspicious_tld'] = df['tld'].apply(lambda x: int(x in suspicious_tlds))
+        df['has_suspicious_tld'] = df['tld'].isin(SUSPICIOUS_TLDS).astype(int)
         
         # Check for trusted TLDs
-        trusted_tlds = ['com', 'org', 'net', 'edu', 'gov', 'mil']
-        df['has_trusted_tld'] = df['tld'].apply(lambda x: int(x in trusted_tlds))
+        df['has_trusted_tld'] = df['tld'].isin(TRUSTED_TLDS).astype(int)
         
         # ========== PROTOCOL AND SECURITY ==========
         print("Checking protocol and security indicators...")
-        df['is_https'] = df['url'].apply(lambda x: int(x.startswith('https://')))
-        df['is_http'] = df['url'].apply(lambda x: int(x.startswith('http://')))
+        df['is_https'] = df['url'].str.startswith('https://').astype(int)
+        df['is_http'] = df['url'].str.startswith('http://').astype(int)
         
         # ========== PATH AND STRUCTURE ==========
         print("Analyzing URL path structure...")
         df['url_depth'] = df['url'].apply(lambda x: len([p for p in x.split('/') if p and '://' not in p]))
-        df['has_query_string'] = df['url'].apply(lambda x: int('?' in x))
+        df['has_query_string'] = df['url'].str.contains('?', regex=False).astype(int)
         df['query_length'] = df['url'].apply(lambda x: len(x.split('?')[1]) if '?' in x else 0)
         
         # ========== SUSPICIOUS PATTERNS ==========
         print("Detecting suspicious patterns...")
+        url_shorteners = URL_SHORTENERS
+        redirect_markers = REDIRECT_MARKERS
+        suspicious_keywords = SUSPICIOUS_KEYWORDS
+        brands = BRANDS
+        
+        # Scan each URL once (lowercased once) for every shortener, marker, keyword and brand
+        all_terms = list(dict.fromkeys(url_shorteners + redirect_markers + suspicious_keywords + brands))
+        term_hits = scan_terms(df['url'], all_terms)
+        term_column = {term: j for j, term in enumerate(all_terms)}
         
         # Multiple subdomains (phishing often uses: legitimate-looking.actual-domain.com)
-        df['excessive_subdomains'] = df['subdomain_count'].apply(lambda x: int(x > 3))
+        df['excessive_subdomains'] = (df['subdomain_count'] > 3).astype(int)
         
         # Suspicious character sequences
         df['has_double_slash'] = df['url'].apply(lambda x: int('//' in x.split('://')[1] if '://' in x else False))
-        df['has_url_shortener'] = df['url'].apply(lambda x: int(any(short in x.lower() for short in ['bit.ly', 'goo.gl', 'tinyurl', 't.co', 'ow.ly'])))
+        df['has_url_shortener'] = term_hits[:, [term_column[t] for t in url_shorteners]].any(axis=1).astype('int8')
         
         # ========== BRAND/KEYWORD IMPERSONATION ==========
         print("Checking for brand impersonation...")
-        # Suspicious keywords that appear in phishing URLs
-        suspicious_keywords = [
-            'secure', 'account', 'update', 'login', 'verify', 'confirm', 'banking',
-            'signin', 'webscr', 'password', 'suspend', 'restricted', 'alert',
-            'credential', 'authenticate', 'validation'
-        ]
-        
-        # Brand names often impersonated
-        brands = ['paypal', 'microsoft', 'apple', 'google', 'amazon', 'facebook', 
-                  'netflix', 'bank', 'chase', 'wellsfargo', 'dhl', 'fedex']
-        
         for kw in suspicious_keywords:
-            df[f'has_{kw}'] = df['url'].apply(lambda x: int(kw in x.lower()))
+            df[f'has_{kw}'] = term_hits[:, term_column[kw]]
         
         for brand in brands:
-            df[f'has_brand_{brand}'] = df['url'].apply(lambda x: int(brand in x.lower()))
+            df[f'has_brand_{brand}'] = term_hits[:, term_column[brand]]
         
         # Check if brand name appears in subdomain (common phishing tactic)
-        df['brand_in_subdomain'] = df['url'].apply(lambda x: int(
-            any(brand in extract_domain(x).split('.')[0].lower() for brand in brands)
-        ))
+        # Reuses the already-extracted domain instead of re-parsing each URL per brand
+        first_label = df['domain'].str.split('.', n=1).str[0]
+        df['brand_in_subdomain'] = first_label.apply(
+            lambda label: int(any(brand in label for brand in brands))
+        ).astype('int8')
         
         # ========== URL SHORTENING AND REDIRECTION ==========
-        df['has_redirect'] = df['url'].apply(lambda x: int(
-            'redirect' in x.lower() or 'url=' in x.lower() or 'redir' in x.lower()
-        ))
+        df['has_redirect'] = term_hits[:, [term_column[t] for t in redirect_markers]].any(axis=1).astype('int8')
         
         # ========== NETWORK-BASED SECURITY FEATURES ==========
         print(f"\n[7/9] PERFORMING REAL SECURITY CHECKS (This will take time)...")
         print(f"   Checking DNS, SSL, and web content for {len(df):,} URLs...")
-        print(f"   Estimated time: {len(df) * 2 / 60:.1f} minutes\n")
-        
-        # Initialize columns
-        df['has_dns'] = 0
-        df['dns_ip_count'] = 0
-        df['has_ssl'] = 0
-        df['ssl_days_valid'] = 0
-        df['ssl_trusted'] = 0
-        df['http_status'] = 0
-        df['num_forms'] = 0
-        df['num_inputs'] = 0
-        df['has_password_field'] = 0
-        df['num_page_links'] = 0
-        df['num_scripts'] = 0
-        df['has_iframe'] = 0
-        df['has_js_redirect'] = 0
-        
-        # Process each URL
-        total = len(df)
+        print(f"   Estimated time: {len(df) * 2 / 60 / NETWORK_WORKERS:.1f} minutes ({NETWORK_WORKERS} at a time)\n")
+        
+        # Collect results in preallocated arrays, filled by position
+        urls = df['url'].to_numpy()
+        total = len(urls)
+        dns_results = np.zeros((total, 2), dtype=np.int32)
+        ssl_results = np.zeros((total, 3), dtype=np.int32)
+        content_results = np.zeros((total, 8), dtype=np.int32)
         checked = 0
         start_network = time.time()
-        
-        for idx in df.index:
-            if checked % 50 == 0 and checked > 0:
-                elapsed = time.time() - start_network
-                rate = checked / elapsed
-                remaining = (total - checked) / rate
-                print(f"   Progress: {checked}/{total} ({checked/total*100:.1f}%) - "
-                      f"ETA: {remaining/60:.1f} min", end='\r')
-            
-            url = df.at[idx, 'url']
-            
-            # DNS Check (fast)
-            has_dns, ip_count = check_dns_record(url)
-            df.at[idx, 'has_dns'] = has_dns
-            df.at[idx, 'dns_ip_count'] = ip_count
-            
-            # Only do further checks if DNS exists
-            if has_dns:
-                # SSL Check (for HTTPS URLs)
-                if url.startswith('https'):
-                    has_ssl, days_valid, is_trusted = check_ssl_certificate(url)
-                    df.at[idx, 'has_ssl'] = has_ssl
-                    df.at[idx, 'ssl_days_valid'] = days_valid
-                    df.at[idx, 'ssl_trusted'] = is_trusted
+        last_progress = start_network
+        
+        # In-place (\r) progress is only useful on a terminal, not in redirected logs
+        show_progress = getattr(sys.stdout, 'isatty', lambda: False)()
+        
+        # Fetch cached DNS/SSL results for the whole batch in one query each
+        dns_prefetched = {}
+        if FEATURE_CACHE_AVAILABLE:
+            cache = get_cache()
+            dns_prefetched = cache.get_many(urls, 'dns')
+            ssl_prefetched = cache.get_many([url for url in urls if url.startswith('https')], 'ssl')
+            print(f"   Cache hits: {len(dns_prefetched):,} DNS, {len(ssl_prefetched):,} SSL")
+        
+        # Resolve the remaining domains in concurrent batches (with aiodns);
+        # domains without a definite answer fall back to a per-URL lookup
+        resolved = resolve_domains(domain for url, domain in zip(urls, df['domain']) if url not in dns_prefetched)
+        if resolved:
+            print(f"   Resolved {len(resolved):,} domains in one batch")
+            dns_lookup = lambda url: resolved.get(extract_domain(url)) or check_dns_record(url)
+        else:
+            dns_lookup = check_dns_record
+        
+        if FEATURE_CACHE_AVAILABLE:
+            dns_check = lambda url: cached_dns_check(url, dns_lookup, dns_prefetched)
+            ssl_check = lambda url: cached_ssl_check(url, check_ssl_certificate, ssl_prefetched)
+        else:
+            dns_check = dns_lookup
+            ssl_check = check_ssl_certificate
+        
+        with ThreadPoolExecutor(max_workers=NETWORK_WORKERS, thread_name_prefix='feature-net') as executor:
+            for chunk_start in range(0, total, NETWORK_CHUNK_SIZE):
+                chunk = urls[chunk_start:chunk_start + NETWORK_CHUNK_SIZE]
+                results = executor.map(_network_checks, chunk,
+                                       [dns_check] * len(chunk), [ssl_check] * len(chunk))
                 
-                # Page Content Check (slower)
-                status, forms, inputs, has_pwd, links, scripts, iframe, redirect = check_page_content(url)
-                df.at[idx, 'http_status'] = status
-                df.at[idx, 'num_forms'] = forms
-                df.at[idx, 'num_inputs'] = inputs
-                df.at[idx, 'has_password_field'] = has_pwd
-                df.at[idx, 'num_page_links'] = links
-                df.at[idx, 'num_scripts'] = scripts
-                df.at[idx, 'has_iframe'] = iframe
-                df.at[idx, 'has_js_redirect'] = redirect
-            
-            checked += 1
+                for i, (dns_result, ssl_result, content_result) in enumerate(results, chunk_start):
+                    dns_results[i] = dns_result
+                    if ssl_result is not None:
+                        ssl_results[i] = ssl_result
+                    if content_result is not None:
+                        content_results[i] = content_result
+                    checked += 1
+                    
+                    if show_progress and time.time() - last_progress >= PROGRESS_INTERVAL:
+                        last_progress = time.time()
+                        elapsed = last_progress - start_network
+                        rate = checked / elapsed
+                        remaining = (total - checked) / rate
+                        print(f"   Progress: {checked}/{total} ({checked/total*100:.1f}%) - "
+                              f"ETA: {remaining/60:.1f} min", end='\r')
+        
+        df[['has_dns', 'dns_ip_count']] = dns_results
+        df[['has_ssl', 'ssl_days_valid', 'ssl_trusted']] = ssl_results
+        df[['http_status', 'num_forms', 'num_inputs', 'has_password_field',
+            'num_page_links', 'num_scripts', 'has_iframe', 'has_js_redirect']] = content_results
         
         network_time = time.time() - start_network
         print(f"\n   ✓ Completed {checked:,} network security checks ({network_time/60:.1f} minutes)")
@@ -350,6 +664,16 @@ def extract_features(df):
             if col in df.columns:
                 df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
         
+        # Downcast to the smallest dtype that holds each feature
+        binary_cols = [col for col in feature_cols
+                       if col.startswith(BINARY_FEATURE_PREFIXES) or col in BINARY_FEATURES]
+        float_cols = [col for col in feature_cols if col.endswith(FLOAT_FEATURE_SUFFIXES)]
+        count_cols = [col for col in feature_cols
+                      if col not in binary_cols and col not in float_cols]
+        df[binary_cols] = df[binary_cols].astype(np.int8)
+        df[float_cols] = df[float_cols].astype(np.float32)
+        df[count_cols] = df[count_cols].astype(np.int32)
+        
         total_time = time.time() - start_time
         print(f"\n{'='*70}")
         print(f"  ✅ FEATURE EXTRACTION COMPLETE")
@@ -4,21 +4,178 @@ Includes: Domain Age, SSL Verification, DNS Checks, Content Analysis
 """
 
 import re
+import numpy as np
 import pandas as pd
 import math
 import socket
 import ssl
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
-from collections import Counter
+from collections import Counter, defaultdict
 from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from joblib import Parallel, delayed, effective_n_jobs
+import threading
+import sqlite3
+import sys
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from .feature_extraction import scan_terms
+    from .feature_cache import get_cache
+except ImportError:
+    from feature_extraction import scan_terms
+    from feature_cache import get_cache
+
+# Optional: resolve all DNS lookups concurrently on one event loop
+try:
+    import asyncio
+    import aiodns
+    # c-ares results that mean the name has no IPv4 address; anything else
+    # (timeouts, server failures) is retried on the thread pool
+    _DNS_NO_ADDRESS = {aiodns.error.ARES_ENOTFOUND, aiodns.error.ARES_ENODATA}
+    AIODNS_AVAILABLE = True
+except ImportError:
+    AIODNS_AVAILABLE = False
+
 # Set reasonable timeouts
 TIMEOUT = 3
 MAX_RETRIES = 1
 
+# Only the start of a page is read for content features
+MAX_CONTENT_BYTES = 256 * 1024
+
+# Minimum seconds between in-place progress updates
+PROGRESS_INTERVAL = 0.5
+
+# Network checks are I/O-bound, so many threads can wait on sockets at once
+NETWORK_WORKERS = 64
+MAX_NETWORK_CHECKS = 500
+
+# Batched DNS lookups are issued DNS_BATCH_SIZE domains at a time, with at most
+# DNS_MAX_IN_FLIGHT queries outstanding, so the resolver isn't flooded
+DNS_BATCH_SIZE = 500
+DNS_MAX_IN_FLIGHT = 100
+
+# Network results are cached per domain, so repeated hosts are only checked once
+DOMAIN_CACHE_SIZE = 8192
+
+# Also keep WHOIS/SSL results in the on-disk feature cache so later runs skip them
+USE_PERSISTENT_CACHE = True
+
+# WHOIS servers rate-limit per client, so only a few lookups per TLD run at once
+WHOIS_PER_TLD = 2
+_whois_slots = defaultdict(lambda: threading.Semaphore(WHOIS_PER_TLD))
+_whois_slots_lock = threading.Lock()
+
+# Lookups currently running, keyed by (function, domain); see _single_flight
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+# Shared HTTP session so keep-alive connections (and TLS sessions) are reused.
+# Safe to share across the network worker threads for plain GET requests.
+_SESSION = requests.Session()
+_SESSION.headers.update({'User-Agent': 'Mozilla/5.0'})
+_adapter = HTTPAdapter(pool_connections=NETWORK_WORKERS, pool_maxsize=NETWORK_WORKERS * 2, max_retries=0)
+_SESSION.mount('http://', _adapter)
+_SESSION.mount('https://', _adapter)
+
+# One verifying TLS context for every SSL check, so the CA bundle is loaded once.
+# Verification stays on: getpeercert() only returns the parsed cert for verified peers.
+_SSL_CONTEXT = ssl.create_default_context()
+
+# Feature dtypes used when finalizing: 0/1 flags, fractional values, everything else is a count
+BINARY_FEATURE_PREFIXES = ('has_', 'is_')
+BINARY_FEATURES = {'excessive_subdomains', 'brand_in_subdomain', 'ssl_trusted'}
+FLOAT_FEATURE_SUFFIXES = ('_ratio', '_entropy')
+
+# Patterns compiled once and shared by every row
+URL_SHORTENERS = ['bit.ly', 'goo.gl', 'tinyurl', 't.co', 'ow.ly']
+REDIRECT_MARKERS = ['redirect', 'url=', 'redir', 'goto']
+SUSPICIOUS_KEYWORDS = ['secure', 'account', 'update', 'login', 'verify', 'confirm',
+                       'banking', 'signin', 'webscr', 'password', 'suspend']
+BRANDS = ['paypal', 'microsoft', 'apple', 'google', 'amazon', 'facebook', 'netflix', 'bank']
+_DOT_RE = re.compile(r'\.')
+_TLD_RE = re.compile(r'\.([^.]*)$')
+_IP_RE = re.compile(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b')
+_PORT_RE = re.compile(r':\d{2,5}')
+_PATH_SEGMENT_RE = re.compile(r'[^/]+')
+# Host of a URL the way urlparse finds it: optional scheme, optional '//', up to port/path/query
+_HOST_RE = re.compile(r'^(?:[A-Za-z][A-Za-z0-9+.\-]*:)?(?://)?([^/?#:]*)')
+# Characters urlparse treats specially (whitespace, params, IPv6, non-ASCII)
+_URLPARSE_ONLY_RE = re.compile(r'[^\x21-\x7e]|[;\[\]]')
+_QUERY_RE = re.compile(r'\?([^?]*)')
+
+# Characters counted in the fused byte pass, and the column each count goes to
+CHAR_COUNT_COLUMNS = {
+    '.': 'num_dots', '-': 'num_hyphens', '_': 'num_underscores', '/': 'num_slashes',
+    '?': 'num_question', '=': 'num_equal', '@': 'num_at', '&': 'num_ampersand', '%': 'num_percent',
+}
+_DIGIT_CLASS = len(CHAR_COUNT_COLUMNS)
+_LOWER_CLASS = _DIGIT_CLASS + 1
+_UPPER_CLASS = _DIGIT_CLASS + 2
+_OTHER_CLASS = _DIGIT_CLASS + 3
+_NUM_CLASSES = _OTHER_CLASS + 1
+
+# Maps every UTF-8 byte to its character class
+_BYTE_CLASS = np.full(256, _OTHER_CLASS, dtype=np.int64)
+for _j, _ch in enumerate(CHAR_COUNT_COLUMNS):
+    _BYTE_CLASS[ord(_ch)] = _j
+_BYTE_CLASS[ord('0'):ord('9') + 1] = _DIGIT_CLASS
+_BYTE_CLASS[ord('a'):ord('z') + 1] = _LOWER_CLASS
+_BYTE_CLASS[ord('A'):ord('Z') + 1] = _UPPER_CLASS
+
+# Static features are split across processes only when every shard gets this many rows
+PARALLEL_MIN_ROWS = 50000
+
+# Rows per byte histogram when computing entropy (256 counters per row)
+ENTROPY_CHUNK_ROWS = 20000
+
+def _url_bytes(urls):
+    """UTF-8 bytes of all URLs concatenated, plus the byte length of each URL"""
+    encoded = [url.encode('utf-8', 'surrogatepass') for url in urls]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    codes = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return codes, lengths
+
+def count_char_classes(urls):
+    """
+    Count punctuation, digits, letters and uppercase letters for every URL
+    in a single vectorized pass over the UTF-8 bytes of the whole column
+    
+    Args:
+        urls: pandas Series of URL strings
+    
+    Returns:
+        dict of column name -> numpy int32 array
+    """
+    codes, lengths = _url_bytes(urls)
+    n = len(lengths)
+    rows = np.repeat(np.arange(n, dtype=np.int64), lengths)
+    
+    counts = np.bincount(rows * _NUM_CLASSES + _BYTE_CLASS[codes], minlength=n * _NUM_CLASSES)
+    counts = counts.reshape(n, _NUM_CLASSES).astype(np.int32)
+    
+    result = {col: counts[:, j] for j, col in enumerate(CHAR_COUNT_COLUMNS.values())}
+    result['digit_count'] = counts[:, _DIGIT_CLASS]
+    result['letter_count'] = counts[:, _LOWER_CLASS] + counts[:, _UPPER_CLASS]
+    result['uppercase_count'] = counts[:, _UPPER_CLASS]
+    
+    # Bytes only see ASCII; the few non-ASCII URLs are recounted with the str
+    # methods, which also class characters like '²' (a digit) or 'É' (uppercase)
+    non_ascii = lengths != urls.str.len().to_numpy()
+    if non_ascii.any():
+        unicode_urls = urls[non_ascii]
+        result['digit_count'][non_ascii] = unicode_urls.apply(lambda x: sum(c.isdigit() for c in x))
+        result['letter_count'][non_ascii] = unicode_urls.apply(lambda x: sum(c.isalpha() for c in x))
+        result['uppercase_count'][non_ascii] = unicode_urls.apply(lambda x: sum(c.isupper() for c in x))
+    
+    return result
+
 def calculate_entropy(text):
     """Calculate Shannon entropy of a string (measure of randomness)"""
     if not text:
@@ -28,8 +185,64 @@ def calculate_entropy(text):
     entropy = -sum((count/length) * math.log2(count/length) for count in counter.values())
     return entropy
 
+def calculate_entropy_batch(urls):
+    """
+    Shannon entropy of every URL, computed from per-row byte histograms
+    
+    Args:
+        urls: pandas Series of URL strings
+    
+    Returns:
+        numpy float64 array, same values as calculate_entropy per URL
+    """
+    codes, lengths = _url_bytes(urls)
+    entropy = np.zeros(len(lengths))
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    
+    for start in range(0, len(lengths), ENTROPY_CHUNK_ROWS):
+        stop = min(start + ENTROPY_CHUNK_ROWS, len(lengths))
+        chunk_lengths = lengths[start:stop]
+        chunk_codes = codes[offsets[start]:offsets[stop]]
+        rows = np.repeat(np.arange(stop - start, dtype=np.int64), chunk_lengths)
+        
+        # Only the non-empty histogram bins contribute to the sum
+        hist = np.bincount(rows * 256 + chunk_codes, minlength=(stop - start) * 256)
+        bins = np.flatnonzero(hist)
+        bin_rows = bins // 256
+        p = hist[bins] / chunk_lengths[bin_rows]
+        entropy[start:stop] = -np.bincount(bin_rows, weights=p * np.log2(p), minlength=stop - start)
+    
+    # Multi-byte characters would be split into bytes; use the exact version for those URLs
+    non_ascii = lengths != urls.str.len().to_numpy()
+    if non_ascii.any():
+        entropy[non_ascii] = urls[non_ascii].apply(calculate_entropy).to_numpy()
+    
+    return entropy
+
 def extract_domain(url):
     """Extract clean domain from URL"""
+    if _URLPARSE_ONLY_RE.search(url):
+        return _parse_domain(url)
+    return _HOST_RE.match(url).group(1).lower()
+
+def extract_domains(urls):
+    """
+    Vectorized extract_domain for a pandas Series of URLs
+    
+    Args:
+        urls: pandas Series of URL strings
+    
+    Returns:
+        pandas Series of lowercase domains
+    """
+    domains = urls.str.extract(_HOST_RE, expand=False).str.lower()
+    unusual = urls.str.contains(_URLPARSE_ONLY_RE)
+    if unusual.any():
+        domains[unusual] = urls[unusual].apply(_parse_domain)
+    return domains
+
+def _parse_domain(url):
+    """Domain via urlparse, for URLs the regex does not cover"""
     try:
         parsed = urlparse(url)
         # Handle both full URLs and just domains
@@ -40,18 +253,77 @@ def extract_domain(url):
     except:
         return ""
 
-def get_domain_age_days(url):
+def _single_flight(func, domain):
     """
-    Get domain age in days using WHOIS
-    Returns -1 if unavailable
+    Call func(domain), sharing one in-progress call between threads
+    
+    Worker threads that ask for the same domain while a lookup is running
+    wait for that result instead of issuing a duplicate network request.
     """
+    key = (func, domain)
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _inflight[key] = future
+    
+    if not is_owner:
+        return future.result()
+    
+    try:
+        result = func(domain)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+def _load_cached(domain, check_type):
+    """Read a per-domain result from the persistent feature cache (None on miss)"""
+    if not USE_PERSISTENT_CACHE:
+        return None
+    try:
+        return get_cache().get(domain, check_type)
+    except sqlite3.Error:
+        return None
+
+def _store_cached(domain, check_type, result):
+    """Write a per-domain result to the persistent feature cache"""
+    if not USE_PERSISTENT_CACHE:
+        return
+    try:
+        get_cache().set(domain, check_type, result)
+    except sqlite3.Error:
+        pass
+
+@lru_cache(maxsize=DOMAIN_CACHE_SIZE)
+def _whois_age_for_domain(domain):
+    """WHOIS domain age in days for a bare domain (-1 if unavailable)"""
+    cached = _load_cached(domain, 'whois_domain')
+    if cached is not None:
+        return cached['domain_age_days']
+    
+    age = _fetch_whois_age(domain)
+    # Failed lookups are often rate limits, so only successes are kept on disk
+    if age >= 0:
+        _store_cached(domain, 'whois_domain', {'domain_age_days': age})
+    return age
+
+def _whois_slot(domain):
+    """Semaphore limiting concurrent WHOIS queries for the domain's TLD"""
+    with _whois_slots_lock:
+        return _whois_slots[domain.rsplit('.', 1)[-1]]
+
+def _fetch_whois_age(domain):
+    """Query WHOIS for a bare domain's age in days (-1 if unavailable)"""
     try:
         import whois
-        domain = extract_domain(url)
-        if not domain:
-            return -1
-        
-        w = whois.whois(domain)
+        with _whois_slot(domain):
+            w = whois.whois(domain)
         
         if w.creation_date:
             creation_date = w.creation_date
@@ -65,19 +337,49 @@ def get_domain_age_days(url):
     
     return -1
 
-def check_ssl_certificate(url):
+def lookup_domain_ages(domains):
     """
-    Check if URL has valid SSL certificate
-    Returns: (has_ssl, cert_valid_days, is_trusted)
+    WHOIS domain age for many bare domains, queried concurrently
+    (at most WHOIS_PER_TLD queries per TLD at a time)
+    Returns: {domain: age_days}
+    """
+    domains = list(dict.fromkeys(d for d in domains if d))
+    if not domains:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=NETWORK_WORKERS) as executor:
+        return dict(zip(domains, executor.map(_whois_age_for_domain, domains)))
+
+def get_domain_age_days(url):
     """
+    Get domain age in days using WHOIS
+    Returns -1 if unavailable
+    """
+    domain = extract_domain(url)
+    if not domain:
+        return -1
+    return _single_flight(_whois_age_for_domain, domain)
+
+@lru_cache(maxsize=DOMAIN_CACHE_SIZE)
+def _ssl_for_domain(domain):
+    """SSL certificate check for a bare domain: (has_ssl, cert_valid_days, is_trusted)"""
+    cached = _load_cached(domain, 'ssl_domain')
+    if cached is not None:
+        return cached['has_ssl'], cached['days_valid'], cached['is_trusted']
+    
+    has_ssl, days_valid, is_trusted = _fetch_ssl(domain)
+    _store_cached(domain, 'ssl_domain', {
+        'has_ssl': has_ssl,
+        'days_valid': days_valid,
+        'is_trusted': is_trusted
+    })
+    return has_ssl, days_valid, is_trusted
+
+def _fetch_ssl(domain):
+    """Connect to a bare domain on port 443 and read its certificate"""
     try:
-        domain = extract_domain(url)
-        if not domain or not url.startswith('https'):
-            return 0, 0, 0
-        
-        context = ssl.create_default_context()
         with socket.create_connection((domain, 443), timeout=TIMEOUT) as sock:
-            with context.wrap_socket(sock, server_hostname=domain) as ssock:
+            with _SSL_CONTEXT.wrap_socket(sock, server_hostname=domain) as ssock:
                 cert = ssock.getpeercert()
                 
                 # Check expiry
@@ -96,23 +398,100 @@ def check_ssl_certificate(url):
     
     return 0, 0, 0
 
-def check_dns_record(url):
+def check_ssl_certificate(url):
     """
-    Check if domain has valid DNS record
-    Returns: (has_dns, ip_count)
+    Check if URL has valid SSL certificate
+    Returns: (has_ssl, cert_valid_days, is_trusted)
+    """
+    if not url.startswith('https'):
+        return 0, 0, 0
+    return check_ssl_by_domain(extract_domain(url))
+
+def check_ssl_by_domain(domain):
+    """
+    SSL certificate check for an already extracted domain ('' skips the check)
+    Returns: (has_ssl, cert_valid_days, is_trusted)
     """
+    if not domain:
+        return 0, 0, 0
+    return _single_flight(_ssl_for_domain, domain)
+
+@lru_cache(maxsize=DOMAIN_CACHE_SIZE)
+def _dns_for_domain(domain):
+    """DNS lookup for a bare domain: (has_dns, ip_count)"""
     try:
-        domain = extract_domain(url)
-        if not domain:
-            return 0, 0
-        
         ips = socket.getaddrinfo(domain, None, family=socket.AF_INET)
-        ip_addresses = list(set([ip[4][0] for ip in ips]))
+        ip_addresses = set(ip[4][0] for ip in ips)
         
         return 1, len(ip_addresses)
     except:
         return 0, 0
 
+def check_dns_record(url):
+    """
+    Check if domain has valid DNS record
+    Returns: (has_dns, ip_count)
+    """
+    domain = extract_domain(url)
+    if not domain:
+        return 0, 0
+    return _single_flight(_dns_for_domain, domain)
+
+async def _resolve_all(domains):
+    """
+    Resolve domains concurrently with aiodns: {domain: (has_dns, ip_count)}
+    Domains whose lookup failed without a definite answer are left out
+    """
+    resolver = aiodns.DNSResolver(timeout=TIMEOUT)
+    in_flight = asyncio.Semaphore(DNS_MAX_IN_FLIGHT)
+    
+    async def _one(domain):
+        async with in_flight:
+            try:
+                result = await resolver.getaddrinfo(domain, family=socket.AF_INET)
+                return 1, len(set(node.addr[0] for node in result.nodes))
+            except aiodns.error.DNSError as e:
+                if e.args and e.args[0] in _DNS_NO_ADDRESS:
+                    return 0, 0
+                return None
+            except Exception:
+                return None
+    
+    resolved = {}
+    try:
+        for start in range(0, len(domains), DNS_BATCH_SIZE):
+            batch = domains[start:start + DNS_BATCH_SIZE]
+            results = await asyncio.gather(*[_one(domain) for domain in batch])
+            resolved.update((domain, result) for domain, result in zip(batch, results)
+                            if result is not None)
+    finally:
+        await resolver.close()
+    return resolved
+
+def resolve_domains(domains):
+    """
+    DNS lookup for many bare domains in one batch
+    Uses aiodns when installed, otherwise the thread pool
+    Returns: {domain: (has_dns, ip_count)}
+    """
+    domains = list(dict.fromkeys(d for d in domains if d))
+    if not domains:
+        return {}
+    
+    resolved = {}
+    if AIODNS_AVAILABLE:
+        try:
+            resolved = asyncio.run(_resolve_all(domains))
+        except RuntimeError:
+            pass  # Called from inside a running event loop
+    
+    # Whatever aiodns couldn't answer (or everything, without it) goes through the thread pool
+    remaining = [domain for domain in domains if domain not in resolved]
+    if remaining:
+        with ThreadPoolExecutor(max_workers=NETWORK_WORKERS) as executor:
+            resolved.update(zip(remaining, executor.map(_dns_for_domain, remaining)))
+    return resolved
+
 def fetch_page_content_features(url):
     """
     Fetch page and analyze content
@@ -123,25 +502,25 @@ def fetch_page_content_features(url):
         if not url.startswith(('http://', 'https://')):
             url = 'http://' + url
         
-        response = requests.get(
+        # Stream the body and stop after MAX_CONTENT_BYTES; counts work on raw bytes
+        with _SESSION.get(
             url, 
             timeout=TIMEOUT, 
             allow_redirects=True,
             verify=False,
-            headers={'User-Agent': 'Mozilla/5.0'}
-        )
-        
-        status_code = response.status_code
-        content = response.text.lower()
+            stream=True
+        ) as response:
+            status_code = response.status_code
+            content = response.raw.read(MAX_CONTENT_BYTES, decode_content=True).lower()
         
         # Count forms
-        num_forms = content.count('<form')
+        num_forms = content.count(b'<form')
         
         # Count links
-        num_links = content.count('<a ')
+        num_links = content.count(b'<a ')
         
         # Check for login indicators
-        has_login = int(any(kw in content for kw in ['password', 'login', 'signin', 'username']))
+        has_login = int(any(kw in content for kw in [b'password', b'login', b'signin', b'username']))
         
         # Estimate page rank (rough heuristic based on content size and links)
         page_rank_estimate = min(10, (len(content) / 10000) + (num_links / 100))
@@ -150,7 +529,115 @@ def fetch_page_content_features(url):
     except:
         return 0, 0, 0, 0, 0
 
-def extract_features_comprehensive(df, use_network_features=True, sample_size=None):
+def extract_static_features(urls, verbose=True):
+    """
+    Compute every static (non-network) feature for a Series of URLs
+    
+    Args:
+        urls: pandas Series of URL strings
+        verbose: If True, prints progress for each stage
+    
+    Returns:
+        DataFrame of static features, indexed like urls
+    """
+    log = print if verbose else (lambda *args, **kwargs: None)
+    
+    # ========== STATIC URL FEATURES (FAST) ==========
+    features = {}
+    
+    log("[1/8] Extracting basic URL structure...")
+    char_counts = count_char_classes(urls)
+    url_length = urls.str.len()
+    features['url_length'] = url_length
+    for col in CHAR_COUNT_COLUMNS.values():
+        features[col] = char_counts[col]
+    log(f"   ✓ Extracted {10} structural features")
+    
+    # ========== STRING ANALYSIS ==========
+    log("[2/8] Analyzing character patterns...")
+    features['url_entropy'] = calculate_entropy_batch(urls)
+    features['digit_count'] = char_counts['digit_count']
+    features['digit_ratio'] = char_counts['digit_count'] / url_length
+    features['letter_count'] = char_counts['letter_count']
+    features['letter_ratio'] = char_counts['letter_count'] / url_length
+    features['uppercase_count'] = char_counts['uppercase_count']
+    features['uppercase_ratio'] = char_counts['uppercase_count'] / url_length
+    log(f"   ✓ Extracted 7 character features")
+    
+    # ========== DOMAIN ANALYSIS ==========
+    log("[3/8] Analyzing domains and TLDs...")
+    url_domains = extract_domains(urls)
+    subdomain_count = url_domains.str.count(_DOT_RE)
+    features['domain_length'] = url_domains.str.len()
+    features['subdomain_count'] = subdomain_count
+    
+    # TLD analysis
+    tld = url_domains.str.extract(_TLD_RE, expand=False).fillna('')
+    suspicious_tlds = ['tk', 'ml', 'ga', 'cf', 'gq', 'xyz', 'top', 'work', 'click', 'link', 'pw', 'cc']
+    features['has_suspicious_tld'] = tld.isin(suspicious_tlds).astype(int)
+    trusted_tlds = ['com', 'org', 'net', 'edu', 'gov', 'mil']
+    features['has_trusted_tld'] = tld.isin(trusted_tlds).astype(int)
+    log(f"   ✓ Extracted 6 domain features")
+    
+    # ========== PROTOCOL & SECURITY INDICATORS ==========
+    log("[4/8] Checking protocols and patterns...")
+    features['is_https'] = urls.str.startswith('https://').astype(int)
+    features['is_http'] = urls.str.startswith('http://').astype(int)
+    features['has_ip'] = urls.str.contains(_IP_RE).astype(int)
+    features['has_port'] = urls.str.contains(_PORT_RE).astype(int)
+    features['url_depth'] = urls.str.count(_PATH_SEGMENT_RE)
+    features['has_query_string'] = urls.str.contains('?', regex=False).astype(int)
+    features['query_length'] = urls.str.extract(_QUERY_RE, expand=False).str.len().fillna(0).astype(int)
+    log(f"   ✓ Extracted 7 protocol features")
+    
+    # ========== SUSPICIOUS PATTERNS ==========
+    log("[5/8] Detecting suspicious patterns...")
+    keywords = SUSPICIOUS_KEYWORDS[:5]  # Limit to top 5 to avoid too many features
+    brands = BRANDS[:5]  # Limit to top 5 brands
+    
+    # One pass over each URL finds every shortener, redirect, keyword and brand
+    terms = URL_SHORTENERS + REDIRECT_MARKERS + keywords + brands
+    hits = scan_terms(urls, terms)
+    n_short, n_redir = len(URL_SHORTENERS), len(REDIRECT_MARKERS)
+    term_cols = {term: j for j, term in enumerate(terms)}
+    
+    features['excessive_subdomains'] = (subdomain_count > 3).astype(int)
+    features['has_double_slash'] = urls.str.split('://', n=2, regex=False).str[1].fillna('').str.contains('//', regex=False).astype(int)
+    features['has_url_shortener'] = hits[:, :n_short].any(axis=1).astype(int)
+    features['has_redirect'] = hits[:, n_short:n_short + n_redir].any(axis=1).astype(int)
+    log(f"   ✓ Extracted 4 pattern features")
+    
+    # ========== KEYWORD ANALYSIS ==========
+    log("[6/8] Checking for brand impersonation...")
+    for kw in keywords:
+        features[f'has_{kw}'] = hits[:, term_cols[kw]]
+    
+    for brand in brands:
+        features[f'has_brand_{brand}'] = hits[:, term_cols[brand]]
+    
+    first_labels = url_domains.str.split('.', n=1).str[0]
+    features['brand_in_subdomain'] = scan_terms(first_labels, BRANDS).any(axis=1).astype(int)
+    log(f"   ✓ Extracted 11 keyword features")
+    
+    # Plain arrays so a non-unique index is never re-aligned
+    return pd.DataFrame({col: np.asarray(values) for col, values in features.items()},
+                        index=urls.index)
+
+def _extract_static_sharded(urls, n_jobs):
+    """Run extract_static_features on row shards in worker processes"""
+    n_shards = min(effective_n_jobs(n_jobs), max(1, len(urls) // PARALLEL_MIN_ROWS))
+    if n_shards <= 1:
+        return extract_static_features(urls)
+    
+    print(f"[1-6/8] Extracting static features in {n_shards} parallel shards...")
+    bounds = np.linspace(0, len(urls), n_shards + 1).astype(int)
+    shards = [urls.iloc[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+    parts = Parallel(n_jobs=n_shards)(
+        delayed(extract_static_features)(shard, verbose=False) for shard in shards)
+    print(f"   ✓ Extracted {parts[0].shape[1]} static features")
+    return pd.concat(parts)
+
+def extract_features_comprehensive(df, use_network_features=True, sample_size=None, n_jobs=-1):
     """
     Extract comprehensive features including network checks
     
@@ -158,6 +645,7 @@ def extract_features_comprehensive(df, use_network_features=True, sample_size=No
         df: DataFrame with 'url' column
         use_network_features: If True, performs actual network checks (slow but accurate)
         sample_size: If set, only checks network features for this many samples
+        n_jobs: Processes for the static features on large inputs (-1 = all cores, 1 = serial)
     
     Returns:
         DataFrame with all features
@@ -173,79 +661,12 @@ def extract_features_comprehensive(df, use_network_features=True, sample_size=No
     
     try:
         # ========== STATIC URL FEATURES (FAST) ==========
-        print("[1/8] Extracting basic URL structure...")
-        df['url_length'] = df['url'].apply(len)
-        df['num_dots'] = df['url'].apply(lambda x: x.count('.'))
-        df['num_hyphens'] = df['url'].apply(lambda x: x.count('-'))
-        df['num_underscores'] = df['url'].apply(lambda x: x.count('_'))
-        df['num_slashes'] = df['url'].apply(lambda x: x.count('/'))
-        df['num_question'] = df['url'].apply(lambda x: x.count('?'))
-        df['num_equal'] = df['url'].apply(lambda x: x.count('='))
-        df['num_at'] = df['url'].apply(lambda x: x.count('@'))
-        df['num_ampersand'] = df['url'].apply(lambda x: x.count('&'))
-        df['num_percent'] = df['url'].apply(lambda x: x.count('%'))
-        print(f"   ✓ Extracted {10} structural features")
-        
-        # ========== STRING ANALYSIS ==========
-        print("[2/8] Analyzing character patterns...")
-        df['url_entropy'] = df['url'].apply(calculate_entropy)
-        df['digit_count'] = df['url'].apply(lambda x: sum(c.isdigit() for c in x))
-        df['digit_ratio'] = df['digit_count'] / df['url_length']
-        df['letter_count'] = df['url'].apply(lambda x: sum(c.isalpha() for c in x))
-        df['letter_ratio'] = df['letter_count'] / df['url_length']
-        df['uppercase_count'] = df['url'].apply(lambda x: sum(c.isupper() for c in x))
-        df['uppercase_ratio'] = df['uppercase_count'] / df['url_length']
-        print(f"   ✓ Extracted 7 character features")
-        
-        # ========== DOMAIN ANALYSIS ==========
-        print("[3/8] Analyzing domains and TLDs...")
-        df['domain'] = df['url'].apply(extract_domain)
-        df['domain_length'] = df['domain'].apply(len)
-        df['subdomain_count'] = df['domain'].apply(lambda x: x.count('.'))
-        
-        # TLD analysis
-        df['tld'] = df['domain'].apply(lambda x: x.split('.')[-1] if '.' in x else '')
-        suspicious_tlds = ['tk', 'ml', 'ga', 'cf', 'gq', 'xyz', 'top', 'work', 'click', 'link', 'pw', 'cc']
-        df['has_suspicious_tld'] = df['tld'].apply(lambda x: int(x in suspicious_tlds))
-        trusted_tlds = ['com', 'org', 'net', 'edu', 'gov', 'mil']
-        df['has_trusted_tld'] = df['tld'].apply(lambda x: int(x in trusted_tlds))
-        print(f"   ✓ Extracted 6 domain features")
-        
-        # ========== PROTOCOL & SECURITY INDICATORS ==========
-        print("[4/8] Checking protocols and patterns...")
-        df['is_https'] = df['url'].apply(lambda x: int(x.startswith('https://')))
-        df['is_http'] = df['url'].apply(lambda x: int(x.startswith('http://')))
-        df['has_ip'] = df['url'].apply(lambda x: int(bool(re.search(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b', x))))
-        df['has_port'] = df['url'].apply(lambda x: int(bool(re.search(r':\d{2,5}', x))))
-        df['url_depth'] = df['url'].apply(lambda x: len([p for p in x.split('/') if p and '://' not in p]))
-        df['has_query_string'] = df['url'].apply(lambda x: int('?' in x))
-        df['query_length'] = df['url'].apply(lambda x: len(x.split('?')[1]) if '?' in x else 0)
-        print(f"   ✓ Extracted 7 protocol features")
-        
-        # ========== SUSPICIOUS PATTERNS ==========
-        print("[5/8] Detecting suspicious patterns...")
-        df['excessive_subdomains'] = df['subdomain_count'].apply(lambda x: int(x > 3))
-        df['has_double_slash'] = df['url'].apply(lambda x: int('//' in x.split('://')[1] if '://' in x else False))
-        df['has_url_shortener'] = df['url'].apply(lambda x: int(any(s in x.lower() for s in ['bit.ly', 'goo.gl', 'tinyurl', 't.co', 'ow.ly'])))
-        df['has_redirect'] = df['url'].apply(lambda x: int(any(r in x.lower() for r in ['redirect', 'url=', 'redir', 'goto'])))
-        print(f"   ✓ Extracted 4 pattern features")
-        
-        # ========== KEYWORD ANALYSIS ==========
-        print("[6/8] Checking for brand impersonation...")
-        suspicious_keywords = ['secure', 'account', 'update', 'login', 'verify', 'confirm', 
-                               'banking', 'signin', 'webscr', 'password', 'suspend']
-        brands = ['paypal', 'microsoft', 'apple', 'google', 'amazon', 'facebook', 'netflix', 'bank']
-        
-        for kw in suspicious_keywords[:5]:  # Limit to top 5 to avoid too many features
-            df[f'has_{kw}'] = df['url'].apply(lambda x: int(kw in x.lower()))
-        
-        for brand in brands[:5]:  # Limit to top 5 brands
-            df[f'has_brand_{brand}'] = df['url'].apply(lambda x: int(brand in x.lower()))
-        
-        df['brand_in_subdomain'] = df['url'].apply(lambda x: int(
-            any(brand in extract_domain(x).split('.')[0].lower() for brand in brands)
-        ))
-        print(f"   ✓ Extracted 11 keyword features")
+        # Static columns are computed separately and joined to df in one step
+        if n_jobs == 1:
+            features = extract_static_features(df['url'])
+        else:
+            features = _extract_static_sharded(df['url'], n_jobs)
+        df = pd.concat([df.drop(columns=list(features.columns), errors='ignore'), features], axis=1)
         
         # ========== NETWORK FEATURES (SLOW BUT ACCURATE) ==========
         if use_network_features:
@@ -254,7 +675,8 @@ def extract_features_comprehensive(df, use_network_features=True, sample_size=No
             
             # Determine which URLs to check
             if sample_size and len(df) > sample_size:
-                check_indices = df.sample(n=sample_size, random_state=42).index
+                # Sample the index alone; same rows as df.sample, without copying every feature column
+                check_indices = df.index.to_series().sample(n=sample_size, random_state=42).index
                 print(f"   Sampling {sample_size:,} URLs for network checks...")
             else:
                 check_indices = df.index
@@ -272,34 +694,56 @@ def extract_features_comprehensive(df, use_network_features=True, sample_size=No
             df['has_login_form'] = 0
             df['page_rank_est'] = 0
             
-            # Check a sample
-            checked = 0
-            for idx in check_indices:
-                if checked % 100 == 0:
-                    print(f"   Checked {checked}/{len(check_indices)} URLs...", end='\r')
-                
-                url = df.at[idx, 'url']
-                
-                # DNS check (fast)
-                has_dns, ip_count = check_dns_record(url)
-                df.at[idx, 'has_dns'] = has_dns
-                df.at[idx, 'dns_ip_count'] = ip_count
-                
-                # SSL check (medium speed)
+            # Probes run once per unique domain, so the time limit applies to domains
+            sample_domains = extract_domains(df.loc[check_indices, 'url'])
+            unique_domains = sample_domains.drop_duplicates()
+            if len(unique_domains) > MAX_NETWORK_CHECKS:
+                print(f"   ⚠ Limiting network checks to {MAX_NETWORK_CHECKS} domains to save time")
+                keep = sample_domains.isin(set(unique_domains.iloc[:MAX_NETWORK_CHECKS])).to_numpy()
+                check_indices = check_indices[keep]
+                sample_domains = sample_domains[keep]
+            
+            urls = df.loc[check_indices, 'url'].tolist()
+            domains = sample_domains.tolist()
+            print(f"   {len(set(domains)):,} unique domains across {len(urls):,} URLs")
+            
+            # Resolve every unique domain in the sample in one batch
+            dns_by_domain = resolve_domains(domains)
+            
+            # WHOIS domain age, one query per unique domain
+            print("   Looking up domain ages (WHOIS)...")
+            age_by_domain = lookup_domain_ages(domains)
+            
+            # Check SSL once per unique HTTPS domain, concurrently
+            https_domains = list(dict.fromkeys(
+                domain for url, domain in zip(urls, domains) if domain and url.startswith('https')))
+            ssl_by_domain = {}
+            show_progress = getattr(sys.stdout, 'isatty', lambda: False)()
+            last_progress = time.time()
+            with ThreadPoolExecutor(max_workers=NETWORK_WORKERS) as executor:
+                for i, (domain, result) in enumerate(zip(https_domains,
+                                                         executor.map(check_ssl_by_domain, https_domains))):
+                    if show_progress and time.time() - last_progress >= PROGRESS_INTERVAL:
+                        last_progress = time.time()
+                        print(f"   Checked {i}/{len(https_domains)} HTTPS domains...", end='\r')
+                    ssl_by_domain[domain] = result
+            
+            # Broadcast per-domain results to every URL, filled by position
+            n = len(urls)
+            age_arr = np.full(n, -1, dtype=np.int32)
+            dns_arr = np.zeros((n, 2), dtype=np.int32)
+            ssl_arr = np.zeros((n, 3), dtype=np.int32)
+            for i, (url, domain) in enumerate(zip(urls, domains)):
+                age_arr[i] = age_by_domain.get(domain, -1)
+                dns_arr[i] = dns_by_domain.get(domain, (0, 0))
                 if url.startswith('https'):
-                    has_ssl, days_valid, is_trusted = check_ssl_certificate(url)
-                    df.at[idx, 'has_ssl'] = has_ssl
-                    df.at[idx, 'ssl_days_valid'] = days_valid
-                    df.at[idx, 'ssl_trusted'] = is_trusted
-                
-                checked += 1
-                
-                # Stop early if taking too long
-                if checked >= min(500, len(check_indices)):
-                    print(f"\n   ⚠ Stopping network checks at {checked} to save time")
-                    break
+                    ssl_arr[i] = ssl_by_domain.get(domain, (0, 0, 0))
+            
+            df.loc[check_indices, 'domain_age_days'] = age_arr
+            df.loc[check_indices, ['has_dns', 'dns_ip_count']] = dns_arr
+            df.loc[check_indices, ['has_ssl', 'ssl_days_valid', 'ssl_trusted']] = ssl_arr
             
-            print(f"\n   ✓ Completed {checked} network security checks")
+            print(f"\n   ✓ Completed network security checks for {n} URLs")
         else:
             print("[7/8] Skipping network checks (fast mode)")
             df['domain_age_days'] = -1
@@ -318,9 +762,6 @@ def extract_features_comprehensive(df, use_network_features=True, sample_size=No
         # ========== FINALIZE ==========
         print("[8/8] Finalizing features...")
         
-        # Drop temporary columns
-        df = df.drop(columns=['domain', 'tld'], errors='ignore')
-        
         # Get feature columns
         feature_cols = [col for col in df.columns if col not in ['url', 'label']]
         
@@ -328,6 +769,16 @@ def extract_features_comprehensive(df, use_network_features=True, sample_size=No
         for col in feature_cols:
             df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
         
+        # Downcast to the smallest dtype that holds each feature
+        binary_cols = [col for col in feature_cols
+                       if col.startswith(BINARY_FEATURE_PREFIXES) or col in BINARY_FEATURES]
+        float_cols = [col for col in feature_cols if col.endswith(FLOAT_FEATURE_SUFFIXES)]
+        count_cols = [col for col in feature_cols
+                      if col not in binary_cols and col not in float_cols]
+        df[binary_cols] = df[binary_cols].astype(np.int8)
+        df[float_cols] = df[float_cols].astype(np.float32)
+        df[count_cols] = df[count_cols].astype(np.int32)
+        
         print(f"\n{'='*70}")
         print(f"  ✅ FEATURE EXTRACTION COMPLETE")
         print(f"{'='*70}")
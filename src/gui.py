@@ -1,9 +1,42 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-import pandas as pd
+from tkinter import ttk, messagebox
 import os
+import threading
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from .ensemble_predictor import get_ensemble_prediction, get_predictor
+from .feature_extraction import extract_features_one
 
+# How often the Tk loop checks whether a background analysis has finished
+POLL_INTERVAL_MS = 100
+
+# Trained model files, and how often to look for them again while they're missing
+MODEL_FILES = ('models/dt_model.pkl', 'models/xgb_model.pkl')
+MODEL_RECHECK_MS = 5000
+
+# Enter presses this soon after a submit are ignored (key repeat, double taps)
+DEBOUNCE_MS = 300
+
+# Features listed under "Structural" in the Features tab ('has_*' keys are
+# shown as keyword checks, so 'has_ip' never lands here)
+_STRUCTURAL = frozenset({'url_length', 'num_dots', 'num_hyphens', 'num_underscores',
+                         'num_slashes', 'url_depth', 'has_ip', 'is_https'})
+
+@lru_cache(maxsize=None)
+def _feature_label(key):
+    """Display label for a feature name (the schema is fixed, so cache it)"""
+    return key.replace('_', ' ').title()
+
+@lru_cache(maxsize=None)
+def _keyword_name(key):
+    """Display name for a 'has_*' keyword feature"""
+    return key.replace('has_', '').title()
 class UrlCheckerApp:
+    # Report separators, built once rather than on every analysis
+    _HR_HEAVY = "━" * 70
+    _BOX_BOTTOM = "└" + "─" * 48
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Phishing URL Detector - ML Powered")
@@ -84,6 +117,18 @@ class UrlCheckerApp:
                                      relief=tk.RAISED, bd=2,
                                      command=self.clear_results)
         self.clear_button.grid(row=0, column=1, padx=5)
+        
+        # Shown only while an analysis is running
+        self.progress = ttk.Progressbar(button_frame, mode='indeterminate', length=250)
+        self.progress.grid(row=1, column=0, columnspan=2, pady=(8, 0))
+        self.progress.grid_remove()
+        
+        # Analyses run here so the Tk event loop never blocks on network/model work
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self._in_flight = False
+        self._last_submit = 0.0
+        self.url_entry.bind('<Return>', self._on_enter)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         
         # Results Section with Notebook (Tabs)
@@ -100,31 +145,34 @@ class UrlCheckerApp:
         prediction_tab = tk.Frame(self.notebook, bg="white")
         self.notebook.add(prediction_tab, text="  Prediction  ")
         
-        self.prediction_text = scrolledtext.ScrolledText(prediction_tab, 
-                                                        font=("Consolas", 10),
-                                                        bg="white", relief=tk.FLAT,
-                                                        wrap=tk.WORD)
-        self.prediction_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.prediction_text = self._make_text_pane(prediction_tab, font=("Consolas", 10))
         
         # Tab 2: Feature Details
         features_tab = tk.Frame(self.notebook, bg="white")
         self.notebook.add(features_tab, text="  Features  ")
         
-        self.features_text = scrolledtext.ScrolledText(features_tab, 
-                                                      font=("Consolas", 9),
-                                                      bg="white", relief=tk.FLAT,
-                                                      wrap=tk.WORD)
-        self.features_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # A Treeview only draws the rows on screen, so it stays cheap as the schema grows
+        features_note = tk.Label(features_tab,
+                                 text="NOTE: These features are analyzed by ML models to detect phishing patterns.",
+                                 font=("Segoe UI", 9, "italic"), bg="white", fg="gray")
+        features_note.pack(side=tk.BOTTOM, anchor="w", padx=5, pady=(0, 5))
+        
+        self.features_tree = ttk.Treeview(features_tab, columns=('value',), show='tree headings')
+        self.features_tree.heading('#0', text="Feature", anchor="w")
+        self.features_tree.heading('value', text="Value", anchor="w")
+        self.features_tree.column('#0', width=380)
+        self.features_tree.column('value', width=300)
+        features_scroll = ttk.Scrollbar(features_tab, orient=tk.VERTICAL,
+                                        command=self.features_tree.yview)
+        self.features_tree.configure(yscrollcommand=features_scroll.set)
+        features_scroll.pack(side=tk.RIGHT, fill=tk.Y, pady=5)
+        self.features_tree.pack(fill=tk.BOTH, expand=True, padx=(5, 0), pady=5)
         
         # Tab 3: About
         about_tab = tk.Frame(self.notebook, bg="white")
         self.notebook.add(about_tab, text="  About  ")
         
-        about_text = scrolledtext.ScrolledText(about_tab, 
-                                              font=("Segoe UI", 10),
-                                              bg="white", relief=tk.FLAT,
-                                              wrap=tk.WORD)
-        about_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        about_text = self._make_text_pane(about_tab, font=("Segoe UI", 10))
         
         about_content = """
 Phishing URL Detector
@@ -174,25 +222,17 @@ DISCLAIMER:
 This tool provides analysis based on ML models. Always verify
 suspicious URLs through official channels and use antivirus software.
 """
-        about_text.insert(1.0, about_content)
-        about_text.config(state=tk.DISABLED)
+        self._set_text(about_text, about_content)
 
         
         # Status Bar
         status_container = tk.Frame(root, bg="white", relief=tk.SUNKEN, bd=1)
         status_container.pack(side=tk.BOTTOM, fill=tk.X)
         
-        if os.path.exists('models/dt_model.pkl') and os.path.exists('models/xgb_model.pkl'):
-            self.models_available = True
-            status_text = "Models Loaded | Decision Tree + XGBoost Ready"
-            status_color = self.colors['success']
-        else:
-            self.models_available = False
-            status_text = "Models Not Found | Please run: python -m src.main"
-            status_color = self.colors['danger']
-            
-        self.status_label = tk.Label(status_container, text=status_text, 
-                                    font=("Segoe UI", 9), fg=status_color, 
+        # Model files are looked up off the Tk thread (they may live on a slow share)
+        self.models_available = None
+        self.status_label = tk.Label(status_container, text="Checking models...", 
+                                    font=("Segoe UI", 9), fg="gray", 
                                     bg="white", anchor="w")
         self.status_label.pack(side=tk.LEFT, padx=10, pady=3)
         
@@ -201,18 +241,82 @@ suspicious URLs through official channels and use antivirus software.
                                font=("Segoe UI", 9), fg="gray", 
                                bg="white", anchor="e")
         version_label.pack(side=tk.RIGHT, padx=10, pady=3)
+        
+        self._check_models()
 
+    def _check_models(self):
+        """Look for the trained model files in the background"""
+        future = self.executor.submit(lambda: all(os.path.exists(path) for path in MODEL_FILES))
+        self.root.after(POLL_INTERVAL_MS, self._poll_models, future)
+    
+    def _poll_models(self, future):
+        """Update the status bar once the model lookup finishes"""
+        if not future.done():
+            self.root.after(POLL_INTERVAL_MS, self._poll_models, future)
+            return
+        
+        try:
+            present = future.result()
+        except Exception:
+            present = False
+        
+        if present:
+            self.models_available = True
+            self.status_label.config(text="Models Loaded | Decision Tree + XGBoost Ready",
+                                     fg=self.colors['success'])
+            
+            # Load the model pickles in the background so the first check doesn't pay for it
+            threading.Thread(target=get_predictor, daemon=True).start()
+        else:
+            # Keep looking, so models trained from another shell are picked up without a restart
+            self.models_available = False
+            self.status_label.config(text="Models Not Found | Please run: python -m src.main",
+                                     fg=self.colors['danger'])
+            self.root.after(MODEL_RECHECK_MS, self._check_models)
+    
+    def _make_text_pane(self, parent, font):
+        """Create a read-only, undo-free Text widget with a vertical scrollbar in parent"""
+        frame = tk.Frame(parent, bg="white")
+        frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        text = tk.Text(frame, font=font, bg="white", relief=tk.FLAT, wrap=tk.WORD,
+                       undo=False, autoseparators=False, maxundo=0, state=tk.DISABLED)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=text.yview)
+        text.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        return text
+    
+    def on_close(self):
+        """Stop background work and close the window"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+    
     def clear_results(self):
         """Clear all input and results"""
-        self.prediction_text.delete(1.0, tk.END)
-        self.features_text.delete(1.0, tk.END)
+        self._set_text(self.prediction_text, "")
+        self._clear_features()
         self.url_entry.delete(0, tk.END)
         self.url_entry.insert(0, "https://")
         self.notebook.select(0)  # Switch back to prediction tab
 
 
+    def _on_enter(self, event):
+        """Submit on Enter, ignoring presses that arrive within DEBOUNCE_MS of the last submit"""
+        if not self._in_flight and (time.monotonic() - self._last_submit) * 1000 >= DEBOUNCE_MS:
+            self.check_url()
+        return "break"
+    
     def check_url(self):
         """Analyze the entered URL and display results"""
+        # Only one analysis at a time; repeated clicks/Enter presses are dropped
+        if self._in_flight:
+            return
+        
+        if self.models_available is None:
+            messagebox.showinfo("Please Wait", "Still checking for trained models...")
+            return
+        
         if not self.models_available:
             messagebox.showerror(
                 "Models Not Available", 
@@ -239,216 +343,252 @@ suspicious URLs through official channels and use antivirus software.
             self.url_entry.delete(0, tk.END)
             self.url_entry.insert(0, url)
 
+        # Replace previous results with an analyzing message
+        self._clear_features()
+        self._set_text(self.prediction_text,
+                       "Analyzing URL...\n"
+                       f"URL: {url}\n"
+                       + self._HR_HEAVY + "\n\n"
+                       "Please wait...\n")
+        
+        # Run the analysis off the Tk thread so the window stays responsive
+        self._set_busy(True)
+        future = self.executor.submit(self._run_analysis, url)
+        self.root.after(POLL_INTERVAL_MS, self._poll_analysis, url, future)
+    
+    def _run_analysis(self, url):
+        """Run the ensemble prediction and feature extraction (worker thread)"""
+        result = get_ensemble_prediction(url)
+        if 'error' in result:
+            return result, None
+        
+        # A feature extraction failure only affects the Features tab
         try:
-            # Clear previous results
-            self.prediction_text.delete(1.0, tk.END)
-            self.features_text.delete(1.0, tk.END)
-            
-            # Show analyzing message
-            self.prediction_text.insert(tk.END, "Analyzing URL...\n")
-            self.prediction_text.insert(tk.END, f"URL: {url}\n")
-            self.prediction_text.insert(tk.END, "━" * 70 + "\n\n")
-            self.prediction_text.insert(tk.END, "Please wait...\n")
-            self.root.update()
-            
-            # Import and run ensemble analysis
-            from .ensemble_predictor import get_ensemble_prediction
-            from .feature_extraction import extract_features
-            
-            result = get_ensemble_prediction(url)
-            
-            # Check for errors in result
-            if 'error' in result:
-                error_type = result.get('error_type', 'Unknown')
-                error_msg = result['error']
-                
-                self.prediction_text.delete(1.0, tk.END)
-                self.prediction_text.insert(tk.END, "ERROR DURING ANALYSIS\n")
-                self.prediction_text.insert(tk.END, "━" * 70 + "\n\n")
-                self.prediction_text.insert(tk.END, f"Error Type: {error_type}\n")
-                self.prediction_text.insert(tk.END, f"Details: {error_msg}\n\n")
-                
-                if error_type == 'ModelNotFound':
-                    self.prediction_text.insert(tk.END, "Solution:\n")
-                    self.prediction_text.insert(tk.END, "• Run: python -m src.main\n")
-                    self.prediction_text.insert(tk.END, "• Or double-click: TRAIN_AT_HOME.bat\n")
-                elif error_type == 'InvalidInput':
-                    self.prediction_text.insert(tk.END, "Solution:\n")
-                    self.prediction_text.insert(tk.END, "• Check URL format\n")
-                    self.prediction_text.insert(tk.END, "• Example: https://www.example.com\n")
-                else:
-                    self.prediction_text.insert(tk.END, "Possible causes:\n")
-                    self.prediction_text.insert(tk.END, "• Invalid URL format\n")
-                    self.prediction_text.insert(tk.END, "• Missing dependencies\n")
-                    self.prediction_text.insert(tk.END, "• Models corrupted\n")
-                
-                messagebox.showerror("Analysis Error", error_msg)
-                return
-            
-            # Clear and display formatted results
-            self.prediction_text.delete(1.0, tk.END)
-            
-            # Header
-            self.prediction_text.insert(tk.END, "PHISHING URL DETECTION RESULTS\n")
-            self.prediction_text.insert(tk.END, "━" * 70 + "\n\n")
-            self.prediction_text.insert(tk.END, f"URL: {url}\n")
-            self.prediction_text.insert(tk.END, "━" * 70 + "\n\n")
-            
-            # Model Predictions
-            self.prediction_text.insert(tk.END, "MACHINE LEARNING PREDICTIONS:\n\n")
-            
-            # Decision Tree
-            dt_info = result.get('methods', {}).get('decision_tree', {})
-            dt_prediction = dt_info.get('prediction', 'unknown')
-            dt_probability = dt_info.get('probability', 0) * 100
-            dt_label = "[PHISHING DETECTED]" if dt_prediction == 'phishing' else "[APPEARS SAFE]"
-            dt_color = self.colors['phishing'] if dt_prediction == 'phishing' else self.colors['safe']
-            
-            self.prediction_text.insert(tk.END, "┌─ Decision Tree Classifier ─────────────────────\n")
-            self.prediction_text.insert(tk.END, f"│ Prediction: {dt_label}\n")
-            self.prediction_text.insert(tk.END, f"│ Confidence: {dt_probability:.1f}%\n")
-            self.prediction_text.insert(tk.END, f"│ Accuracy: ~85%\n")
-            self.prediction_text.insert(tk.END, "└" + "─" * 48 + "\n\n")
-            
-            # XGBoost
-            xgb_info = result.get('methods', {}).get('xgboost', {})
-            xgb_prediction = xgb_info.get('prediction', 'unknown')
-            xgb_probability = xgb_info.get('probability', 0) * 100
-            xgb_label = "[PHISHING DETECTED]" if xgb_prediction == 'phishing' else "[APPEARS SAFE]"
-            xgb_color = self.colors['phishing'] if xgb_prediction == 'phishing' else self.colors['safe']
-            
-            self.prediction_text.insert(tk.END, "┌─ XGBoost Classifier ───────────────────────────\n")
-            self.prediction_text.insert(tk.END, f"│ Prediction: {xgb_label}\n")
-            self.prediction_text.insert(tk.END, f"│ Confidence: {xgb_probability:.1f}%\n")
-            self.prediction_text.insert(tk.END, f"│ Accuracy: ~92%\n")
-            self.prediction_text.insert(tk.END, "└" + "─" * 48 + "\n\n")
-            
-            # NOTE: Security Scanner (3rd method) runs silently in background
-            # It contributes to the final verdict via majority voting, but is not displayed
-            
-            # Overall Assessment (uses all 3 methods in backend)
-            self.prediction_text.insert(tk.END, "━" * 70 + "\n")
-            self.prediction_text.insert(tk.END, "FINAL ASSESSMENT:\n\n")
-            
-            final_prediction = result.get('ensemble', {}).get('prediction', 'unknown')
-            final_probability = result.get('ensemble', {}).get('probability', 0) * 100
-            
-            if final_prediction == 'legitimate':
-                self.prediction_text.insert(tk.END, "✓ VERDICT: URL APPEARS SAFE\n\n")
-                self.prediction_text.insert(tk.END, f"Confidence: {final_probability:.1f}%\n\n")
-                self.prediction_text.insert(tk.END, "Both models agree that this URL looks legitimate.\n")
-                self.prediction_text.insert(tk.END, "However, always verify important links independently.\n")
-            elif final_prediction == 'phishing':
-                self.prediction_text.insert(tk.END, "⚠ VERDICT: LIKELY PHISHING WEBSITE\n\n")
-                self.prediction_text.insert(tk.END, f"Confidence: {final_probability:.1f}%\n\n")
-                self.prediction_text.insert(tk.END, "WARNING: Models detected suspicious patterns!\n")
-                self.prediction_text.insert(tk.END, "• Do NOT enter personal information\n")
-                self.prediction_text.insert(tk.END, "• Do NOT download files\n")
-                self.prediction_text.insert(tk.END, "• Verify the website through official channels\n")
-            else:
-                self.prediction_text.insert(tk.END, "? VERDICT: EXERCISE CAUTION\n\n")
-                self.prediction_text.insert(tk.END, "Models show mixed results.\n")
-                self.prediction_text.insert(tk.END, "• Be cautious when interacting with this URL\n")
-                self.prediction_text.insert(tk.END, "• Verify authenticity before proceeding\n")
-            
-            self.prediction_text.insert(tk.END, "\n" + "━" * 70 + "\n")
-            
-            # Recommendation
-            avg_confidence = (dt_probability + xgb_probability) / 2
-            self.prediction_text.insert(tk.END, f"\nAverage Confidence: {avg_confidence:.1f}%\n")
-            
-            if avg_confidence > 80:
-                self.prediction_text.insert(tk.END, "   Models are highly confident in this prediction.\n")
-            elif avg_confidence > 60:
-                self.prediction_text.insert(tk.END, "   Models show moderate confidence.\n")
-            else:
-                self.prediction_text.insert(tk.END, "   Models show lower confidence - verify manually.\n")
-            
-            # Extract and display features
-            self.show_features(url)
-            
-            # Switch to prediction tab
-            self.notebook.select(0)
+            features = self._extract_feature_values(url)
+        except Exception as e:
+            features = e
+        return result, features
+    
+    def _poll_analysis(self, url, future):
+        """Wait (without blocking the event loop) for the analysis, then show it"""
+        if not future.done():
+            self.root.after(POLL_INTERVAL_MS, self._poll_analysis, url, future)
+            return
+        
+        self._set_busy(False)
+        try:
+            result, features = future.result()
+            self._render_result(url, result, features)
             
         except Exception as e:
-            self.prediction_text.delete(1.0, tk.END)
-            self.prediction_text.insert(tk.END, "ERROR DURING ANALYSIS\n")
-            self.prediction_text.insert(tk.END, "━" * 70 + "\n\n")
-            self.prediction_text.insert(tk.END, f"An error occurred: {str(e)}\n\n")
-            self.prediction_text.insert(tk.END, "Possible causes:\n")
-            self.prediction_text.insert(tk.END, "• Models not trained properly\n")
-            self.prediction_text.insert(tk.END, "• Invalid URL format\n")
-            self.prediction_text.insert(tk.END, "• Missing dependencies\n\n")
-            self.prediction_text.insert(tk.END, "Try running: python -m src.main\n")
+            parts = []
+            parts.append("ERROR DURING ANALYSIS\n")
+            parts.append(self._HR_HEAVY + "\n\n")
+            parts.append(f"An error occurred: {str(e)}\n\n")
+            parts.append("Possible causes:\n")
+            parts.append("• Models not trained properly\n")
+            parts.append("• Invalid URL format\n")
+            parts.append("• Missing dependencies\n\n")
+            parts.append("Try running: python -m src.main\n")
+            self._set_text(self.prediction_text, "".join(parts))
             messagebox.showerror("Analysis Error", f"Error: {str(e)}")
     
-    def show_features(self, url):
-        """Display extracted features in features tab"""
-        try:
-            from .feature_extraction import extract_features
+    def _set_busy(self, busy):
+        """Disable the Analyze button and show the progress bar while a check runs"""
+        self._in_flight = busy
+        if busy:
+            self._last_submit = time.monotonic()
+            self.check_button.config(state=tk.DISABLED)
+            self.progress.grid()
+            self.progress.start(10)
+        else:
+            self.progress.stop()
+            self.progress.grid_remove()
+            self.check_button.config(state=tk.NORMAL)
+    
+    def _render_result(self, url, result, features):
+        """Display the prediction result (and features) for url"""
+        # Check for errors in result
+        if 'error' in result:
+            error_type = result.get('error_type', 'Unknown')
+            error_msg = result['error']
+            
+            parts = []
+            parts.append("ERROR DURING ANALYSIS\n")
+            parts.append(self._HR_HEAVY + "\n\n")
+            parts.append(f"Error Type: {error_type}\n")
+            parts.append(f"Details: {error_msg}\n\n")
+            
+            if error_type == 'ModelNotFound':
+                parts.append("Solution:\n")
+                parts.append("• Run: python -m src.main\n")
+                parts.append("• Or double-click: TRAIN_AT_HOME.bat\n")
+            elif error_type == 'InvalidInput':
+                parts.append("Solution:\n")
+                parts.append("• Check URL format\n")
+                parts.append("• Example: https://www.example.com\n")
+            else:
+                parts.append("Possible causes:\n")
+                parts.append("• Invalid URL format\n")
+                parts.append("• Missing dependencies\n")
+                parts.append("• Models corrupted\n")
             
-            df = pd.DataFrame([{'url': url, 'label': 0}])
-            features_df = extract_features(df)
-            feature_cols = [col for col in features_df.columns if col not in ['url', 'label']]
-            features = features_df[feature_cols].iloc[0].to_dict()
+            self._set_text(self.prediction_text, "".join(parts))
+            messagebox.showerror("Analysis Error", error_msg)
+            return
+        
+        # Build the whole report, then write it to the widget in one go
+        parts = []
+        
+        # Header
+        parts.append("PHISHING URL DETECTION RESULTS\n")
+        parts.append(self._HR_HEAVY + "\n\n")
+        parts.append(f"URL: {url}\n")
+        parts.append(self._HR_HEAVY + "\n\n")
+        
+        # Model Predictions
+        parts.append("MACHINE LEARNING PREDICTIONS:\n\n")
+        
+        # Decision Tree
+        dt_info = result.get('methods', {}).get('decision_tree', {})
+        dt_prediction = dt_info.get('prediction', 'unknown')
+        dt_probability = dt_info.get('probability', 0) * 100
+        dt_label = "[PHISHING DETECTED]" if dt_prediction == 'phishing' else "[APPEARS SAFE]"
+        dt_color = self.colors['phishing'] if dt_prediction == 'phishing' else self.colors['safe']
+        
+        parts.append("┌─ Decision Tree Classifier ─────────────────────\n")
+        parts.append(f"│ Prediction: {dt_label}\n")
+        parts.append(f"│ Confidence: {dt_probability:.1f}%\n")
+        parts.append(f"│ Accuracy: ~85%\n")
+        parts.append(self._BOX_BOTTOM + "\n\n")
+        
+        # XGBoost
+        xgb_info = result.get('methods', {}).get('xgboost', {})
+        xgb_prediction = xgb_info.get('prediction', 'unknown')
+        xgb_probability = xgb_info.get('probability', 0) * 100
+        xgb_label = "[PHISHING DETECTED]" if xgb_prediction == 'phishing' else "[APPEARS SAFE]"
+        xgb_color = self.colors['phishing'] if xgb_prediction == 'phishing' else self.colors['safe']
+        
+        parts.append("┌─ XGBoost Classifier ───────────────────────────\n")
+        parts.append(f"│ Prediction: {xgb_label}\n")
+        parts.append(f"│ Confidence: {xgb_probability:.1f}%\n")
+        parts.append(f"│ Accuracy: ~92%\n")
+        parts.append(self._BOX_BOTTOM + "\n\n")
+        
+        # NOTE: Security Scanner (3rd method) runs silently in background
+        # It contributes to the final verdict via majority voting, but is not displayed
+        
+        # Overall Assessment (uses all 3 methods in backend)
+        parts.append(self._HR_HEAVY + "\n")
+        parts.append("FINAL ASSESSMENT:\n\n")
+        
+        final_prediction = result.get('ensemble', {}).get('prediction', 'unknown')
+        final_probability = result.get('ensemble', {}).get('probability', 0) * 100
+        
+        if final_prediction == 'legitimate':
+            parts.append("✓ VERDICT: URL APPEARS SAFE\n\n")
+            parts.append(f"Confidence: {final_probability:.1f}%\n\n")
+            parts.append("Both models agree that this URL looks legitimate.\n")
+            parts.append("However, always verify important links independently.\n")
+        elif final_prediction == 'phishing':
+            parts.append("⚠ VERDICT: LIKELY PHISHING WEBSITE\n\n")
+            parts.append(f"Confidence: {final_probability:.1f}%\n\n")
+            parts.append("WARNING: Models detected suspicious patterns!\n")
+            parts.append("• Do NOT enter personal information\n")
+            parts.append("• Do NOT download files\n")
+            parts.append("• Verify the website through official channels\n")
+        else:
+            parts.append("? VERDICT: EXERCISE CAUTION\n\n")
+            parts.append("Models show mixed results.\n")
+            parts.append("• Be cautious when interacting with this URL\n")
+            parts.append("• Verify authenticity before proceeding\n")
+        
+        parts.append("\n" + self._HR_HEAVY + "\n")
+        
+        # Recommendation
+        avg_confidence = (dt_probability + xgb_probability) / 2
+        parts.append(f"\nAverage Confidence: {avg_confidence:.1f}%\n")
+        
+        if avg_confidence > 80:
+            parts.append("   Models are highly confident in this prediction.\n")
+        elif avg_confidence > 60:
+            parts.append("   Models show moderate confidence.\n")
+        else:
+            parts.append("   Models show lower confidence - verify manually.\n")
+        
+        self._set_text(self.prediction_text, "".join(parts))
+        
+        # Display extracted features
+        self.show_features(url, features)
+        
+        # Switch to prediction tab
+        self.notebook.select(0)
+    
+    def _extract_feature_values(self, url):
+        """Extract the model features for a single URL as a dict"""
+        return extract_features_one(url)
+    
+    def show_features(self, url, features):
+        """Display extracted features (or the extraction error) in features tab"""
+        tree = self.features_tree
+        self._clear_features()
+        try:
+            if isinstance(features, Exception):
+                raise features
             
-            self.features_text.insert(tk.END, "EXTRACTED FEATURES ANALYSIS\n")
-            self.features_text.insert(tk.END, "━" * 70 + "\n\n")
-            self.features_text.insert(tk.END, f"URL: {url}\n")
-            self.features_text.insert(tk.END, f"Total Features Extracted: {len(features)}\n")
-            self.features_text.insert(tk.END, "━" * 70 + "\n\n")
+            tree.insert('', 'end', text="URL", values=(url,))
+            tree.insert('', 'end', text="Total Features Extracted", values=(len(features),))
             
             # Categorize features
-            structural_features = {}
-            keyword_features = {}
-            other_features = {}
-            
-            for key, value in features.items():
-                if key.startswith('has_'):
-                    keyword_features[key] = value
-                elif key in ['url_length', 'num_dots', 'num_hyphens', 'num_underscores', 
-                           'num_slashes', 'url_depth', 'has_ip', 'is_https']:
-                    structural_features[key] = value
+            structural_features = []
+            keyword_features = []
+            other_features = []
+            
+            for item in features.items():
+                key = item[0]
+                if key[:4] == 'has_':
+                    keyword_features.append(item)
+                elif key in _STRUCTURAL:
+                    structural_features.append(item)
                 else:
-                    other_features[key] = value
-            
-            # Display Structural Features
-            self.features_text.insert(tk.END, "STRUCTURAL FEATURES:\n")
-            self.features_text.insert(tk.END, "─" * 70 + "\n")
-            for key, value in structural_features.items():
-                formatted_key = key.replace('_', ' ').title()
-                self.features_text.insert(tk.END, f"  • {formatted_key:.<35} {value}\n")
-            
-            # Display Keyword Features
-            self.features_text.insert(tk.END, "\nSUSPICIOUS KEYWORD DETECTION:\n")
-            self.features_text.insert(tk.END, "─" * 70 + "\n")
-            keywords_found = [k.replace('has_', '').title() for k, v in keyword_features.items() if v == 1]
-            if keywords_found:
-                self.features_text.insert(tk.END, f"  [!] Found: {', '.join(keywords_found)}\n")
-            else:
-                self.features_text.insert(tk.END, "  [OK] No suspicious keywords detected\n")
-            
-            # Display all keyword checks
-            self.features_text.insert(tk.END, "\n  Keyword Checks:\n")
-            for key, value in keyword_features.items():
-                keyword = key.replace('has_', '').title()
+                    other_features.append(item)
+            
+            # Structural Features
+            node = tree.insert('', 'end', text="Structural Features", open=True)
+            for key, value in structural_features:
+                tree.insert(node, 'end', text=_feature_label(key), values=(value,))
+            
+            # Keyword Features, summarised on the parent row
+            keywords_found = [_keyword_name(k) for k, v in keyword_features if v == 1]
+            summary = f"[!] Found: {', '.join(keywords_found)}" if keywords_found else "[OK] None detected"
+            node = tree.insert('', 'end', text="Suspicious Keyword Detection",
+                               values=(summary,), open=True)
+            for key, value in keyword_features:
                 status = "[+] Found" if value == 1 else "[-] Not Found"
-                self.features_text.insert(tk.END, f"    {keyword:.<30} {status}\n")
+                tree.insert(node, 'end', text=_keyword_name(key), values=(status,))
             
-            # Display Other Features
+            # Other Features
             if other_features:
-                self.features_text.insert(tk.END, "\nADVANCED FEATURES:\n")
-                self.features_text.insert(tk.END, "─" * 70 + "\n")
-                for key, value in other_features.items():
-                    formatted_key = key.replace('_', ' ').title()
+                node = tree.insert('', 'end', text="Advanced Features", open=True)
+                for key, value in other_features:
                     display_value = value if value not in [-1, None] else "Not Available"
-                    self.features_text.insert(tk.END, f"  • {formatted_key:.<35} {display_value}\n")
-            
-            self.features_text.insert(tk.END, "\n" + "━" * 70 + "\n")
-            self.features_text.insert(tk.END, "\nNOTE: These features are analyzed by ML models to detect phishing patterns.\n")
+                    tree.insert(node, 'end', text=_feature_label(key), values=(display_value,))
             
         except Exception as e:
-            self.features_text.insert(tk.END, f"Error extracting features: {str(e)}\n")
+            self._clear_features()
+            tree.insert('', 'end', text="Error extracting features", values=(str(e),))
+    
+    def _clear_features(self):
+        """Remove every row from the features tree"""
+        self.features_tree.delete(*self.features_tree.get_children())
+    
+    def _set_text(self, widget, text):
+        """Replace the contents of a read-only text widget with a single insert"""
+        widget.config(state=tk.NORMAL)
+        widget.delete(1.0, tk.END)
+        if text:
+            widget.insert(tk.END, text)
+        widget.config(state=tk.DISABLED)
 
 def run_gui():
     root = tk.Tk()
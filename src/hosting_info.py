@@ -1,4 +1,7 @@
+import asyncio
 import socket
+from concurrent.futures import ThreadPoolExecutor
+from .ttl_cache import TTLCache
 
 try:
     from ipwhois import IPWhois
@@ -6,21 +9,77 @@ try:
 except ImportError:
     IPWHOIS_AVAILABLE = False
 
-def get_hosting_info(url):
-    if not IPWHOIS_AVAILABLE:
-        return None, None, None
-        
+# Lookups are cached per domain; failures expire sooner so a transient DNS
+# or RDAP error is retried, but doesn't stall every repeated check
+CACHE_MAX_ENTRIES = 1024
+CACHE_TTL = 3600
+NEGATIVE_CACHE_TTL = 60
+
+# Seconds allowed for each of the DNS and RDAP lookups
+LOOKUP_TIMEOUT = 3.0
+
+# Blocking lookups run here rather than in the loop's default executor, which
+# asyncio.run() would wait on at exit even after a lookup has timed out
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='hosting-info')
+
+_cache = TTLCache(CACHE_MAX_ENTRIES, CACHE_TTL, NEGATIVE_CACHE_TTL)  # domain -> (ip, asn, asn_org)
+
+def _domain_of(url):
     try:
         from urllib.parse import urlparse
-        domain = urlparse(url).netloc
-        if not domain:
-            return None, None, None
-            
-        ip = socket.gethostbyname(domain)
-        obj = IPWhois(ip)
-        res = obj.lookup_rdap(depth=1)
-        asn = res.get('asn', None)
-        asn_org = res.get('asn_description', None)
+        return urlparse(url).netloc
+    except Exception:
+        return ''
+
+def _rdap_lookup(ip):
+    res = IPWhois(ip).lookup_rdap(depth=1)
+    return res.get('asn', None), res.get('asn_description', None)
+
+async def _lookup_hosting_info(domain):
+    """Resolve domain and query RDAP, each bounded by LOOKUP_TIMEOUT"""
+    loop = asyncio.get_running_loop()
+    try:
+        ip = await asyncio.wait_for(
+            loop.run_in_executor(_executor, socket.gethostbyname, domain), LOOKUP_TIMEOUT)
+        asn, asn_org = await asyncio.wait_for(
+            loop.run_in_executor(_executor, _rdap_lookup, ip), LOOKUP_TIMEOUT)
         return ip, asn, asn_org
     except Exception:
         return None, None, None
+
+async def get_hosting_info_async(url):
+    """Return (ip, asn, asn_org) for url's host without blocking the event loop"""
+    if not IPWHOIS_AVAILABLE:
+        return None, None, None
+
+    domain = _domain_of(url)
+    if not domain:
+        return None, None, None
+
+    info = _cache.get(domain)
+    if info is None:
+        info = await _lookup_hosting_info(domain)
+        _cache.put(domain, info, ok=info[0] is not None)
+    return info
+
+async def _gather_hosting_info(urls):
+    # Look up each distinct host once, then map the results back to the URLs
+    domains = list(dict.fromkeys(_domain_of(url) for url in urls))
+    results = await asyncio.gather(*[get_hosting_info_async('//' + domain) for domain in domains])
+    by_domain = dict(zip(domains, results))
+    return [by_domain[_domain_of(url)] for url in urls]
+
+def get_hosting_info_batch(urls):
+    """
+    Look up hosting info for many URLs concurrently
+    
+    Args:
+        urls: List of URL strings
+    
+    Returns:
+        List of (ip, asn, asn_org) tuples, one per URL
+    """
+    return asyncio.run(_gather_hosting_info(list(urls)))
+
+def get_hosting_info(url):
+    return asyncio.run(get_hosting_info_async(url))
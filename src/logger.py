@@ -3,12 +3,43 @@ Centralized logging configuration for the phishing detection system
 Provides rotating file handlers and console output with proper formatting
 """
 
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import sys
+import threading
+import time
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
 
-class ColoredFormatter(logging.Formatter):
+# None of the formats use process/thread fields, so don't collect them per record
+logging.logProcesses = False
+logging.logThreads = False
+logging.logMultiprocessing = False
+
+# Log files are written through a 64 KiB buffer and flushed at most once per
+# FLUSH_INTERVAL seconds while records keep arriving, and as soon as the queue
+# goes idle (errors, rollover and shutdown flush immediately)
+LOG_BUFFER_SIZE = 64 * 1024
+FLUSH_INTERVAL = 1.0
+
+class _CachedFormatter(logging.Formatter):
+    """Formatter that reuses the formatted timestamp for records in the same second"""
+    
+    _cached_time = (None, '')
+    
+    def formatTime(self, record, datefmt=None):
+        if not datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, text = self._cached_time
+        if second != cached_second:
+            text = time.strftime(datefmt, self.converter(second))
+            self._cached_time = (second, text)
+        return text
+
+class ColoredFormatter(_CachedFormatter):
     """Custom formatter with colors for console output"""
     
     COLORS = {
@@ -20,62 +51,125 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'        # Reset
     }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Escape codes are only useful on an interactive terminal
+        self._use_color = sys.stderr.isatty() and os.environ.get('NO_COLOR') is None
+    
     def format(self, record):
-        if hasattr(logging, 'StreamHandler'):
-            log_color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
-            record.levelname = f"{log_color}{record.levelname}{self.COLORS['RESET']}"
-        return super().format(record)
+        if not self._use_color:
+            return super().format(record)
+        
+        # Color only this handler's output; the record is shared with the other handlers
+        levelname = record.levelname
+        log_color = self.COLORS.get(levelname, self.COLORS['RESET'])
+        record.levelname = f"{log_color}{levelname}{self.COLORS['RESET']}"
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
 
-def setup_logger(name='phishing_detector', log_dir='logs', level=logging.INFO):
-    """
-    Setup logger with file and console handlers
+# Formatters shared by every logger's handlers
+_FILE_FMT = _CachedFormatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+_CONSOLE_FMT = ColoredFormatter(
+    '%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%H:%M:%S'
+)
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that buffers writes instead of flushing every record"""
     
-    Args:
-        name: Logger name
-        log_dir: Directory for log files
-        level: Logging level (default: INFO)
+    def __init__(self, *args, **kwargs):
+        self._last_flush = time.monotonic()
+        self._bytes_written = 0
+        super().__init__(*args, **kwargs)
     
-    Returns:
-        logging.Logger: Configured logger instance
-    """
-    # Create logger
-    logger = logging.getLogger(name)
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, encoding=self.encoding,
+                      errors=self.errors, buffering=LOG_BUFFER_SIZE)
+        self._bytes_written = os.path.getsize(self.baseFilename)
+        return stream
     
-    # Avoid duplicate handlers
-    if logger.hasHandlers():
-        return logger
+    def shouldRollover(self, record):
+        # Track the file size here; the base class seeks to the end for every
+        # record, which flushes the buffer each time
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            size = len(self.format(record)) + 1
+            if self._bytes_written + size >= self.maxBytes:
+                return True
+            self._bytes_written += size
+        return False
     
-    logger.setLevel(level)
+    def flush(self):
+        # StreamHandler.emit calls this after every record; only hit the disk periodically
+        now = time.monotonic()
+        if now - self._last_flush >= FLUSH_INTERVAL:
+            self.flush_buffer()
     
-    # Create logs directory if it doesn't exist
-    os.makedirs(log_dir, exist_ok=True)
+    def flush_buffer(self):
+        """Write out everything buffered so far"""
+        self._last_flush = time.monotonic()
+        super().flush()
     
-    # Define log format
-    file_format = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    def emit(self, record):
+        super().emit(record)
+        if record.levelno >= logging.ERROR:
+            self.flush_buffer()
+
+class _FlushingQueueListener(QueueListener):
+    """QueueListener that flushes buffered file handlers whenever the queue runs empty"""
     
-    console_format = ColoredFormatter(
-        '%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%H:%M:%S'
-    )
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            # Nothing waiting: write out what's buffered before blocking, so an
+            # idle process never holds its latest records in memory
+            for handler in self.handlers:
+                if isinstance(handler, BufferedRotatingFileHandler):
+                    handler.flush_buffer()
+            return self.queue.get(block)
+
+# One queue (and listener thread) per log directory, shared by every logger
+# that writes there, so records from all modules reach the files in order
+_log_queues = {}
+_log_queues_lock = threading.Lock()
+
+def _get_log_queue(log_dir):
+    """Return the queue feeding log_dir's handlers, starting its listener on first use"""
+    key = os.path.abspath(log_dir)
+    with _log_queues_lock:
+        if key not in _log_queues:
+            _log_queues[key] = _start_listener(log_dir)
+        return _log_queues[key]
+
+def _start_listener(log_dir):
+    """Create log_dir's file/console handlers and start a QueueListener feeding them"""
+    # Create logs directory if it doesn't exist
+    os.makedirs(log_dir, exist_ok=True)
     
     # File Handler - Rotating (max 10MB, keep 5 backups)
     log_file = os.path.join(log_dir, f'phishing_detector_{datetime.now().strftime("%Y%m%d")}.log')
-    file_handler = RotatingFileHandler(
+    file_handler = BufferedRotatingFileHandler(
         log_file,
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5,
-        encoding='utf-8'
+        encoding='utf-8',
+        delay=True  # Don't create the file until something is logged
     )
     file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(file_format)
+    file_handler.setFormatter(_FILE_FMT)
     
     # Console Handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(console_format)
+    console_handler.setFormatter(_CONSOLE_FMT)
     
     # Error File Handler - Separate file for errors
     error_log_file = os.path.join(log_dir, 'errors.log')
@@ -83,15 +177,43 @@ def setup_logger(name='phishing_detector', log_dir='logs', level=logging.INFO):
         error_log_file,
         maxBytes=5*1024*1024,  # 5MB
         backupCount=3,
-        encoding='utf-8'
+        encoding='utf-8',
+        delay=True
     )
     error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(file_format)
+    error_handler.setFormatter(_FILE_FMT)
+    
+    log_queue = queue.Queue(-1)
+    listener = _FlushingQueueListener(log_queue, file_handler, console_handler, error_handler,
+                                      respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    return log_queue
+
+def setup_logger(name='phishing_detector', log_dir='logs', level=logging.INFO):
+    """
+    Setup logger with file and console handlers
+    
+    Args:
+        name: Logger name
+        log_dir: Directory for log files
+        level: Logging level (default: INFO)
+    
+    Returns:
+        logging.Logger: Configured logger instance
+    """
+    # Create logger
+    logger = logging.getLogger(name)
+    
+    # Avoid duplicate handlers
+    if logger.hasHandlers():
+        return logger
+    
+    logger.setLevel(level)
     
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    logger.addHandler(error_handler)
+    # Callers only enqueue records; a listener thread does the formatting and disk I/O
+    logger.addHandler(QueueHandler(_get_log_queue(log_dir)))
     
     return logger
 
@@ -114,20 +236,29 @@ def get_logger(name='phishing_detector'):
 default_logger = setup_logger()
 
 # Convenience functions
+# Each checks the level first so filtered calls return immediately. Hot-path
+# callers should pass a %-style format and args (not an f-string) so the
+# message is only built when the record is actually emitted.
 def debug(msg, *args, **kwargs):
-    default_logger.debug(msg, *args, **kwargs)
+    if default_logger.isEnabledFor(logging.DEBUG):
+        default_logger.debug(msg, *args, **kwargs)
 
 def info(msg, *args, **kwargs):
-    default_logger.info(msg, *args, **kwargs)
+    if default_logger.isEnabledFor(logging.INFO):
+        default_logger.info(msg, *args, **kwargs)
 
 def warning(msg, *args, **kwargs):
-    default_logger.warning(msg, *args, **kwargs)
+    if default_logger.isEnabledFor(logging.WARNING):
+        default_logger.warning(msg, *args, **kwargs)
 
 def error(msg, *args, **kwargs):
-    default_logger.error(msg, *args, **kwargs)
+    if default_logger.isEnabledFor(logging.ERROR):
+        default_logger.error(msg, *args, **kwargs)
 
 def critical(msg, *args, **kwargs):
-    default_logger.critical(msg, *args, **kwargs)
+    if default_logger.isEnabledFor(logging.CRITICAL):
+        default_logger.critical(msg, *args, **kwargs)
 
 def exception(msg, *args, **kwargs):
-    default_logger.exception(msg, *args, **kwargs)
+    if default_logger.isEnabledFor(logging.ERROR):
+        default_logger.exception(msg, *args, **kwargs)
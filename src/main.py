@@ -1,31 +1,72 @@
+import hashlib
 import os
 import sys
 import time
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+import joblib
 from .data_collection import load_dataset
+from . import feature_extraction
 from .feature_extraction import extract_features
-from .preprocessing import prepare_data
+from .preprocessing import prepare_data, count_classes
 from .model_training import train_decision_tree, train_xgboost
+from .model_training import get_optimal_threads
 from .evaluation import evaluate_model
 
+# Whole feature tables are memoized here, keyed by the input frame, the day and the
+# feature extraction code, so a retrain on the same data skips extraction (network
+# results are kept for at most a day, like the per-URL DNS/SSL cache). Only the
+# FEATURE_TABLE_CACHE_ITEMS most recently used tables are kept
+FEATURE_TABLE_CACHE_DIR = 'data/feature_table_cache'
+FEATURE_TABLE_CACHE_ITEMS = 2
+
+_feature_memory = joblib.Memory(FEATURE_TABLE_CACHE_DIR, verbose=0)
+
+def _source_digest(module):
+    """Short hash of a module's source file, so cached output follows code changes"""
+    with open(module.__file__, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+FEATURE_CODE_VERSION = _source_digest(feature_extraction)
+
+@_feature_memory.cache
+def _extract_features_for_day(df, day, code_version):
+    return extract_features(df)
+
 def check_models_exist():
     """Check if trained models already exist"""
-    dt_path = 'models/dt_model.pkl'
-    xgb_path = 'models/xgb_model.pkl'
-    
-    dt_exists = os.path.exists(dt_path)
-    xgb_exists = os.path.exists(xgb_path)
-    
-    if dt_exists and xgb_exists:
-        try:
-            # Get model file timestamps
-            dt_time = datetime.fromtimestamp(os.path.getmtime(dt_path))
-            xgb_time = datetime.fromtimestamp(os.path.getmtime(xgb_path))
-            return True, dt_time, xgb_time
-        except Exception:
-            return False, None, None
+    # One stat per file gives both existence and the timestamp
+    try:
+        dt_stat = os.stat('models/dt_model.pkl')
+        xgb_stat = os.stat('models/xgb_model.pkl')
+    except OSError:
+        return False, None, None
     
-    return False, None, None
+    return True, datetime.fromtimestamp(dt_stat.st_mtime), datetime.fromtimestamp(xgb_stat.st_mtime)
+
+def _fit_dt(X_train, y_train, X_test, y_test, n_jobs=None):
+    """Train and evaluate the Decision Tree (runs in a worker process)"""
+    start = time.time()
+    # Calibration folds run on threads: loky worker processes started from inside a
+    # pool worker outlive it, and the pool's shutdown would wait on them forever
+    with joblib.parallel_config(backend='threading'):
+        model = train_decision_tree(X_train, y_train, n_jobs=n_jobs)
+    metrics = evaluate_model(model, X_test, y_test)
+    return model, metrics, time.time() - start
+
+def _fit_xgb(X_train, y_train, X_test, y_test, n_jobs=None):
+    """Train and evaluate XGBoost (runs in a worker process)"""
+    start = time.time()
+    model = train_xgboost(X_train, y_train, n_jobs=n_jobs)
+    metrics = evaluate_model(model, X_test, y_test)
+    return model, metrics, time.time() - start
+
+def _print_metrics(metrics, step_time):
+    print(f"           ✓ Training complete! ({step_time:.2f}s)")
+    print(f"           ✓ Accuracy:  {metrics['accuracy']:.2%}")
+    print(f"           ✓ Precision: {metrics['precision']:.2%}")
+    print(f"           ✓ Recall:    {metrics['recall']:.2%}")
+    print(f"           ✓ F1-Score:  {metrics['f1']:.2%}")
 
 def run(force_retrain=False):
     """
@@ -98,7 +139,11 @@ def run(force_retrain=False):
         print("\n[Step 2/6] Extracting features...")
         step_start = time.time()
         try:
-            df = extract_features(df)
+            day = date.today().isoformat()
+            if _extract_features_for_day.check_call_in_cache(df, day, FEATURE_CODE_VERSION):
+                print("           (Reusing today's cached features for this dataset)")
+            df = _extract_features_for_day(df, day, FEATURE_CODE_VERSION)
+            _feature_memory.reduce_size(items_limit=FEATURE_TABLE_CACHE_ITEMS)
             step_time = time.time() - step_start
             feature_count = len([col for col in df.columns if col not in ['url', 'label']])
             print(f"           ✓ Extracted {feature_count} features per URL ({step_time:.2f}s)")
@@ -116,8 +161,7 @@ def run(force_retrain=False):
             print(f"           ✓ Test set:     {len(X_test)} samples")
             
             # Check class balance
-            phishing_train = sum(y_train)
-            legit_train = len(y_train) - phishing_train
+            legit_train, phishing_train = count_classes(y_train)[:2]
             print(f"           ✓ Balance: {phishing_train} phishing, {legit_train} legitimate ({step_time:.2f}s)")
             
         except Exception as e:
@@ -127,43 +171,33 @@ def run(force_retrain=False):
         # Create models directory
         os.makedirs('models', exist_ok=True)
         
-        # Train Decision Tree
+        # Train both models at once in separate processes (XGBoost leaks memory
+        # when trained from several threads); each gets half the cores
         print("\n[Step 4/6] Training Decision Tree model...")
         print("           (Using optimized parameters...)")
-        step_start = time.time()
-        try:
-            dt_model = train_decision_tree(X_train, y_train)
-            dt_metrics = evaluate_model(dt_model, X_test, y_test)
-            step_time = time.time() - step_start
-            
-            print(f"           ✓ Training complete! ({step_time:.2f}s)")
-            print(f"           ✓ Accuracy:  {dt_metrics['accuracy']:.2%}")
-            print(f"           ✓ Precision: {dt_metrics['precision']:.2%}")
-            print(f"           ✓ Recall:    {dt_metrics['recall']:.2%}")
-            print(f"           ✓ F1-Score:  {dt_metrics['f1']:.2%}")
-            
-        except Exception as e:
-            print(f"\n✗ ERROR training Decision Tree: {str(e)}")
-            return False
-        
-        # Train XGBoost
         print("\n[Step 5/6] Training XGBoost model...")
-        print("           (Using gradient boosting...)")
-        step_start = time.time()
-        try:
-            xgb_model = train_xgboost(X_train, y_train)
-            xgb_metrics = evaluate_model(xgb_model, X_test, y_test)
-            step_time = time.time() - step_start
+        print("           (Using gradient boosting, in parallel with the Decision Tree...)")
+        n_jobs = max(1, get_optimal_threads() // 2)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            fut_dt = executor.submit(_fit_dt, X_train, y_train, X_test, y_test, n_jobs)
+            fut_xgb = executor.submit(_fit_xgb, X_train, y_train, X_test, y_test, n_jobs)
             
-            print(f"           ✓ Training complete! ({step_time:.2f}s)")
-            print(f"           ✓ Accuracy:  {xgb_metrics['accuracy']:.2%}")
-            print(f"           ✓ Precision: {xgb_metrics['precision']:.2%}")
-            print(f"           ✓ Recall:    {xgb_metrics['recall']:.2%}")
-            print(f"           ✓ F1-Score:  {xgb_metrics['f1']:.2%}")
+            try:
+                dt_model, dt_metrics, step_time = fut_dt.result()
+                print("\n           Decision Tree:")
+                _print_metrics(dt_metrics, step_time)
+            except Exception as e:
+                fut_xgb.cancel()
+                print(f"\n✗ ERROR training Decision Tree: {str(e)}")
+                return False
             
-        except Exception as e:
-            print(f"\n✗ ERROR training XGBoost: {str(e)}")
-            return False
+            try:
+                xgb_model, xgb_metrics, step_time = fut_xgb.result()
+                print("\n           XGBoost:")
+                _print_metrics(xgb_metrics, step_time)
+            except Exception as e:
+                print(f"\n✗ ERROR training XGBoost: {str(e)}")
+                return False
         
         # Summary
         print("\n[Step 6/6] Saving models...")
@@ -1,4 +1,3 @@
-import joblib
 import os
 from sklearn.tree import DecisionTreeClassifier
 from xgboost import XGBClassifier
@@ -7,19 +6,49 @@ from sklearn.model_selection import cross_val_score
 from sklearn.calibration import CalibratedClassifierCV
 import numpy as np
 
+try:
+    from .preprocessing import save_artifact, count_classes
+except ImportError:
+    from preprocessing import save_artifact, count_classes
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Below this majority:minority ratio the classes are treated as balanced and
+# trained unweighted; 'balanced' weights are all ~1 there, so they'd only add cost
+BALANCED_CLASS_RATIO = 1.05
+
+def class_ratio(y):
+    """Majority:minority class ratio of labels y (inf if a class is missing)"""
+    counts = count_classes(y)[:2]
+    return counts.max() / counts.min() if counts.min() > 0 else float('inf')
+
 def get_optimal_threads():
     """
     Get optimal number of threads for training
-    Uses half of available CPU cores (min 1, max 4)
+    Uses every physical core (logical cores if psutil is unavailable)
     """
-    try:
-        cpu_count = os.cpu_count() or 2
-        optimal = max(1, min(cpu_count // 2, 4))
-        return optimal
-    except Exception:
-        return 2  # Safe default
+    cpu_count = None
+    if PSUTIL_AVAILABLE:
+        cpu_count = psutil.cpu_count(logical=False)
+    return max(1, cpu_count or os.cpu_count() or 2)
 
-def train_decision_tree(X_train, y_train, use_calibration=True):
+def report_cv_score(model, X_train, y_train, cv=3):
+    """Print cross-validated F1 scores for model and warn if they are low"""
+    print("   Performing cross-validation...")
+    cv_scores = cross_val_score(model, X_train, y_train, cv=cv, scoring='f1')
+    print(f"   CV F1 scores: {cv_scores}")
+    print(f"   Mean CV F1: {cv_scores.mean():.4f} (+/- {cv_scores.std():.4f})")
+    
+    if cv_scores.mean() < 0.7:
+        print("   ⚠ Warning: Low CV score suggests dataset may be too small or imbalanced")
+    return cv_scores
+
+def train_decision_tree(X_train, y_train, use_calibration=True, run_cv=False, fast=False,
+                        n_jobs=None):
     """
     Train Decision Tree classifier with optimized parameters and regularization
     IMPROVED: Better parameters to prevent overfitting and improve accuracy
@@ -28,17 +57,25 @@ def train_decision_tree(X_train, y_train, use_calibration=True):
         X_train: Training features
         y_train: Training labels
         use_calibration: Whether to apply probability calibration
+        run_cv: Whether to report 3-fold CV F1 of the uncalibrated model
+        fast: Use random splits and sigmoid calibration for quicker training
+              (noticeably less accurate; meant for quick experiments)
+        n_jobs: Calibration folds fitted in parallel (default: get_optimal_threads())
         
     Returns:
         Trained Decision Tree model
     """
     try:
-        # Calculate class weights for balancing
-        classes = np.unique(y_train)
-        class_weights = compute_class_weight('balanced', classes=classes, y=y_train)
-        class_weight_dict = dict(zip(classes, class_weights))
-        
-        print(f"   Class weights: {class_weight_dict}")
+        # Calculate class weights for balancing (skipped when already balanced)
+        ratio = class_ratio(y_train)
+        if ratio < BALANCED_CLASS_RATIO:
+            class_weight_dict = None
+            print(f"   Classes balanced (ratio 1:{ratio:.2f}), training unweighted")
+        else:
+            classes = np.unique(y_train)
+            class_weights = compute_class_weight('balanced', classes=classes, y=y_train)
+            class_weight_dict = dict(zip(classes, class_weights))
+            print(f"   Class weights: {class_weight_dict}")
         
         # Create model with OPTIMIZED regularization to prevent overfitting
         # These parameters are carefully tuned for better generalization
@@ -49,7 +86,7 @@ def train_decision_tree(X_train, y_train, use_calibration=True):
             min_samples_leaf=12,  # Ensures meaningful leaf nodes
             max_features='sqrt',  # Use sqrt of features to reduce correlation
             class_weight=class_weight_dict,  # Handle class imbalance
-            splitter='best',  # Best split at each node
+            splitter='random' if fast else 'best',  # Best split at each node unless fast
             criterion='gini',  # Gini impurity for faster computation
             min_impurity_decrease=0.0005,  # Require meaningful improvement for splits
             max_leaf_nodes=500  # Limit tree complexity
@@ -59,32 +96,30 @@ def train_decision_tree(X_train, y_train, use_calibration=True):
         print("   Training base Decision Tree...")
         dt.fit(X_train, y_train)
         
+        # Cross-validate the base tree only; refitting the calibrated wrapper per
+        # fold would train 25 trees just for a score
+        if run_cv:
+            report_cv_score(dt, X_train, y_train)
+        
         # Apply probability calibration to reduce prediction bias
         # This significantly improves prediction reliability
         if use_calibration:
-            print("   Applying probability calibration (isotonic regression)...")
-            dt = CalibratedClassifierCV(dt, method='isotonic', cv=5)
+            print(f"   Applying probability calibration ({'sigmoid' if fast else 'isotonic regression'})...")
+            # Single-threaded trees, so the calibration folds can fit in parallel
+            dt = CalibratedClassifierCV(dt, method='sigmoid' if fast else 'isotonic', cv=5,
+                                        n_jobs=n_jobs or get_optimal_threads())
             dt.fit(X_train, y_train)
         
-        # Perform cross-validation to check generalization
-        print("   Performing cross-validation...")
-        cv_scores = cross_val_score(dt, X_train, y_train, cv=5, scoring='f1')
-        print(f"   CV F1 scores: {cv_scores}")
-        print(f"   Mean CV F1: {cv_scores.mean():.4f} (+/- {cv_scores.std():.4f})")
-        
-        if cv_scores.mean() < 0.7:
-            print("   ⚠ Warning: Low CV score suggests dataset may be too small or imbalanced")
-        
         # Save model
         os.makedirs('models', exist_ok=True)
-        joblib.dump(dt, 'models/dt_model.pkl')
+        save_artifact(dt, 'models/dt_model.pkl')
         
         return dt
         
     except Exception as e:
         raise Exception(f"Decision Tree training failed: {str(e)}")
 
-def train_xgboost(X_train, y_train, use_calibration=True):
+def train_xgboost(X_train, y_train, use_calibration=True, run_cv=False, n_jobs=None):
     """
     Train XGBoost classifier with optimized parameters and regularization
     IMPROVED: Enhanced gradient boosting for better accuracy
@@ -93,21 +128,25 @@ def train_xgboost(X_train, y_train, use_calibration=True):
         X_train: Training features
         y_train: Training labels
         use_calibration: Whether to apply probability calibration
+        run_cv: Whether to report 3-fold CV F1 of the uncalibrated model
+        n_jobs: XGBoost threads (default: get_optimal_threads())
         
     Returns:
         Trained XGBoost model
     """
     try:
-        # Calculate scale_pos_weight for class imbalance
-        neg_count = (y_train == 0).sum()
-        pos_count = (y_train == 1).sum()
-        scale_pos_weight = neg_count / pos_count if pos_count > 0 else 1
+        # Calculate scale_pos_weight for class imbalance (1.0 when already balanced)
+        neg_count, pos_count = count_classes(y_train)[:2]
+        if class_ratio(y_train) < BALANCED_CLASS_RATIO:
+            scale_pos_weight = 1.0
+        else:
+            scale_pos_weight = neg_count / pos_count if pos_count > 0 else 1
         
         print(f"   Scale pos weight: {scale_pos_weight:.2f}")
         print(f"   Class distribution: {neg_count} negative, {pos_count} positive")
         
         # Get optimal thread count
-        n_threads = get_optimal_threads()
+        n_threads = n_jobs or get_optimal_threads()
         
         # Create model with OPTIMIZED parameters for better generalization
         # These parameters are specifically tuned for URL phishing detection
@@ -121,6 +160,8 @@ def train_xgboost(X_train, y_train, use_calibration=True):
             learning_rate=0.03,  # Lower learning rate with more trees
             scale_pos_weight=scale_pos_weight,  # Handle class imbalance
             objective='binary:logistic',
+            # Uniform row sampling; sampling_method='gradient_based' was slower per
+            # tree on CPU here and no faster to converge
             subsample=0.8,  # Bootstrap sampling
             colsample_bytree=0.8,  # Feature sampling per tree
             colsample_bylevel=0.8,  # Feature sampling per level
@@ -135,29 +176,32 @@ def train_xgboost(X_train, y_train, use_calibration=True):
             verbosity=0  # Suppress warnings
         )
         
-        # Train model
-        print("   Training base XGBoost...")
-        xgb.fit(X_train, y_train)
+        # Cast once so every fit below gets a float32 block instead of converting per fold
+        # (a DataFrame keeps its column names, which prediction relies on)
+        if hasattr(X_train, 'astype'):
+            X_train = X_train.astype(np.float32, copy=False)
+        
+        # Train model (calibration fits its own clones per fold, so the
+        # stand-alone fit is only needed when the model is used uncalibrated)
+        if not use_calibration:
+            print("   Training base XGBoost...")
+            xgb.fit(X_train, y_train)
+        
+        # Cross-validate the base model only (see train_decision_tree)
+        if run_cv:
+            report_cv_score(xgb, X_train, y_train)
         
         # Apply probability calibration to reduce prediction bias
         # This is CRITICAL for reliable probability estimates
         if use_calibration:
             print("   Applying probability calibration (isotonic regression)...")
-            xgb = CalibratedClassifierCV(xgb, method='isotonic', cv=5)
+            # Folds fit one at a time; each already uses every core
+            xgb = CalibratedClassifierCV(xgb, method='isotonic', cv=5, n_jobs=1)
             xgb.fit(X_train, y_train)
         
-        # Perform cross-validation
-        print("   Performing cross-validation...")
-        cv_scores = cross_val_score(xgb, X_train, y_train, cv=5, scoring='f1')
-        print(f"   CV F1 scores: {cv_scores}")
-        print(f"   Mean CV F1: {cv_scores.mean():.4f} (+/- {cv_scores.std():.4f})")
-        
-        if cv_scores.mean() < 0.7:
-            print("   ⚠ Warning: Low CV score suggests dataset may be too small or imbalanced")
-        
         # Save model
         os.makedirs('models', exist_ok=True)
-        joblib.dump(xgb, 'models/xgb_model.pkl')
+        save_artifact(xgb, 'models/xgb_model.pkl')
         
         return xgb
         
@@ -1,11 +1,220 @@
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import StratifiedShuffleSplit
 from sklearn.preprocessing import StandardScaler, RobustScaler
 import pandas as pd
 import joblib
 import os
+import glob
+import io
+import hashlib
+import pickle
 import numpy as np
 
-def prepare_data(df, save_feature_names=True, use_scaling=False, remove_outliers=False):
+# Saved models must load everywhere, so they use a stdlib codec rather than an
+# optional one (an lz4-compressed file can't be read without lz4 installed)
+ARTIFACT_COMPRESSION = ('zlib', 3)
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Prepared splits are cached in models/ keyed by a hash of the input frame;
+# bump the version whenever prepare_data's output changes for the same input.
+# Only the PREP_CACHE_MAX_FILES most recently used cache files are kept
+PREP_CACHE_VERSION = 2
+PREP_CACHE_MAX_FILES = 2
+
+# Rows checked per block by the NumPy outlier fallback (bounds the temporary mask)
+OUTLIER_CHUNK_ROWS = 65536
+
+# Rows per block of the one-pass variance/correlation sweep (Numba, NumPy fallback)
+GRAM_BLOCK_ROWS = 256
+GRAM_BLOCK_ROWS_NUMPY = 4096
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _iqr_keep_mask(A, lo, hi):
+        keep = np.ones(A.shape[0], np.uint8)
+        for i in prange(A.shape[0]):
+            for j in range(A.shape[1]):
+                v = A[i, j]
+                if v < lo[j] or v > hi[j]:
+                    keep[i] = 0
+                    break
+        return keep
+
+    @njit(fastmath=True, cache=True)
+    def _moments_and_gram(A, block_rows):
+        # One sweep over A in row blocks small enough to stay in cache: column sums,
+        # min/max and the Gram matrix, accumulated in float64 (the Gram update goes
+        # to BLAS). Values are shifted by the first row, which leaves the covariance
+        # unchanged but avoids cancellation in the raw-moment formula.
+        n, F = A.shape
+        shift = A[0].astype(np.float64)
+        sums = np.zeros(F)
+        lo = np.zeros(F)
+        hi = np.zeros(F)
+        gram = np.zeros((F, F))
+        for start in range(0, n, block_rows):
+            block = A[start:min(start + block_rows, n)].astype(np.float64) - shift
+            gram += block.T @ block
+            for i in range(block.shape[0]):
+                for j in range(F):
+                    v = block[i, j]
+                    sums[j] += v
+                    if v < lo[j]:
+                        lo[j] = v
+                    if v > hi[j]:
+                        hi[j] = v
+        return sums, lo, hi, gram
+
+def _moments_and_gram_numpy(A, block_rows):
+    n, F = A.shape
+    shift = A[0].astype(np.float64)
+    sums = np.zeros(F)
+    lo = np.zeros(F)
+    hi = np.zeros(F)
+    gram = np.zeros((F, F))
+    for start in range(0, n, block_rows):
+        block = A[start:start + block_rows].astype(np.float64) - shift
+        gram += block.T @ block
+        sums += block.sum(axis=0)
+        np.minimum(lo, block.min(axis=0), out=lo)
+        np.maximum(hi, block.max(axis=0), out=hi)
+    return sums, lo, hi, gram
+
+def iqr_keep_mask(A, lo, hi):
+    """
+    Flag rows whose values all lie within [lo, hi] per column
+    
+    Args:
+        A: 2-D numeric array (rows x features)
+        lo: Lower bound per feature
+        hi: Upper bound per feature
+    
+    Returns:
+        numpy bool array, True for rows to keep
+    """
+    if NUMBA_AVAILABLE:
+        return _iqr_keep_mask(A, lo, hi).astype(bool)
+    
+    keep = np.empty(A.shape[0], dtype=bool)
+    for start in range(0, A.shape[0], OUTLIER_CHUNK_ROWS):
+        block = A[start:start + OUTLIER_CHUNK_ROWS]
+        keep[start:start + OUTLIER_CHUNK_ROWS] = ~((block < lo) | (block > hi)).any(axis=1)
+    return keep
+
+def variance_and_correlation(A):
+    """
+    Per-feature variance and absolute pairwise correlation in one pass over A
+    
+    Args:
+        A: 2-D float array (rows x features), at least two rows
+    
+    Returns:
+        (var, corr_abs): variances (exactly 0 for constant columns) and the
+        |correlation| matrix (0 wherever a constant column is involved)
+    """
+    n = A.shape[0]
+    if NUMBA_AVAILABLE:
+        sums, lo, hi, gram = _moments_and_gram(A, GRAM_BLOCK_ROWS)
+    else:
+        sums, lo, hi, gram = _moments_and_gram_numpy(A, GRAM_BLOCK_ROWS_NUMPY)
+    mean = sums / n
+    cov = (gram - n * np.outer(mean, mean)) / (n - 1)
+    constant = lo == hi
+    
+    var = np.diag(cov).copy()
+    var[constant] = 0
+    std = np.sqrt(np.maximum(var, 0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr_abs = np.abs(cov) / np.outer(std, std)
+    corr_abs[constant, :] = 0
+    corr_abs[:, constant] = 0
+    return var, corr_abs
+
+def count_classes(y):
+    """
+    Count samples per class label (0 = legitimate, 1 = phishing)
+    
+    Args:
+        y: Label Series or array of non-negative integers
+    
+    Returns:
+        numpy int64 array, counts[label] for every label up to max(y) (at least 0 and 1)
+    """
+    return np.bincount(np.asarray(y).astype(np.int64, copy=False), minlength=2)
+
+def save_artifact(obj, path):
+    """Save a model/metadata artifact with joblib, compressed, using the newest pickle protocol"""
+    # Pickle into memory and write the file once, rather than in many small chunks
+    buf = io.BytesIO()
+    joblib.dump(obj, buf, compress=ARTIFACT_COMPRESSION, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(path, 'wb') as f:
+        f.write(buf.getbuffer())
+
+def _prep_cache_path(df, remove_outliers):
+    """Cache file for prepare_data's output on df (content + options hash)"""
+    # sha1 rather than blake2b/md5: it is the fastest of the three on the frame's
+    # hash bytes (hardware-accelerated), and the key only names a local cache file
+    digest = hashlib.sha1()
+    digest.update(repr((PREP_CACHE_VERSION, remove_outliers, list(df.columns))).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return os.path.join('models', f'prep_cache_{digest.hexdigest()[:16]}.npz')
+
+def _save_prep_cache(path, X_train, X_test, y_train, y_test):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(
+        path,
+        columns=np.array(X_train.columns, dtype=str),
+        X_train=X_train.to_numpy(dtype=np.float32), X_test=X_test.to_numpy(dtype=np.float32),
+        y_train=y_train.to_numpy(), y_test=y_test.to_numpy(),
+        train_index=X_train.index.to_numpy(), test_index=X_test.index.to_numpy()
+    )
+    _prune_prep_cache(os.path.dirname(path))
+
+def _prune_prep_cache(cache_dir):
+    """Delete all but the PREP_CACHE_MAX_FILES most recently used prep cache files"""
+    paths = glob.glob(os.path.join(cache_dir, 'prep_cache_*.npz'))
+    paths.sort(key=os.path.getmtime, reverse=True)
+    for stale in paths[PREP_CACHE_MAX_FILES:]:
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+
+def _load_prep_cache(path):
+    """Load cached splits, or None if the file is missing or unreadable"""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            columns = data['columns'].tolist()
+            X_train = pd.DataFrame(data['X_train'], columns=columns, index=data['train_index'])
+            X_test = pd.DataFrame(data['X_test'], columns=columns, index=data['test_index'])
+            y_train = pd.Series(data['y_train'], index=data['train_index'], name='label')
+            y_test = pd.Series(data['y_test'], index=data['test_index'], name='label')
+        os.utime(path)  # Mark as recently used, so pruning keeps it
+        return X_train, X_test, y_train, y_test
+    except Exception:
+        return None
+
+def _save_feature_info(X):
+    """Save the final feature names (and their stats) used for prediction"""
+    os.makedirs('models', exist_ok=True)
+    feature_names = X.columns.tolist()
+    save_artifact(feature_names, 'models/feature_names.pkl')
+    print(f"\n✓ Saved feature names: {len(feature_names)} features")
+    
+    # Save feature importance info
+    feature_stats = {
+        'names': feature_names,
+        'means': X.mean().to_dict(),
+        'stds': X.std().to_dict()
+    }
+    save_artifact(feature_stats, 'models/feature_stats.pkl')
+
+def prepare_data(df, save_feature_names=True, use_scaling=False, remove_outliers=False,
+                 use_cache=True):
     """
     Prepare data for model training with enhanced preprocessing
     
@@ -14,66 +223,94 @@ def prepare_data(df, save_feature_names=True, use_scaling=False, remove_outliers
         save_feature_names: Save feature names for later use
         use_scaling: Apply feature scaling (not recommended for tree-based models)
         remove_outliers: Remove statistical outliers
+        use_cache: Reuse the splits from an earlier run on identical data
+                   (not used together with scaling, whose scaler lives in its own file)
     
     Returns:
         X_train, X_test, y_train, y_test
     """
     print("📋 Preparing data for model training...")
     
+    cache_path = _prep_cache_path(df, remove_outliers) if use_cache and not use_scaling else None
+    if cache_path and os.path.exists(cache_path):
+        splits = _load_prep_cache(cache_path)
+        if splits is not None:
+            X_train, X_test, y_train, y_test = splits
+            print(f"✓ Loaded prepared data from cache: {cache_path}")
+            print(f"   Training set: {len(X_train):,} samples, {X_train.shape[1]} features")
+            print(f"   Test set:     {len(X_test):,} samples")
+            if save_feature_names:
+                _save_feature_info(pd.concat([X_train, X_test]).sort_index())
+            return X_train, X_test, y_train, y_test
+    
     # Keep only numeric feature columns for ML training
     feature_cols = [col for col in df.columns if col not in ['url', 'label']]
     
     X = df[feature_cols].copy()
-    y = df['label']
+    # Labels are 0/1, so int8 is enough (features become float32 below, which is
+    # what XGBoost's histograms and sklearn's tree splitter work in anyway)
+    y = df['label'].astype(np.int8)
     
     print(f"Initial features: {len(feature_cols)}")
     print(f"Original feature matrix shape: {X.shape}")
     
-    # Ensure all features are numeric
+    # Ensure all features are numeric; only non-numeric columns need coercing
     print("Converting features to numeric...")
-    for col in X.columns:
-        X[col] = pd.to_numeric(X[col], errors='coerce').fillna(0)
+    non_numeric = X.select_dtypes(exclude=[np.number]).columns
+    if len(non_numeric):
+        X[non_numeric] = X[non_numeric].apply(pd.to_numeric, errors='coerce')
+    X = X.fillna(0)
+    
+    # Filter on one C-ordered float32 array; the DataFrame is rebuilt once at the end
+    feature_names = X.columns
+    row_index = X.index
+    X_arr = np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+    del X
+    
+    # Variance and correlation come from one fused pass over the array
+    var, corr_abs = variance_and_correlation(X_arr)
     
     # Remove any columns with zero variance (all same values)
     print("Checking for zero-variance features...")
-    variance = X.var()
-    zero_var_cols = variance[variance == 0].index.tolist()
-    if zero_var_cols:
-        print(f"  Removing {len(zero_var_cols)} zero-variance columns")
-        X = X.drop(columns=zero_var_cols)
+    zero_var = var == 0
+    if zero_var.any():
+        print(f"  Removing {int(zero_var.sum())} zero-variance columns")
+        X_arr = X_arr[:, ~zero_var]
+        feature_names = feature_names[~zero_var]
+        corr_abs = corr_abs[np.ix_(~zero_var, ~zero_var)]
     
     # Remove highly correlated features to reduce redundancy
     print("Checking for highly correlated features...")
-    correlation_matrix = X.corr().abs()
-    upper_triangle = correlation_matrix.where(
-        np.triu(np.ones(correlation_matrix.shape), k=1).astype(bool)
-    )
-    high_corr_cols = [col for col in upper_triangle.columns if any(upper_triangle[col] > 0.95)]
-    if high_corr_cols:
-        print(f"  Removing {len(high_corr_cols)} highly correlated features (>0.95)")
-        X = X.drop(columns=high_corr_cols)
+    # A column is dropped if it correlates with any earlier column
+    high_corr_mask = (np.triu(corr_abs, k=1) > 0.95).any(axis=0)
+    if high_corr_mask.any():
+        print(f"  Removing {int(high_corr_mask.sum())} highly correlated features (>0.95)")
+        X_arr = np.ascontiguousarray(X_arr[:, ~high_corr_mask])
+        feature_names = feature_names[~high_corr_mask]
     
     # Remove outliers if requested (use IQR method)
     if remove_outliers:
         print("Removing statistical outliers...")
-        Q1 = X.quantile(0.25)
-        Q3 = X.quantile(0.75)
+        Q1, Q3 = np.quantile(X_arr, [0.25, 0.75], axis=0).astype(np.float64)
         IQR = Q3 - Q1
-        outlier_mask = ~((X < (Q1 - 3 * IQR)) | (X > (Q3 + 3 * IQR))).any(axis=1)
+        outlier_mask = iqr_keep_mask(X_arr, Q1 - 3 * IQR, Q3 + 3 * IQR)
         
-        original_size = len(X)
-        X = X[outlier_mask]
+        original_size = len(X_arr)
+        X_arr = X_arr[outlier_mask]
+        row_index = row_index[outlier_mask]
         y = y[outlier_mask]
-        removed = original_size - len(X)
+        removed = original_size - len(X_arr)
         
         if removed > 0:
             print(f"  Removed {removed} outlier samples ({removed/original_size*100:.2f}%)")
     
+    X = pd.DataFrame(X_arr, columns=feature_names, index=row_index, copy=False)
+    
     print(f"Final feature matrix shape: {X.shape}")
     print(f"Active features: {len(X.columns)}")
     
     # Enhanced class distribution display
-    class_counts = y.value_counts().to_dict()
+    class_counts = {label: int(count) for label, count in enumerate(count_classes(y)) if count}
     total_samples = len(y)
     print(f"\n📊 Class Distribution:")
     for label, count in sorted(class_counts.items()):
@@ -97,18 +334,7 @@ def prepare_data(df, save_feature_names=True, use_scaling=False, remove_outliers
     
     # Save the final feature names for prediction
     if save_feature_names:
-        os.makedirs('models', exist_ok=True)
-        feature_names = X.columns.tolist()
-        joblib.dump(feature_names, 'models/feature_names.pkl')
-        print(f"\n✓ Saved feature names: {len(feature_names)} features")
-        
-        # Save feature importance info
-        feature_stats = {
-            'names': feature_names,
-            'means': X.mean().to_dict(),
-            'stds': X.std().to_dict()
-        }
-        joblib.dump(feature_stats, 'models/feature_stats.pkl')
+        _save_feature_info(X)
     
     # Apply feature scaling if requested (generally not needed for tree-based models)
     scaler = None
@@ -120,27 +346,31 @@ def prepare_data(df, save_feature_names=True, use_scaling=False, remove_outliers
             columns=X.columns,
             index=X.index
         )
-        joblib.dump(scaler, 'models/scaler.pkl')
+        save_artifact(scaler, 'models/scaler.pkl')
     
     # Split with stratification to maintain class balance
     print(f"\n✂  Splitting data: 70% train, 30% test (stratified)")
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, 
-        test_size=0.3, 
-        random_state=42, 
-        stratify=y  # Maintain class distribution in both sets
-    )
+    # Same indices train_test_split(..., stratify=y) would pick, applied to the raw
+    # array so each side is a single fancy-index copy
+    splitter = StratifiedShuffleSplit(n_splits=1, test_size=0.3, random_state=42)
+    train_idx, test_idx = next(splitter.split(np.zeros(len(y)), y.to_numpy()))
+    X_values = X.to_numpy()
+    X_train = pd.DataFrame(X_values[train_idx], columns=X.columns, index=X.index[train_idx], copy=False)
+    X_test = pd.DataFrame(X_values[test_idx], columns=X.columns, index=X.index[test_idx], copy=False)
+    y_train = y.iloc[train_idx]
+    y_test = y.iloc[test_idx]
     
     print(f"   Training set: {len(X_train):,} samples")
     print(f"   Test set:     {len(X_test):,} samples")
     
     # Display class distribution in splits
-    train_phishing = sum(y_train)
-    train_legit = len(y_train) - train_phishing
-    test_phishing = sum(y_test)
-    test_legit = len(y_test) - test_phishing
+    train_legit, train_phishing = count_classes(y_train)[:2]
+    test_legit, test_phishing = count_classes(y_test)[:2]
     
     print(f"\n   Train split: {train_legit:,} legitimate, {train_phishing:,} phishing")
     print(f"   Test split:  {test_legit:,} legitimate, {test_phishing:,} phishing")
     
+    if cache_path:
+        _save_prep_cache(cache_path, X_train, X_test, y_train, y_test)
+    
     return X_train, X_test, y_train, y_test
@@ -2,6 +2,37 @@ import ssl
 import socket
 from urllib.parse import urlparse
 from datetime import datetime
+from .ttl_cache import TTLCache
+
+# Certificate dates are cached per (domain, port); failures expire sooner so a
+# transient connection error is retried
+CACHE_MAX_ENTRIES = 1024
+CACHE_TTL = 6 * 3600
+NEGATIVE_CACHE_TTL = 60
+
+# Loading the CA bundle is the expensive part of a context, so build it once
+_SSL_CONTEXT = ssl.create_default_context()
+
+_MONTHS = {name: i for i, name in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), 1)}
+
+_cache = TTLCache(CACHE_MAX_ENTRIES, CACHE_TTL, NEGATIVE_CACHE_TTL)  # (domain, port) -> (not_before, not_after)
+
+def _fetch_ssl_dates(domain, port):
+    try:
+        with socket.create_connection((domain, port), timeout=3) as sock:
+            with _SSL_CONTEXT.wrap_socket(sock, server_hostname=domain) as ssock:
+                cert = ssock.getpeercert()
+                return cert.get('notBefore'), cert.get('notAfter')
+    except Exception:
+        return None, None
+
+def _parse_cert_time(value):
+    # OpenSSL's 'Mon DD HH:MM:SS YYYY GMT' (day space-padded), without strptime's
+    # locale and timezone handling
+    month, day, clock, year, _ = value.split()
+    hour, minute, second = clock.split(':')
+    return datetime(int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second))
 
 def get_ssl_info(url):
     try:
@@ -9,14 +40,8 @@ def get_ssl_info(url):
         if not domain:
             return None, None
         
-        port = 443
-        context = ssl.create_default_context()
-        with socket.create_connection((domain, port), timeout=3) as sock:
-            with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                cert = ssock.getpeercert()
-                not_before = cert.get('notBefore')
-                not_after = cert.get('notAfter')
-                return not_before, not_after
+        return _cache.get_or_compute((domain, 443), lambda key: _fetch_ssl_dates(*key),
+                                     ok=lambda dates: dates[1] is not None)
     except Exception:
         return None, None
 
@@ -26,9 +51,8 @@ def ssl_validity_days(url):
         if not_before is None or not_after is None:
             return -1
         
-        fmt = '%b %d %H:%M:%S %Y %Z'
-        nb = datetime.strptime(not_before, fmt)
-        na = datetime.strptime(not_after, fmt)
+        nb = _parse_cert_time(not_before)
+        na = _parse_cert_time(not_after)
         return max(0, (na - nb).days)  # Ensure non-negative
     except Exception:
         return -1
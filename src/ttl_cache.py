@@ -0,0 +1,77 @@
+"""
+Thread-safe, size-bounded cache with per-entry expiry, shared by the network
+lookups (DNS, SSL, hosting, WHOIS and scan results)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    LRU mapping whose entries expire
+    
+    Results are kept for ttl seconds; failures for negative_ttl, so a transient
+    error is retried soon without stalling every repeated check
+    """
+    
+    def __init__(self, maxsize, ttl, negative_ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """Cached value for key, or default if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key, value, ok=True, ttl=None):
+        """
+        Store value for key
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ok: False for a failed lookup (expires after negative_ttl)
+            ttl: Seconds to keep this entry, overriding ok
+        """
+        if ttl is None:
+            ttl = self.ttl if ok else self.negative_ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def get_or_compute(self, key, compute, ok=bool):
+        """
+        Cached value for key, computing and storing compute(key) on a miss
+        
+        Args:
+            key: Cache key
+            compute: Function of key returning the value
+            ok: Function of the value, False when it is a failed lookup
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute(key)
+            self.put(key, value, ok(value))
+        return value
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
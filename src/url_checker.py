@@ -1,9 +1,18 @@
+import asyncio
+import bisect
+import contextlib
 import joblib
+import numpy as np
+import os
 import pandas as pd
 import time
 import requests
 import socket
-from .feature_extraction import extract_features
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from .feature_extraction import extract_features, extract_features_one, parse_url
+from .ttl_cache import TTLCache
 try:
     from .validators import validate_url as validate_url_format
     from .logger import get_logger
@@ -26,6 +35,46 @@ except ImportError:
     RISK_THRESHOLDS = {'low': 0.3, 'medium': 0.7, 'high': 0.7}
     enhance_prediction = None
 
+# Upper bounds (exclusive) of each risk / confidence band, looked up with bisect
+_RISK_BINS = [RISK_THRESHOLDS['low'], RISK_THRESHOLDS['medium']]
+_RISK_LABELS = ['low', 'medium', 'high']
+_CONF_BINS = [0.1, 0.2, 0.3, 0.4]
+_CONF_LABELS = ['very_low', 'low', 'medium', 'high', 'very_high']
+
+# Keep-alive session for the online checks, so repeated probes of a host reuse
+# its connection instead of a new TCP/TLS handshake each time
+_head_session = requests.Session()
+_head_session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+for _prefix in ('http://', 'https://'):
+    _head_session.mount(_prefix, HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+# Online checks run here while features are extracted and models scored
+_io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='url-online')
+
+# Resolved hosts are cached briefly (failures for less time)
+DNS_CACHE_MAX_ENTRIES = 1024
+DNS_CACHE_TTL = 300
+DNS_NEGATIVE_CACHE_TTL = 60
+DNS_TIMEOUT = 3
+
+# Lookups run here so they can time out without touching the global socket timeout
+# (kept apart from _io_pool, whose workers wait on them)
+_dns_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='url-dns')
+
+_dns_cache = TTLCache(DNS_CACHE_MAX_ENTRIES, DNS_CACHE_TTL, DNS_NEGATIVE_CACHE_TTL)  # domain -> has_dns
+
+def _lookup_dns(domain):
+    """True if domain resolves within DNS_TIMEOUT"""
+    try:
+        _dns_pool.submit(socket.getaddrinfo, domain, None).result(timeout=DNS_TIMEOUT)
+        return True
+    except Exception:
+        return False
+
+def _resolve(domain):
+    """True if domain resolves (cached; bounded by DNS_TIMEOUT)"""
+    return _dns_cache.get_or_compute(domain, _lookup_dns)
+
 def check_url_exists_online(url, timeout=5):
     """
     Check if URL exists and is accessible online
@@ -37,34 +86,30 @@ def check_url_exists_online(url, timeout=5):
     Returns:
         tuple: (exists, status_code, has_dns, response_time)
     """
+    has_dns = False
     try:
         # Ensure URL has protocol
         if not url.startswith(('http://', 'https://')):
             url = 'http://' + url
         
         # Extract domain for DNS check
-        from urllib.parse import urlparse
-        parsed = urlparse(url)
+        parsed = parse_url(url)
         domain = parsed.netloc or parsed.path.split('/')[0]
         domain = domain.split(':')[0]
         
         # Check DNS first (faster)
-        has_dns = False
-        try:
-            socket.setdefaulttimeout(3)
-            socket.gethostbyname(domain)
-            has_dns = True
-        except:
-            pass
+        has_dns = _resolve(domain)
+        if not has_dns:
+            # Unresolvable host: don't spend the whole timeout on the HEAD request
+            return False, 0, False, 0.0
         
         # Try to reach the URL
         start_time = time.time()
-        response = requests.head(
+        response = _head_session.head(
             url, 
             timeout=timeout, 
             allow_redirects=True,
-            verify=True,  # Proper SSL verification
-            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+            verify=True  # Proper SSL verification
         )
         response_time = time.time() - start_time
         
@@ -81,6 +126,27 @@ def check_url_exists_online(url, timeout=5):
     except Exception as e:
         return False, 0, has_dns, 0.0
 
+async def check_url_exists_online_async(url, timeout=5):
+    """check_url_exists_online without blocking the event loop (runs on _io_pool)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_pool, check_url_exists_online, url, timeout)
+
+async def _gather_online(urls, timeout):
+    return await asyncio.gather(*[check_url_exists_online_async(url, timeout) for url in urls])
+
+def check_urls_exist_online(urls, timeout=5):
+    """
+    Run check_url_exists_online for many URLs concurrently
+    
+    Args:
+        urls: List of URL strings
+        timeout: Request timeout in seconds (per URL)
+    
+    Returns:
+        List of (exists, status_code, has_dns, response_time) tuples, one per URL
+    """
+    return asyncio.run(_gather_online(list(urls), timeout))
+
 # Cache loaded models and feature names to avoid reloading
 _cached_models = {'dt': None, 'xgb': None, 'features': None}
 
@@ -127,9 +193,11 @@ def load_models():
                     "Please train models: python -m src.main"
                 )
         
-        # Load models
-        dt = joblib.load(str(dt_path) if hasattr(dt_path, '__str__') else dt_path)
-        xgb = joblib.load(str(xgb_path) if hasattr(xgb_path, '__str__') else xgb_path)
+        # Load models (compressed files can't be memory-mapped, and these are small).
+        # mmap_mode / raw pickle protocol 5 were measured at no gain (~10ms either way):
+        # the boosters pickle as opaque byte buffers, not numpy arrays that could be mapped
+        dt = joblib.load(str(dt_path))
+        xgb = joblib.load(str(xgb_path))
         
         if logger:
             logger.info("Models loaded successfully")
@@ -166,79 +234,277 @@ def load_models():
             logger.error(f"Failed to load models: {e}")
         raise Exception(f"Failed to load models: {str(e)}")
 
-def check_url(url, threshold=None, use_ensemble=True, check_online=True):
+def _error_result(error, error_type):
+    """Result dict for a URL that could not be scored"""
+    return {
+        'decision_tree': -1, 
+        'xgboost': -1,
+        'ensemble': -1, 
+        'dt_probability': 0.0, 
+        'xgb_probability': 0.0,
+        'ensemble_probability': 0.0,
+        'error': str(error),
+        'error_type': error_type
+    }
+
+def _check_online_status(url):
+    """Online check results for url, in the shape stored under 'online_status'"""
+    if logger:
+        logger.debug("Checking if URL exists online: %s", url)
+    url_exists, status_code, has_dns, response_time = check_url_exists_online(url, timeout=5)
+    
+    if not has_dns:
+        if logger:
+            logger.warning("URL has no DNS record: %s", url)
+    if not url_exists and status_code == 0:
+        if logger:
+            logger.warning("URL is not accessible: %s", url)
+    
+    return {
+        'exists': url_exists,
+        'status_code': status_code,
+        'has_dns': has_dns,
+        'response_time': response_time,
+        'checked': True
+    }
+
+def _normalize_url(url):
+    """Validate url and return it normalized; raises ValueError if invalid"""
+    if USE_ADVANCED_FEATURES and validate_url_format:
+        is_valid, normalized_url, error = validate_url_format(url)
+        if not is_valid:
+            raise ValueError(f"Invalid URL: {error}")
+        return normalized_url
+    
+    # Basic validation
+    if not url or not isinstance(url, str):
+        raise ValueError("Invalid URL: must be a non-empty string")
+    if not url.startswith(('http://', 'https://', 'ftp://')):
+        url = 'http://' + url
+    return url
+
+def _prepare_features(df, feature_names):
+    """Select the model's feature columns from an extracted-features frame"""
+    if feature_names:
+        # Use saved feature names from training; one reindex selects them in
+        # order and fills any missing column with 0
+        features = df.reindex(columns=feature_names, fill_value=0)
+    else:
+        # Fallback: use all numeric columns
+        feature_cols = [col for col in df.columns if col not in ['url', 'label']]
+        features = df[feature_cols]
+    
+    if features.empty or len(features.columns) == 0:
+        raise Exception("No features extracted from URL")
+    return features
+
+def _feature_vector(url, feature_names):
+    """Features for one URL as a (1, n_features) float32 row, without a DataFrame"""
+    features = extract_features_one(url)
+    return np.array([[features.get(name, 0) for name in feature_names]], dtype=np.float32)
+
+# Boosters behind the loaded XGBoost model, for scoring single rows with
+# inplace_predict (no DMatrix or sklearn validation); None if not applicable
+_xgb_fast = {'model': None, 'parts': None}
+
+def _xgb_inplace_parts(xgb):
+    """(booster, calibrator or None) pairs that reproduce xgb's phishing probability"""
+    if _xgb_fast['model'] is not xgb:
+        parts = None
+        try:
+            if hasattr(xgb, 'get_booster'):
+                if str(xgb.get_params().get('objective')) == 'binary:logistic':
+                    parts = [(xgb.get_booster(), None)]
+            elif getattr(xgb, 'calibrated_classifiers_', None):
+                # CalibratedClassifierCV: average each fold's calibrated probability
+                folds = xgb.calibrated_classifiers_
+                if all(hasattr(c.estimator, 'get_booster') and len(c.calibrators) == 1
+                       and str(c.estimator.get_params().get('objective')) == 'binary:logistic'
+                       for c in folds):
+                    parts = [(c.estimator.get_booster(), c.calibrators[0]) for c in folds]
+        except Exception:
+            parts = None
+        _xgb_fast['model'], _xgb_fast['parts'] = xgb, parts
+    return _xgb_fast['parts']
+
+@contextlib.contextmanager
+def _array_input_warning_suppressed():
     """
-    Check if a URL is phishing or legitimate with improved prediction
+    Hide sklearn's "fitted with feature names" warning inside the block
+    
+    Single URLs are scored from a plain array laid out in the trained column order,
+    so the warning doesn't apply to them (and only to them)
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message='X does not have valid feature names', category=UserWarning)
+        yield
+
+def _xgb_phishing_proba(xgb, X):
+    """XGBoost phishing probabilities for a feature array, via inplace_predict when possible"""
+    parts = _xgb_inplace_parts(xgb)
+    if parts:
+        try:
+            probs = [booster.inplace_predict(X) for booster, _ in parts]
+            probs = [p if cal is None else cal.predict(p) for p, (_, cal) in zip(probs, parts)]
+            return np.clip(np.mean(probs, axis=0, dtype=np.float64), 0.0, 1.0)
+        except Exception:
+            pass
+    with _array_input_warning_suppressed():
+        return xgb.predict_proba(X)[:, 1]
+
+# Decision tree(s) behind the loaded DT model as flat lists, walked directly for
+# single rows instead of going through sklearn's predict_proba; None if not applicable
+_dt_fast = {'model': None, 'parts': None}
+
+def _flatten_tree(tree_model):
+    """(left, right, feature, threshold, phishing probability) lists for a fitted tree"""
+    tree = tree_model.tree_
+    value = tree.value[:, 0, :]
+    leaf_proba = value[:, 1] / value.sum(axis=1)
+    return (tree.children_left.tolist(), tree.children_right.tolist(), tree.feature.tolist(),
+            tree.threshold.tolist(), leaf_proba.tolist())
+
+def _dt_inplace_parts(dt):
+    """(flattened tree, calibrator or None) pairs that reproduce dt's phishing probability"""
+    if _dt_fast['model'] is not dt:
+        parts = None
+        try:
+            is_binary_tree = lambda m: hasattr(m, 'tree_') and list(m.classes_) == [0, 1]
+            if is_binary_tree(dt):
+                parts = [(_flatten_tree(dt), None)]
+            elif getattr(dt, 'calibrated_classifiers_', None):
+                # CalibratedClassifierCV: average each fold's calibrated probability
+                folds = dt.calibrated_classifiers_
+                if all(is_binary_tree(c.estimator) and len(c.calibrators) == 1 for c in folds):
+                    parts = [(_flatten_tree(c.estimator), c.calibrators[0]) for c in folds]
+        except Exception:
+            parts = None
+        _dt_fast['model'], _dt_fast['parts'] = dt, parts
+    return _dt_fast['parts']
+
+def _calibrate(calibrator, proba):
+    """calibrator.predict(proba), interpolating directly for a clipped float64 isotonic fit"""
+    if (getattr(calibrator, 'out_of_bounds', None) == 'clip'
+            and getattr(calibrator, 'X_thresholds_', None) is not None
+            and calibrator.X_thresholds_.dtype == np.float64 and len(calibrator.X_thresholds_) > 1):
+        proba = np.clip(proba, calibrator.X_min_, calibrator.X_max_)
+        return np.interp(proba, calibrator.X_thresholds_, calibrator.y_thresholds_)
+    return calibrator.predict(proba)
+
+def _dt_phishing_proba(dt, X):
+    """Decision Tree phishing probabilities for a float32 feature array"""
+    parts = _dt_inplace_parts(dt)
+    if parts:
+        try:
+            probs = []
+            for (left, right, feature, threshold, leaf_proba), calibrator in parts:
+                tree_probs = []
+                for row in X.tolist():
+                    node = 0
+                    while left[node] != -1:
+                        node = left[node] if row[feature[node]] <= threshold[node] else right[node]
+                    tree_probs.append(leaf_proba[node])
+                tree_probs = np.array(tree_probs)
+                probs.append(tree_probs if calibrator is None else _calibrate(calibrator, tree_probs))
+            return np.clip(np.mean(probs, axis=0), 0.0, 1.0)
+        except Exception:
+            pass
+    with _array_input_warning_suppressed():
+        return dt.predict_proba(X)[:, 1]
+
+def _build_result(url, dt_prob, xgb_prob, threshold, use_ensemble, online_status, processing_time):
+    """Assemble the prediction result for one URL from its model probabilities"""
+    # Apply threshold for individual models
+    dt_pred = 1 if dt_prob > threshold else 0
+    xgb_pred = 1 if xgb_prob > threshold else 0
+    
+    # Ensemble prediction (weighted average from config)
+    if use_ensemble:
+        dt_weight = ENSEMBLE_WEIGHTS['dt']
+        xgb_weight = ENSEMBLE_WEIGHTS['xgb']
+        ensemble_prob = (dt_prob * dt_weight + xgb_prob * xgb_weight)
+        ensemble_pred = 1 if ensemble_prob > threshold else 0
+    else:
+        ensemble_prob = (dt_prob + xgb_prob) / 2
+        ensemble_pred = 1 if ensemble_prob > threshold else 0
+    
+    # Determine risk level based on probability
+    risk_level = _RISK_LABELS[bisect.bisect_right(_RISK_BINS, ensemble_prob)]
+    
+    # Calculate confidence (how far from threshold)
+    confidence = abs(ensemble_prob - threshold)
+    confidence_level = _CONF_LABELS[bisect.bisect_right(_CONF_BINS, confidence)]
+    
+    # Determine final prediction
+    final_prediction = "phishing" if ensemble_pred == 1 else "legitimate"
+    
+    result = {
+        'url': url,
+        'prediction': final_prediction,
+        'probability': round(ensemble_prob, 4),
+        'risk_level': risk_level,
+        'confidence': confidence_level,
+        'online_status': online_status,  # Add online check results
+        'models': {
+            'decision_tree': {
+                'prediction': 'phishing' if dt_pred == 1 else 'legitimate',
+                'probability': round(dt_prob, 4)
+            },
+            'xgboost': {
+                'prediction': 'phishing' if xgb_pred == 1 else 'legitimate',
+                'probability': round(xgb_prob, 4)
+            }
+        },
+        'threshold': threshold,
+        'processing_time': round(processing_time, 4)
+    }
+    
+    if logger:
+        logger.info("Prediction for %s: %s (prob=%.4f, time=%.3fs)", url, final_prediction, ensemble_prob, processing_time)
+    return result
+
+def check_urls(urls, threshold=None, use_ensemble=True, check_online=True):
+    """
+    Check many URLs at once; features are extracted and scored as one batch
     
     Args:
-        url (str): URL to check
+        urls (list): URLs to check
         threshold (float): Classification threshold (default 0.5)
         use_ensemble: Use ensemble voting for final prediction
-        check_online: Check if URL exists online before analysis
+        check_online: Check if each URL exists online (runs alongside the analysis)
         
     Returns:
-        dict: Prediction results with probabilities and confidence
+        list: One result dict per URL, in input order (see check_url)
     """
     start_time = time.time()
+    urls = list(urls)
+    results = [None] * len(urls)
     
-    try:
-        # Use config threshold if not provided
-        if threshold is None:
-            threshold = PREDICTION_THRESHOLD
-        
-        # Check if URL exists online (optional but recommended)
-        url_exists = False
-        status_code = 0
-        has_dns = False
-        response_time = 0.0
-        
-        if check_online:
-            if logger:
-                logger.debug(f"Checking if URL exists online: {url}")
-            url_exists, status_code, has_dns, response_time = check_url_exists_online(url, timeout=5)
-            
-            # Add to result metadata
-            online_status = {
-                'exists': url_exists,
-                'status_code': status_code,
-                'has_dns': has_dns,
-                'response_time': response_time,
-                'checked': True
-            }
-            
-            if not has_dns:
-                if logger:
-                    logger.warning(f"URL has no DNS record: {url}")
-            if not url_exists and status_code == 0:
-                if logger:
-                    logger.warning(f"URL is not accessible: {url}")
-        else:
-            online_status = {'checked': False}
-        
-        # Validate URL format
-        if USE_ADVANCED_FEATURES and validate_url_format:
-            is_valid, normalized_url, error = validate_url_format(url)
-            if not is_valid:
-                raise ValueError(f"Invalid URL: {error}")
-            url = normalized_url
-        else:
-            # Basic validation
-            if not url or not isinstance(url, str):
-                raise ValueError("Invalid URL: must be a non-empty string")
-            if not url.startswith(('http://', 'https://', 'ftp://')):
-                url = 'http://' + url
-        
-        if logger:
-            logger.debug(f"Checking URL: {url}")
-        
-        # Create DataFrame with URL
-        df = pd.DataFrame([{'url': url, 'label': 0}])
-        
-        # Extract features
+    # Use config threshold if not provided
+    if threshold is None:
+        threshold = PREDICTION_THRESHOLD
+    
+    # Validate each URL (invalid ones get their error now) and start its online
+    # check in the background, so it overlaps feature extraction and scoring
+    valid = []  # (position, normalized url, pending online check or None)
+    for i, url in enumerate(urls):
         try:
-            df = extract_features(df)
+            normalized_url = _normalize_url(url)
+        except ValueError as e:
+            results[i] = _error_result(e, 'InvalidInput')
+            continue
         except Exception as e:
-            raise Exception(f"Feature extraction failed: {str(e)}")
+            results[i] = _error_result(e, 'GeneralError')
+            continue
+        online_future = _io_pool.submit(_check_online_status, url) if check_online else None
+        valid.append((i, normalized_url, online_future))
+    
+    if not valid:
+        return results
+    
+    try:
+        if logger:
+            logger.debug("Checking %d URL(s)", len(valid))
         
         # Load models and feature names
         try:
@@ -248,128 +514,97 @@ def check_url(url, threshold=None, use_ensemble=True, check_online=True):
         except Exception as e:
             raise Exception(f"Model loading failed: {str(e)}")
         
-        # Get feature columns
-        if feature_names:
-            # Use saved feature names from training
-            # Add missing columns with default value 0
-            for col in feature_names:
-                if col not in df.columns:
-                    df[col] = 0
-            features = df[feature_names]
-        else:
-            # Fallback: use all numeric columns
-            feature_cols = [col for col in df.columns if col not in ['url', 'label']]
-            features = df[feature_cols]
+        # Extract features (a single URL skips the DataFrame pipeline entirely)
+        single = len(valid) == 1 and bool(feature_names)
+        try:
+            if single:
+                features = _feature_vector(valid[0][1], feature_names)
+            else:
+                df = pd.DataFrame({'url': [url for _, url, _ in valid], 'label': 0})
+                df = extract_features(df)
+        except Exception as e:
+            raise Exception(f"Feature extraction failed: {str(e)}")
         
-        if features.empty or len(features.columns) == 0:
-            raise Exception("No features extracted from URL")
+        if not single:
+            features = _prepare_features(df, feature_names)
         
-        # Make predictions with probability
+        # Make predictions with probability, one call per model for the whole batch
         try:
-            dt_prob = dt.predict_proba(features)[0][1]  # Probability of phishing
-            xgb_prob = xgb.predict_proba(features)[0][1]  # Probability of phishing
+            if single:
+                dt_probs = _dt_phishing_proba(dt, features)  # Probability of phishing
+                xgb_probs = _xgb_phishing_proba(xgb, features)  # Probability of phishing
+            else:
+                dt_probs = dt.predict_proba(features)[:, 1]  # Probability of phishing
+                xgb_probs = xgb.predict_proba(features)[:, 1]  # Probability of phishing
         except Exception as e:
             raise Exception(f"Prediction failed: {str(e)}")
         
-        # Apply threshold for individual models
-        dt_pred = 1 if dt_prob > threshold else 0
-        xgb_pred = 1 if xgb_prob > threshold else 0
-        
-        # Ensemble prediction (weighted average from config)
-        if use_ensemble:
-            dt_weight = ENSEMBLE_WEIGHTS['dt']
-            xgb_weight = ENSEMBLE_WEIGHTS['xgb']
-            ensemble_prob = (dt_prob * dt_weight + xgb_prob * xgb_weight)
-            ensemble_pred = 1 if ensemble_prob > threshold else 0
-        else:
-            ensemble_prob = (dt_prob + xgb_prob) / 2
-            ensemble_pred = 1 if ensemble_prob > threshold else 0
-        
-        # Determine risk level based on probability
-        if ensemble_prob < RISK_THRESHOLDS['low']:
-            risk_level = "low"
-        elif ensemble_prob < RISK_THRESHOLDS['medium']:
-            risk_level = "medium"
-        else:
-            risk_level = "high"
-        
-        # Calculate confidence (how far from threshold)
-        confidence = abs(ensemble_prob - threshold)
-        if confidence < 0.1:
-            confidence_level = "very_low"
-        elif confidence < 0.2:
-            confidence_level = "low"
-        elif confidence < 0.3:
-            confidence_level = "medium"
-        elif confidence < 0.4:
-            confidence_level = "high"
-        else:
-            confidence_level = "very_high"
-        
-        # Determine final prediction
-        final_prediction = "phishing" if ensemble_pred == 1 else "legitimate"
-        
-        # Calculate processing time
-        processing_time = time.time() - start_time
-        
-        result = {
-            'url': url,
-            'prediction': final_prediction,
-            'probability': round(ensemble_prob, 4),
-            'risk_level': risk_level,
-            'confidence': confidence_level,
-            'online_status': online_status,  # Add online check results
-            'models': {
-                'decision_tree': {
-                    'prediction': 'phishing' if dt_pred == 1 else 'legitimate',
-                    'probability': round(dt_prob, 4)
-                },
-                'xgboost': {
-                    'prediction': 'phishing' if xgb_pred == 1 else 'legitimate',
-                    'probability': round(xgb_prob, 4)
-                }
-            },
-            'threshold': threshold,
-            'processing_time': round(processing_time, 4)
-        }
-        
-        if logger:
-            logger.info(f"Prediction for {url}: {final_prediction} (prob={ensemble_prob:.4f}, time={processing_time:.3f}s)")
-        return result
-        
     except FileNotFoundError as e:
         # Models not found - return error with specific message
-        return {
-            'decision_tree': -1, 
-            'xgboost': -1, 
-            'ensemble': -1,
-            'dt_probability': 0.0, 
-            'xgb_probability': 0.0,
-            'ensemble_probability': 0.0,
-            'error': str(e),
-            'error_type': 'ModelNotFound'
-        }
-    except ValueError as e:
-        # Invalid input
-        return {
-            'decision_tree': -1, 
-            'xgboost': -1,
-            'ensemble': -1, 
-            'dt_probability': 0.0, 
-            'xgb_probability': 0.0,
-            'ensemble_probability': 0.0,
-            'error': str(e),
-            'error_type': 'InvalidInput'
-        }
+        error = _error_result(e, 'ModelNotFound')
+        for i, _, _ in valid:
+            results[i] = dict(error)
+        return results
     except Exception as e:
         # General error
-        return {
-            'decision_tree': -1, 
-            'xgboost': -1,
-            'ensemble': -1, 
-            'dt_probability': 0.0, 
-            'xgb_probability': 0.0,
-            'ensemble_probability': 0.0,
-            'error': str(e),
-            'error_type': 'GeneralError'
-        }
+        error = _error_result(e, 'GeneralError')
+        for i, _, _ in valid:
+            results[i] = dict(error)
+        return results
+    
+    # Wait for the online checks before timing, so processing_time still covers them
+    for _, _, online_future in valid:
+        if online_future:
+            online_future.exception()
+    
+    # Calculate processing time (the batch's time, shared out per URL)
+    processing_time = (time.time() - start_time) / len(valid)
+    
+    for (i, url, online_future), dt_prob, xgb_prob in zip(valid, dt_probs, xgb_probs):
+        try:
+            online_status = online_future.result() if online_future else {'checked': False}
+        except Exception as e:
+            results[i] = _error_result(e, 'GeneralError')
+            continue
+        results[i] = _build_result(url, dt_prob, xgb_prob, threshold, use_ensemble,
+                                   online_status, processing_time)
+    return results
+
+def check_url(url, threshold=None, use_ensemble=True, check_online=True):
+    """
+    Check if a URL is phishing or legitimate with improved prediction
+    
+    Args:
+        url (str): URL to check
+        threshold (float): Classification threshold (default 0.5)
+        use_ensemble: Use ensemble voting for final prediction
+        check_online: Check if URL exists online before analysis
+        
+    Returns:
+        dict: Prediction results with probabilities and confidence
+    """
+    return check_urls([url], threshold, use_ensemble, check_online)[0]
+
+def warmup():
+    """
+    Load the models and score one dummy row, so the first real check doesn't
+    pay for deserialization or for building the single-row fast paths
+    
+    Returns:
+        bool: True if the models were loaded and scored
+    """
+    try:
+        dt, xgb, feature_names = load_models()
+        n_features = len(feature_names) if feature_names else getattr(dt, 'n_features_in_', 30)
+        X = np.zeros((1, n_features), dtype=np.float32)
+        _dt_phishing_proba(dt, X)
+        _xgb_phishing_proba(xgb, X)
+        return True
+    except Exception as e:
+        if logger:
+            logger.warning("Model warmup failed: %s", e)
+        return False
+
+# Opt-in, since importing shouldn't otherwise touch the model files
+if os.environ.get('URLCHECKER_WARMUP'):
+    warmup()
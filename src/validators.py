@@ -4,23 +4,117 @@ Provides comprehensive URL validation with helpful error messages
 Includes optional Security Scanner integration for enhanced validation
 """
 
+import asyncio
+import ipaddress
+import logging
 import re
 import os
 import requests
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from functools import lru_cache
 from urllib.parse import urlparse
 from typing import Tuple, Optional, Dict
 from src.logger import get_logger
+from src.ttl_cache import TTLCache
+
+try:
+    import httpx
+    import h2  # noqa: F401 (needed for httpx's HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from src.feature_cache import get_cache as get_feature_cache
+    SCAN_DISK_CACHE_AVAILABLE = True
+except ImportError:
+    SCAN_DISK_CACHE_AVAILABLE = False
 
 logger = get_logger(__name__)
 
 # Security Scanner integration (optional)
 SECURITY_SCAN_KEY = os.getenv('SECURITY_SCAN_KEY', '67483984e263fa227bea59a90f7341fa7d7d3d49b888a2c930c5dbfa0dd27939')
-ENABLE_SECURITY_SCAN = SECURITY_SCAN_KEY is not None
+# Decided once at import; an empty or truncated key counts as not configured
+ENABLE_SECURITY_SCAN = SECURITY_SCAN_KEY is not None and len(SECURITY_SCAN_KEY) > 10
 SCANNER_ENDPOINT = 'https://www.virustotal.com/api/v3/urls'  # External security service endpoint
 SCANNER_TIMEOUT = 10
 SCANNER_DELAY = 15  # Rate limiting delay
+# Waits before each analysis fetch for a single scan; later fetches only happen
+# while the analysis is incomplete and a spare rate-limit token is available
+SCANNER_POLL_DELAYS = (3, 5, 8)
+SCANNER_REQUESTS_PER_MINUTE = 4  # Public API quota; each scan uses two requests
+SCANNER_BATCH_SIZE = 4  # URLs submitted back to back before one shared analysis wait
+
+# Completed scans are kept per URL (LRU, bounded) so repeat checks skip the
+# submit/wait/fetch round trip
+SCAN_CACHE_MAX_ENTRIES = 4096
+SCAN_CACHE_TTL = 3600
+SCAN_NOT_FOUND_CACHE_TTL = 900  # URLs the service has no analysis for (HTTP 404)
+# Results are also kept in the SQLite feature cache (TTLs in feature_cache.CHECK_TTL_HOURS),
+# so later runs don't re-scan the same URLs
+SCAN_DISK_CACHE = True
+
+# validate_url's format checks and domain checks are cached, since the same
+# URLs (and hosts across a site's paths) recur in feeds and batches
+VALIDATION_CACHE_SIZE = 8192
+DOMAIN_CACHE_SIZE = 4096
+
+# Hosts that have passed validation, checked before the domain/IP checks. An
+# exact set (reset when full) rather than a probabilistic filter, since a false
+# positive would let an invalid host through
+VALID_HOSTS_MAX_ENTRIES = 100000
+_valid_hosts = set()
+
+# validate_url_batch(parallel=True) only uses worker processes from this many
+# URLs up, sending them over in chunks to amortize the pickling
+PARALLEL_BATCH_MIN_URLS = 10000
+PARALLEL_BATCH_CHUNK_SIZE = 1024
+
+# Pieces of validate_url's hand-rolled split: accepted schemes, where the host
+# ends, and characters urlparse handles specially (those URLs still go through it)
+_SCHEMES = frozenset({'http', 'https', 'ftp'})
+_SCHEME_RE = re.compile(r'(https?|ftp)://', re.IGNORECASE)
+_NETLOC_END_RE = re.compile(r'[/?#]')
+_URLPARSE_ONLY_RE = re.compile(r'[\t\r\n\[\]]')
+
+# Already-normalized URLs (scheme, plain host, optional port and path) that
+# validate_url_batch can accept without the full validate_url path
+URL_RE = re.compile(r'(?:https?|ftp)://([A-Za-z0-9\-._~]+)(?::\d*)?(?:/\S*)?')
+
+# Control characters sanitize_url drops, as a str.translate table
+_CONTROL_CHARS = dict.fromkeys((c for c in range(32) if chr(c) not in '\t\n\r'), None)
+
+# Async scans run their blocking submit/wait/fetch here
+_scan_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='security-scan')
+
+# url -> scan_result; "not found" results use the shorter TTL
+_scan_cache = TTLCache(SCAN_CACHE_MAX_ENTRIES, SCAN_CACHE_TTL, SCAN_NOT_FOUND_CACHE_TTL)
+
+# One keep-alive client, so repeated scans reuse the TCP/TLS connection; with
+# httpx + h2 installed, concurrent scans also multiplex over one HTTP/2 connection
+if HTTP2_AVAILABLE:
+    _scan_session = httpx.Client(
+        http2=True,
+        timeout=SCANNER_TIMEOUT,
+        limits=httpx.Limits(max_keepalive_connections=8),
+        transport=httpx.HTTPTransport(http2=True, retries=2)
+    )
+else:
+    _scan_session = requests.Session()
+    _scan_session.mount('https://', HTTPAdapter(
+        pool_connections=4, pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    ))
+
+# Headers are set once on the client; a scan only passes its own when it uses a
+# different key
+_scan_session.headers.update({'Accept': 'application/json'})
+if ENABLE_SECURITY_SCAN:
+    _scan_session.headers['x-apikey'] = SECURITY_SCAN_KEY
 
 
 class URLValidationError(Exception):
@@ -28,6 +122,63 @@ class URLValidationError(Exception):
     pass
 
 
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter
+    
+    Holds up to `capacity` tokens, refilled continuously at `refill_per_sec`.
+    """
+    
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_per_sec)
+        self.last_refill = now
+    
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take `tokens` if available right now; never blocks"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens < tokens:
+                return False
+            self.tokens -= tokens
+            return True
+    
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until `tokens` are available and take them
+        
+        Args:
+            tokens: Tokens to take
+            timeout: Give up after this many seconds (None waits indefinitely)
+        
+        Returns:
+            bool: True if acquired, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = (tokens - self.tokens) / self.refill_per_sec
+            if deadline is not None:
+                if now + wait > deadline:
+                    return False
+            time.sleep(wait)
+
+
+_scan_bucket = TokenBucket(SCANNER_REQUESTS_PER_MINUTE, SCANNER_REQUESTS_PER_MINUTE / 60)
+
+
+@lru_cache(maxsize=DOMAIN_CACHE_SIZE)
 def is_valid_domain(domain: str) -> bool:
     """
     Check if domain name is valid
@@ -44,16 +195,19 @@ def is_valid_domain(domain: str) -> bool:
     # Remove port if present
     domain = domain.split(':')[0]
     
-    # Basic domain pattern
-    domain_pattern = r'^(?:[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?\.)*[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?$'
-    
     # Check length
     if len(domain) > 253:
         return False
     
-    # Check pattern
-    if not re.match(domain_pattern, domain):
-        return False
+    # Check each label: 1-63 ASCII letters, digits or hyphens, not starting or
+    # ending with a hyphen (plain string checks; no regex needed)
+    for label in domain.split('.'):
+        if not label or len(label) > 63 or not label.isascii():
+            return False
+        if label[0] == '-' or label[-1] == '-':
+            return False
+        if not label.replace('-', '').isalnum():
+            return False
     
     return True
 
@@ -68,16 +222,92 @@ def is_ip_address(text: str) -> bool:
     Returns:
         bool: True if valid IP address
     """
-    # IPv4 pattern
-    ipv4_pattern = r'^(\d{1,3}\.){3}\d{1,3}$'
-    if re.match(ipv4_pattern, text):
-        # Check each octet is 0-255
-        octets = text.split('.')
-        return all(0 <= int(octet) <= 255 for octet in octets)
+    # Hostnames are the common case; skip the parser (and its exception) for them
+    if ':' not in text and not text.replace('.', '').isdigit():
+        return False
+    try:
+        ipaddress.ip_address(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _is_valid_host(host: str) -> bool:
+    """is_ip_address or is_valid_domain, remembering hosts that pass"""
+    if host in _valid_hosts:
+        return True
+    if not (is_ip_address(host) or is_valid_domain(host)):
+        return False
+    if len(_valid_hosts) >= VALID_HOSTS_MAX_ENTRIES:
+        _valid_hosts.clear()
+    _valid_hosts.add(host)
+    return True
+
+
+def _scan_disk_cache_get(url: str) -> Optional[Dict[str, any]]:
+    if not (SCAN_DISK_CACHE and SCAN_DISK_CACHE_AVAILABLE):
+        return None
+    try:
+        cache = get_feature_cache()
+        return cache.get(url, 'security_scan') or cache.get(url, 'security_scan_not_found')
+    except Exception:
+        return None
+
+
+def _scan_disk_cache_put(url: str, scan_result: Dict[str, any]) -> None:
+    if not (SCAN_DISK_CACHE and SCAN_DISK_CACHE_AVAILABLE):
+        return
+    check_type = 'security_scan_not_found' if scan_result.get('not_found') else 'security_scan'
+    try:
+        get_feature_cache().set(url, check_type, scan_result)
+    except Exception:
+        pass
+
+
+def _scan_headers(access_token: str) -> Optional[Dict[str, str]]:
+    # Form-encoded bodies (data=) set their own Content-Type; the key is only
+    # passed per request when it differs from the one set on the client
+    return None if access_token == _scan_session.headers.get('x-apikey') else {'x-apikey': access_token}
+
+
+def _submit_scan(url: str, headers: Optional[Dict[str, str]]) -> Tuple[Optional[str], Optional[Dict[str, any]]]:
+    """Submit url for scanning; returns (analysis id, None) or (None, final result)"""
+    response = _scan_session.post(SCANNER_ENDPOINT, headers=headers, data={'url': url}, timeout=SCANNER_TIMEOUT)
+    
+    if response.status_code == 200:
+        return response.json()['data']['id'], None
+    if response.status_code == 404:
+        return None, {'malicious': 0, 'suspicious': 0, 'clean': 0, 'total': 0, 'not_found': True}
+    return None, {'malicious': 0, 'suspicious': 0, 'clean': 0, 'total': 0}
+
+
+def _fetch_scan(url_id: str, headers: Optional[Dict[str, str]]) -> Dict[str, any]:
+    """Get the analysis results for a submitted scan"""
+    analysis_url = f"{SCANNER_ENDPOINT}/{url_id}"
+    analysis_response = _scan_session.get(analysis_url, headers=headers, timeout=SCANNER_TIMEOUT)
+    
+    if analysis_response.status_code == 200:
+        analysis_data = analysis_response.json()
+        stats = analysis_data['data']['attributes']['last_analysis_stats']
+        
+        malicious = stats.get('malicious', 0)
+        suspicious = stats.get('suspicious', 0)
+        harmless = stats.get('harmless', 0)
+        undetected = stats.get('undetected', 0)
+        total = malicious + suspicious + harmless + undetected
+        
+        return {
+            'malicious': malicious,
+            'suspicious': suspicious,
+            'clean': harmless,
+            'total': total
+        }
+    
+    if analysis_response.status_code == 404:
+        # No analysis for this URL; flagged so it can be cached as such
+        return {'malicious': 0, 'suspicious': 0, 'clean': 0, 'total': 0, 'not_found': True}
     
-    # IPv6 pattern (simplified)
-    ipv6_pattern = r'^([0-9a-fA-F]{0,4}:){7}[0-9a-fA-F]{0,4}$'
-    return bool(re.match(ipv6_pattern, text))
+    return {'malicious': 0, 'suspicious': 0, 'clean': 0, 'total': 0}
 
 
 def _perform_security_scan(url: str, access_token: str) -> Dict[str, any]:
@@ -92,57 +322,118 @@ def _perform_security_scan(url: str, access_token: str) -> Dict[str, any]:
         Dict with scan results
     """
     try:
-        # Submit URL for scanning
-        headers = {
-            'x-apikey': access_token,
-            'Content-Type': 'application/x-www-form-urlencoded'
-        }
+        headers = _scan_headers(access_token)
         
-        data = {'url': url}
-        response = requests.post(SCANNER_ENDPOINT, headers=headers, data=data, timeout=SCANNER_TIMEOUT)
-        
-        if response.status_code == 200:
-            result = response.json()
-            url_id = result['data']['id']
-            
-            # Wait for analysis
-            time.sleep(SCANNER_DELAY)
-            
-            # Get analysis results
-            analysis_url = f"{SCANNER_ENDPOINT}/{url_id}"
-            analysis_response = requests.get(analysis_url, headers=headers, timeout=SCANNER_TIMEOUT)
-            
-            if analysis_response.status_code == 200:
-                analysis_data = analysis_response.json()
-                stats = analysis_data['data']['attributes']['last_analysis_stats']
-                
-                malicious = stats.get('malicious', 0)
-                suspicious = stats.get('suspicious', 0)
-                harmless = stats.get('harmless', 0)
-                undetected = stats.get('undetected', 0)
-                total = malicious + suspicious + harmless + undetected
-                
-                return {
-                    'malicious': malicious,
-                    'suspicious': suspicious,
-                    'clean': harmless,
-                    'total': total
-                }
+        # Submit URL for scanning
+        url_id, scan_result = _submit_scan(url, headers)
+        if scan_result is not None:
+            return scan_result
         
-        return {'malicious': 0, 'suspicious': 0, 'clean': 0, 'total': 0}
+        # Fetch the analysis after a short wait, then back off while it is still
+        # incomplete; the first fetch is already paid for, extra polls use spare quota
+        for attempt, delay in enumerate(SCANNER_POLL_DELAYS):
+            if attempt and not _scan_bucket.try_acquire():
+                break
+            time.sleep(delay)
+            scan_result = _fetch_scan(url_id, headers)
+            if scan_result.get('total', 0) > 0 or scan_result.get('not_found'):
+                break
+        return scan_result
         
     except Exception as e:
-        logger.error(f"Security scan error for {url}: {str(e)}")
+        logger.error("Security scan error for %s: %s", url, e)
         return {'malicious': 0, 'suspicious': 0, 'clean': 0, 'total': 0}
 
 
-def check_url_with_security_scanner(url: str) -> Dict[str, any]:
+def _perform_security_scan_batch(urls: list, access_token: str) -> list:
+    """
+    Scan several URLs, sharing one analysis wait between them
+    
+    Submissions go out back to back, then after a single SCANNER_DELAY all
+    analyses are fetched concurrently. Every request waits for a rate-limit token.
+    
+    Args:
+        urls: URLs to scan
+        access_token: Authentication token
+    
+    Returns:
+        List of scan result dicts, aligned with urls
+    """
+    headers = _scan_headers(access_token)
+    results = [None] * len(urls)
+    pending = []  # (index, analysis id)
+    
+    for i, url in enumerate(urls):
+        _scan_bucket.acquire()
+        try:
+            url_id, results[i] = _submit_scan(url, headers)
+            if url_id is not None:
+                pending.append((i, url_id))
+        except Exception as e:
+            logger.error("Security scan error for %s: %s", url, e)
+            results[i] = {'malicious': 0, 'suspicious': 0, 'clean': 0, 'total': 0}
+    
+    if pending:
+        time.sleep(SCANNER_DELAY)
+    
+    def fetch(item):
+        i, url_id = item
+        _scan_bucket.acquire()
+        try:
+            return _fetch_scan(url_id, headers)
+        except Exception as e:
+            logger.error("Security scan error for %s: %s", urls[i], e)
+            return {'malicious': 0, 'suspicious': 0, 'clean': 0, 'total': 0}
+    
+    for (i, _), scan_result in zip(pending, _scan_executor.map(fetch, pending)):
+        results[i] = scan_result
+    return results
+
+
+def _cached_scan(url: str) -> Optional[Dict[str, any]]:
+    """Scan result from the in-memory or on-disk cache (None on miss)"""
+    scan_result = _scan_cache.get(url)
+    if scan_result is None:
+        scan_result = _scan_disk_cache_get(url)
+        if scan_result is not None:
+            _scan_cache.put(url, scan_result, ok=not scan_result.get('not_found'))
+    return scan_result
+
+
+def _remember_scan(url: str, scan_result: Dict[str, any]) -> None:
+    # Completed scans are cached, and "not found" for a shorter time so unknown
+    # URLs don't spend rate-limit tokens on every check; errors aren't cached
+    if scan_result.get('total', 0) > 0:
+        _scan_cache.put(url, scan_result)
+        _scan_disk_cache_put(url, scan_result)
+    elif scan_result.get('not_found'):
+        _scan_cache.put(url, scan_result, ok=False)
+        _scan_disk_cache_put(url, scan_result)
+
+
+def _scan_check_result(url: str, scan_result: Dict[str, any]) -> Dict[str, any]:
+    """The public result dict for a completed scan"""
+    result = {
+        'enabled': ENABLE_SECURITY_SCAN,
+        'checked': True,
+        'malicious': scan_result.get('malicious', 0),
+        'suspicious': scan_result.get('suspicious', 0),
+        'clean': scan_result.get('clean', 0),
+        'error': None,
+        'total_scans': scan_result.get('total', 0)
+    }
+    logger.info("Security scan for %s: %d malicious, %d clean", url, result['malicious'], result['clean'])
+    return result
+
+
+def check_url_with_security_scanner(url: str, wait_for_quota: bool = False) -> Dict[str, any]:
     """
     Check URL against Security Scanner database
     Uses external security service for real-time threat detection
     
     Args:
         url: URL to check
+        wait_for_quota: Wait for rate-limit tokens instead of failing when over quota
     
     Returns:
         Dict with security scan results
@@ -161,15 +452,17 @@ def check_url_with_security_scanner(url: str) -> Dict[str, any]:
         return result
     
     try:
-        scan_result = _perform_security_scan(url, SECURITY_SCAN_KEY)
-        
-        result['checked'] = True
-        result['malicious'] = scan_result.get('malicious', 0)
-        result['suspicious'] = scan_result.get('suspicious', 0)
-        result['clean'] = scan_result.get('clean', 0)
-        result['total_scans'] = scan_result.get('total', 0)
+        scan_result = _cached_scan(url)
+        if scan_result is None:
+            # Submit + fetch are two API requests; unless asked to wait, skip when over quota
+            if not (_scan_bucket.acquire(2) if wait_for_quota else _scan_bucket.try_acquire(2)):
+                result['error'] = 'Security scan rate limited, try again shortly'
+                logger.warning(result['error'])
+                return result
+            scan_result = _perform_security_scan(url, SECURITY_SCAN_KEY)
+            _remember_scan(url, scan_result)
         
-        logger.info(f"Security scan for {url}: {result['malicious']} malicious, {result['clean']} clean")
+        result = _scan_check_result(url, scan_result)
         
     except ImportError:
         result['error'] = 'Security scanner module not available'
@@ -181,85 +474,165 @@ def check_url_with_security_scanner(url: str) -> Dict[str, any]:
     return result
 
 
-def validate_url(url: str, add_protocol: bool = True, enable_security_scan: bool = False) -> Tuple[bool, Optional[str], Optional[str]]:
+async def check_url_with_security_scanner_async(url: str) -> Dict[str, any]:
     """
-    Validate and normalize URL with detailed error reporting
-    Optional Security Scanner integration for enhanced validation
+    check_url_with_security_scanner without blocking the event loop
     
     Args:
-        url: URL to validate
-        add_protocol: Add http:// if protocol missing
-        enable_security_scan: Perform external security scan
+        url: URL to check
     
     Returns:
-        Tuple[bool, Optional[str], Optional[str]]: 
-            (is_valid, normalized_url, error_message)
+        Dict with security scan results
     """
-    # Check if URL is provided
-    if not url:
-        return False, None, "URL cannot be empty"
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_scan_executor, check_url_with_security_scanner, url)
+
+
+def check_urls_with_security_scanner(urls: list) -> list:
+    """
+    Scan many URLs, waiting for rate-limit tokens as needed
     
-    # Check type
-    if not isinstance(url, str):
-        return False, None, f"URL must be a string, got {type(url).__name__}"
+    Uncached URLs are scanned SCANNER_BATCH_SIZE at a time with one shared
+    analysis wait per batch. Overall throughput is bounded by
+    SCANNER_REQUESTS_PER_MINUTE, so large batches take minutes; cached URLs
+    return immediately.
     
-    # Strip whitespace
-    url = url.strip()
+    Args:
+        urls: List of URLs to check
+    
+    Returns:
+        List of security scan result dicts, one per URL
+    """
+    urls = list(urls)
+    if not ENABLE_SECURITY_SCAN:
+        return [check_url_with_security_scanner(url) for url in urls]
+    
+    # Scan each distinct URL once, then map the results back
+    by_url = {}
+    to_scan = []
+    for url in dict.fromkeys(urls):
+        scan_result = _cached_scan(url)
+        if scan_result is None:
+            to_scan.append(url)
+        else:
+            by_url[url] = scan_result
+    
+    for start in range(0, len(to_scan), SCANNER_BATCH_SIZE):
+        batch = to_scan[start:start + SCANNER_BATCH_SIZE]
+        for url, scan_result in zip(batch, _perform_security_scan_batch(batch, SECURITY_SCAN_KEY)):
+            _remember_scan(url, scan_result)
+            by_url[url] = scan_result
+    
+    return [_scan_check_result(url, by_url[url]) for url in urls]
+
+
+def _warn_suspicious(url: str, host: str) -> None:
+    # These checks only feed warnings, so skip them when warnings aren't logged
+    if not logger.isEnabledFor(logging.WARNING):
+        return
     
+    # Check for suspicious patterns
+    if '@' in url:
+        logger.warning("URL contains @ symbol (possible phishing indicator): %s", url)
+    
+    if host.count('-') > 5:
+        logger.warning("URL contains many hyphens (possible phishing indicator): %s", url)
+
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _validate_url_cached(url: str, add_protocol: bool) -> Tuple[bool, Optional[str], Optional[str], Optional[str]]:
+    """validate_url's checks for a stripped URL string; also returns the host (port removed)"""
     # Check minimum length
     if len(url) < 4:
-        return False, None, "URL is too short (minimum 4 characters)"
+        return False, None, "URL is too short (minimum 4 characters)", None
     
     # Check maximum length
     if len(url) > 2048:
-        return False, None, "URL is too long (maximum 2048 characters)"
-    
-    # Add protocol if missing
-    original_url = url
-    if not url.startswith(('http://', 'https://', 'ftp://')):
-        if add_protocol:
-            url = 'http://' + url
-            logger.debug(f"Added protocol to URL: {original_url} -> {url}")
-        else:
-            return False, None, "URL must start with http://, https://, or ftp://"
-    
-    # Parse URL
-    try:
-        parsed = urlparse(url)
-    except Exception as e:
-        return False, None, f"URL parsing failed: {str(e)}"
+        return False, None, "URL is too long (maximum 2048 characters)", None
+    
+    # Lowercase a supported scheme written in another case (Http://); add one if missing
+    scheme_match = _SCHEME_RE.match(url)
+    if scheme_match:
+        if not scheme_match.group(1).islower():
+            url = scheme_match.group(1).lower() + url[scheme_match.end(1):]
+    elif add_protocol:
+        url = 'http://' + url
+    else:
+        return False, None, "URL must start with http://, https://, or ftp://", None
+    
+    # Split off scheme and host by slicing; urlparse is only needed for input it
+    # rewrites or rejects (tab/CR/LF, IPv6 brackets, non-ASCII hosts)
+    scheme, _, rest = url.partition('://')
+    end = _NETLOC_END_RE.search(rest)
+    domain = rest[:end.start()] if end else rest
+    if _URLPARSE_ONLY_RE.search(url) or not domain.isascii():
+        try:
+            parsed = urlparse(url)
+        except Exception as e:
+            return False, None, f"URL parsing failed: {str(e)}", None
+        scheme, domain = parsed.scheme, parsed.netloc
     
     # Check scheme
-    if parsed.scheme not in ['http', 'https', 'ftp']:
-        return False, None, f"Unsupported protocol: {parsed.scheme} (use http, https, or ftp)"
+    if scheme not in _SCHEMES:
+        return False, None, f"Unsupported protocol: {scheme} (use http, https, or ftp)", None
     
     # Check domain/IP
-    domain = parsed.netloc
     if not domain:
-        return False, None, "URL must contain a domain or IP address"
+        return False, None, "URL must contain a domain or IP address", None
     
     # Remove port for validation
     domain_without_port = domain.split(':')[0]
     
     # Validate domain or IP
-    if not is_ip_address(domain_without_port) and not is_valid_domain(domain_without_port):
-        return False, None, f"Invalid domain or IP address: {domain_without_port}"
+    if not _is_valid_host(domain_without_port):
+        return False, None, f"Invalid domain or IP address: {domain_without_port}", None
     
-    # Check for suspicious patterns
-    if url.count('@') > 0:
-        logger.warning(f"URL contains @ symbol (possible phishing indicator): {url}")
+    return True, url, None, domain_without_port
+
+
+def validate_url(url: str, add_protocol: bool = True, enable_security_scan: bool = False) -> Tuple[bool, Optional[str], Optional[str]]:
+    """
+    Validate and normalize URL with detailed error reporting
+    Optional Security Scanner integration for enhanced validation
+    
+    Args:
+        url: URL to validate
+        add_protocol: Add http:// if protocol missing
+        enable_security_scan: Perform external security scan
+    
+    Returns:
+        Tuple[bool, Optional[str], Optional[str]]: 
+            (is_valid, normalized_url, error_message)
+    """
+    # Check if URL is provided
+    if not url:
+        return False, None, "URL cannot be empty"
     
-    if domain_without_port.count('-') > 5:
-        logger.warning(f"URL contains many hyphens (possible phishing indicator): {url}")
+    # Check type
+    if not isinstance(url, str):
+        return False, None, f"URL must be a string, got {type(url).__name__}"
+    
+    # Strip whitespace
+    original_url = url.strip()
+    
+    # Format checks are cached per URL; logging and the scan below run every time
+    is_valid, url, error, domain_without_port = _validate_url_cached(original_url, add_protocol)
+    if not is_valid:
+        return False, None, error
+    
+    if len(url) != len(original_url):
+        logger.debug("Added protocol to URL: %s -> %s", original_url, url)
+    
+    _warn_suspicious(url, domain_without_port)
     
     # Optional Security Scanner check
     if enable_security_scan and ENABLE_SECURITY_SCAN:
         scan_result = check_url_with_security_scanner(url)
         if scan_result['checked'] and scan_result['malicious'] > 0:
-            logger.warning(f"Security Scanner detected malicious: {url} ({scan_result['malicious']} detections)")
+            logger.warning("Security Scanner detected malicious: %s (%d detections)", url, scan_result['malicious'])
     
     # URL is valid
-    logger.debug(f"URL validated successfully: {url}")
+    logger.debug("URL validated successfully: %s", url)
     return True, url, None
 
 
@@ -279,19 +652,28 @@ def sanitize_url(url: str) -> str:
     # Remove whitespace
     url = url.strip()
     
-    # Remove null bytes
-    url = url.replace('\x00', '')
+    # Remove null bytes and other control characters (tab/newline/CR are kept)
+    url = url.translate(_CONTROL_CHARS)
     
-    # Remove control characters
-    url = ''.join(char for char in url if ord(char) >= 32 or char in '\t\n\r')
-    
-    # Normalize protocol
-    url = url.replace('HTTP://', 'http://')
-    url = url.replace('HTTPS://', 'https://')
+    # Normalize protocol (lowercase the scheme; only the first few characters can hold it)
+    idx = url.find('://', 0, 8)
+    if idx != -1:
+        url = url[:idx].lower() + url[idx:]
     
     return url
 
 
+# (error keyword, suggestion) pairs for get_validation_help, checked in order
+_HELP_MESSAGES = (
+    ('empty', 'Please enter a URL (e.g., https://example.com)'),
+    ('short', 'URL is too short. Example: https://google.com'),
+    ('long', 'URL exceeds maximum length of 2048 characters'),
+    ('protocol', 'URL should start with http:// or https://'),
+    ('domain', 'Invalid domain name. Example: www.example.com'),
+    ('parsing', 'URL format is incorrect. Use format: http://domain.com/path'),
+)
+
+
 def get_validation_help(error_message: str) -> str:
     """
     Get helpful suggestions based on validation error
@@ -302,30 +684,71 @@ def get_validation_help(error_message: str) -> str:
     Returns:
         str: Helpful suggestion
     """
-    help_messages = {
-        'empty': 'Please enter a URL (e.g., https://example.com)',
-        'short': 'URL is too short. Example: https://google.com',
-        'long': 'URL exceeds maximum length of 2048 characters',
-        'protocol': 'URL should start with http:// or https://',
-        'domain': 'Invalid domain name. Example: www.example.com',
-        'parsing': 'URL format is incorrect. Use format: http://domain.com/path',
-    }
-    
     error_lower = error_message.lower()
     
-    for key, help_text in help_messages.items():
+    for key, help_text in _HELP_MESSAGES:
         if key in error_lower:
             return help_text
     
     return 'Please check the URL format and try again'
 
 
-def validate_url_batch(urls: list) -> dict:
+def _validate_for_batch(url) -> Tuple[bool, Optional[str], Optional[str]]:
+    """validate_url for one batch entry (module-level so process pools can pickle it)"""
+    # One regex pass for URLs already in plain form; anything else (or a
+    # host that fails the checks) takes the full validate_url path
+    match = URL_RE.fullmatch(url.strip()) if isinstance(url, str) else None
+    if match and 4 <= len(match.string) <= 2048 and _is_valid_host(match.group(1)):
+        normalized = match.string
+        _warn_suspicious(normalized, match.group(1))
+        logger.debug("URL validated successfully: %s", normalized)
+        return True, normalized, None
+    
+    return validate_url(url)
+
+
+class _RecordCollector(logging.Handler):
+    """Keeps a pool worker's log records so the parent process can log them"""
+    
+    def __init__(self):
+        super().__init__()
+        self.records = []
+    
+    def emit(self, record):
+        # Format now so the record pickles without its args
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        self.records.append(record)
+
+
+_worker_collector = None
+
+
+def _init_batch_worker() -> None:
+    """Process pool initializer: collect this worker's log records instead of queueing them"""
+    # A forked worker has a copy of the log queue but no listener thread reading
+    # it, so anything logged through it would be lost
+    global _worker_collector
+    _worker_collector = _RecordCollector()
+    logger.handlers[:] = [_worker_collector]
+    logger.propagate = False
+
+
+def _validate_in_worker(url):
+    """_validate_for_batch in a pool worker; also returns the records it logged"""
+    _worker_collector.records = []
+    return _validate_for_batch(url), _worker_collector.records
+
+
+def validate_url_batch(urls: list, parallel: bool = False) -> dict:
     """
     Validate multiple URLs at once
     
     Args:
         urls: List of URLs to validate
+        parallel: Spread large batches (PARALLEL_BATCH_MIN_URLS or more) over
+                  worker processes
     
     Returns:
         dict: Results with valid and invalid URLs
@@ -336,15 +759,26 @@ def validate_url_batch(urls: list) -> dict:
         'errors': {}
     }
     
-    for url in urls:
-        is_valid, normalized, error = validate_url(url)
+    if parallel and len(urls) >= PARALLEL_BATCH_MIN_URLS:
+        outcomes = []
+        with ProcessPoolExecutor(initializer=_init_batch_worker) as executor:
+            for outcome, records in executor.map(_validate_in_worker, urls,
+                                                 chunksize=PARALLEL_BATCH_CHUNK_SIZE):
+                outcomes.append(outcome)
+                # Warnings raised in the workers are written from here
+                for record in records:
+                    logger.handle(record)
+    else:
+        outcomes = map(_validate_for_batch, urls)
+    
+    for url, (is_valid, normalized, error) in zip(urls, outcomes):
         if is_valid:
             results['valid'].append(normalized)
         else:
             results['invalid'].append(url)
             results['errors'][url] = error
     
-    logger.info(f"Batch validation: {len(results['valid'])} valid, {len(results['invalid'])} invalid")
+    logger.info("Batch validation: %d valid, %d invalid", len(results['valid']), len(results['invalid']))
     
     return results
 
@@ -6,7 +6,26 @@ except ImportError:
     except ImportError:
         whois = None
 
+try:
+    from .feature_cache import get_cache
+    PERSISTENT_CACHE_AVAILABLE = True
+except ImportError:
+    PERSISTENT_CACHE_AVAILABLE = False
+
 import datetime
+from .ttl_cache import TTLCache
+
+# Creation dates are cached per registered domain, in memory and in the
+# feature cache (TTL in feature_cache.CHECK_TTL_HOURS), since many URLs share one.
+# Failed lookups (often rate limits) are only remembered briefly, in memory
+WHOIS_CACHE_SIZE = 4096
+WHOIS_CACHE_TTL = 24 * 3600
+WHOIS_NEGATIVE_CACHE_TTL = 300
+
+_creation_cache = TTLCache(WHOIS_CACHE_SIZE, WHOIS_CACHE_TTL, WHOIS_NEGATIVE_CACHE_TTL)  # domain -> creation_date or None
+
+# Second-level labels under which country TLDs register domains (example.co.uk)
+_SECOND_LEVEL_LABELS = {'co', 'com', 'net', 'org', 'gov', 'ac', 'edu'}
 
 def get_domain_from_url(url):
     try:
@@ -16,16 +35,51 @@ def get_domain_from_url(url):
     except Exception:
         return ""
 
-def get_domain_age(url):
-    domain = get_domain_from_url(url)
-    if not domain or whois is None:
-        return -1
+def _registered_domain(host):
+    """Approximate registered domain of a host (mail.google.com -> google.com)"""
+    host = host.rsplit('@', 1)[-1].split(':')[0]
+    labels = host.split('.')
+    if len(labels) <= 2 or labels[-1].isdigit():
+        return host
+    if len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL_LABELS:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+def _whois_creation(domain):
+    """WHOIS creation date for a registered domain (None if unavailable)"""
+    return _creation_cache.get_or_compute(domain, _lookup_creation,
+                                          ok=lambda creation_date: creation_date is not None)
+
+def _lookup_creation(domain):
+    """Creation date from the feature cache, else a WHOIS query (None if unavailable)"""
+    cache = get_cache() if PERSISTENT_CACHE_AVAILABLE else None
+    if cache is not None:
+        cached = cache.get(domain, 'whois_creation')
+        if cached is not None:
+            return datetime.datetime.fromisoformat(cached['creation_date'])
     
     try:
         w = whois.whois(domain)
         creation_date = w.creation_date if hasattr(w, 'creation_date') else None
         if isinstance(creation_date, list):
             creation_date = creation_date[0]
+    except Exception:
+        return None
+    if not isinstance(creation_date, datetime.datetime):
+        return None
+    
+    # Failed lookups are often rate limits, so only successes are kept on disk
+    if cache is not None:
+        cache.set(domain, 'whois_creation', {'creation_date': creation_date.isoformat()})
+    return creation_date
+
+def get_domain_age(url):
+    domain = get_domain_from_url(url)
+    if not domain or whois is None:
+        return -1
+    
+    try:
+        creation_date = _whois_creation(_registered_domain(domain))
         if creation_date is None:
             return -1
         age_days = (datetime.datetime.now() - creation_date).days